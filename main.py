@@ -16,12 +16,25 @@ from streamlit_option_menu import (
 import pandas as pd  # Mengimpor modul pandas dan memberinya alias 'pd' untuk analisis data dan manipulasi data tabel
 import shutil
 from io import BytesIO
+from program import aggregate
+from program import archive
+from program import clones
+from program import dependencies
+from program import githistory
+from program import history
+from program import ignore
+from program import patterns
+from program import sampling
+from program import scan
+from program import script
+from program import signatures
+from program import spill
 from datetime import (
     datetime,
 )  # Mengimpor kelas datetime dari modul datetime untuk mendapatkan informasi tentang tanggal dan waktu saat ini
 
 
-def analyze_kotlin_files(directory):
+def analyze_kotlin_files(directory, excludes=None, memory_budget=None, progress=None):
     # Inisialisasi variabel untuk menghitung jumlah file, kelas, fungsi, properti, dan paket
     file_count = 0
     class_count = 0
@@ -29,49 +42,67 @@ def analyze_kotlin_files(directory):
     property_count = 0
     packages = set()  # Set untuk menyimpan nama-nama paket
     package_dict = {}  # Dictionary untuk menyimpan detail dari setiap paket
-
-    # Menelusuri direktori untuk mencari file .kt
-    for root, dirs, files_in_dir in os.walk(directory):
-        for file in files_in_dir:
-            if file.endswith(
-                ".kt"
-            ):  # Hanya memproses file dengan ekstensi .kt (Kotlin)
-                file_count += 1
-                file_path = os.path.join(root, file)
-
-                # Membaca isi file
-                with open(file_path, "r", encoding="utf-8") as f:
-                    content = f.read()
-
-                    # Menggunakan regex untuk menemukan kelas, fungsi, dan properti dalam file
-                    found_classes = re.findall(r"class\s+\w+", content)
-                    found_functions = re.findall(r"fun\s+\w+", content)
-                    found_properties = re.findall(r"val\s+\w+|var\s+\w+", content)
-
-                    # Memperbarui jumlah total kelas, fungsi, dan properti
-                    class_count += len(found_classes)
-                    function_count += len(found_functions)
-                    property_count += len(found_properties)
-
-                    # Menemukan nama paket dalam file (jika ada)
-                    package_name = re.search(r"package\s+([\w\.]+)", content)
-                    package = package_name.group(1) if package_name else "default"
-                    packages.add(package)  # Menambahkan paket ke dalam set
-
-                    # Jika paket belum ada di dalam dictionary, inisialisasi entri baru
-                    if package not in package_dict:
-                        package_dict[package] = {
-                            "files": [],
-                            "classes": [],
-                            "functions": [],
-                            "properties": [],
-                        }
-
-                    # Menambahkan informasi file, kelas, fungsi, dan properti ke dictionary paket
-                    package_dict[package]["files"].append(file)
-                    package_dict[package]["classes"].extend(found_classes)
-                    package_dict[package]["functions"].extend(found_functions)
-                    package_dict[package]["properties"].extend(found_properties)
+    # Indeks import/referensi per file untuk graf dependensi, daftar nama per
+    # paket, dan cache dedup berbagi satu anggaran memori; melewatinya, isi
+    # list ditumpahkan ke disk dan cache berhenti bertambah
+    spilled = spill.SpillGroup(memory_budget)
+    dependency_index = spilled.new_list()
+    analyzed = {}  # Digest isi file -> (deklarasi, indeks dependensi)
+
+    # Menelusuri direktori untuk mencari file .kt dan .kts; direktori yang
+    # diabaikan (build/, .gradle/, .gitignore, ...) tidak pernah dimasuki.
+    # Daftar nama dikumpulkan dulu agar progres punya jumlah total.
+    files = list(ignore.walk(directory, archive.KOTLIN_EXTENSIONS, excludes))
+    for root, file in files:
+        file_count += 1
+        file_path = os.path.join(root, file)
+        if progress:
+            progress(file_count, len(files))
+
+        # Salinan file yang identik (mis. modul yang disalin) dianalisis sekali
+        data = scan.read_bytes(file_path)
+        key = scan.content_digest(data)
+        if key in analyzed:
+            declarations, file_dependencies = analyzed[key]
+        else:
+            # Byte yang tidak valid UTF-8 diganti, bukan error
+            content = scan.decode_source(data)
+            # Satu pass regex gabungan untuk kelas, fungsi, properti, dan paket
+            declarations = patterns.scan_declarations(content)
+            package = declarations["package"] or "default"
+            # Import dan referensi tipe dicatat pada pembacaan yang sama
+            file_dependencies = dependencies.index_file(content, package)
+            if spilled.reserve(spill.estimate_size((declarations, file_dependencies))):
+                analyzed[key] = (declarations, file_dependencies)
+        found_classes = declarations["classes"]
+        found_functions = declarations["functions"]
+        found_properties = declarations["properties"]
+
+        # Memperbarui jumlah total kelas, fungsi, dan properti
+        class_count += len(found_classes)
+        function_count += len(found_functions)
+        property_count += len(found_properties)
+
+        # Menemukan nama paket dalam file (jika ada)
+        package = declarations["package"] or "default"
+        packages.add(package)  # Menambahkan paket ke dalam set
+
+        dependency_index.append(file_dependencies)
+
+        # Jika paket belum ada di dalam dictionary, inisialisasi entri baru
+        if package not in package_dict:
+            package_dict[package] = {
+                "files": spilled.new_list(),
+                "classes": spilled.new_list(),
+                "functions": spilled.new_list(),
+                "properties": spilled.new_list(),
+            }
+
+        # Menambahkan informasi file, kelas, fungsi, dan properti ke dictionary paket
+        package_dict[package]["files"].append(file)
+        package_dict[package]["classes"].extend(found_classes)
+        package_dict[package]["functions"].extend(found_functions)
+        package_dict[package]["properties"].extend(found_properties)
 
     # Mengembalikan hasil analisis dalam bentuk dictionary
     return {
@@ -81,6 +112,7 @@ def analyze_kotlin_files(directory):
         "number of properties": property_count,  # Total properti yang ditemukan
         "number of packages": len(packages),  # Total paket yang ditemukan
         "Packages": package_dict,  # Dictionary yang berisi detail paket, file, kelas, dll.
+        "Dependency Index": dependency_index,  # Indeks untuk dependencies.analyze_dependencies
     }
 
 
@@ -94,38 +126,6 @@ def analyze_kotlin_files(directory):
 #     return ""
 
 
-def extract_function_content(content, function_name):
-    # Mencari fungsi dengan nama tertentu
-    start_idx = content.find(f"fun {function_name}(")
-    if start_idx == -1:
-        return ""
-
-    # Menemukan posisi kurung kurawal pertama
-    start_idx = content.find("{", start_idx)
-    if start_idx == -1:
-        return ""
-
-    # Stack untuk melacak kurung kurawal bersarang
-    stack = []
-    function_body = []
-
-    # Memulai pemrosesan dari posisi kurung pertama
-    for idx, char in enumerate(content[start_idx:], start=start_idx):
-        if char == "{":
-            stack.append("{")
-        elif char == "}":
-            stack.pop()
-
-        # Menambahkan karakter ke body fungsi jika stack tidak kosong
-        function_body.append(char)
-
-        # Ketika stack kosong, kita sudah sampai akhir fungsi
-        if not stack:
-            break
-
-    return "".join(function_body).strip()
-
-
 # # Fungsi untuk menghitung NOLV_METHOD (jumlah variabel lokal)
 # def calculate_nolv(function_content):
 #     # Mencari semua deklarasi variabel lokal yang menggunakan 'val' atau 'var'
@@ -156,22 +156,9 @@ def extract_function_content(content, function_name):
 
 
 def calculate_nolv(function_content):
-    # Memecah kode menjadi baris-baris
-    lines = function_content.split("\n")
-    local_variables = set()
-
-    # Memeriksa setiap baris untuk menemukan deklarasi variabel lokal
-    for line in lines:
-        line = line.strip()
-
-        # Mencari 'val' atau 'var' untuk deklarasi variabel lokal
-        if line.startswith("val") or line.startswith("var"):
-            parts = line.split("=")
-            if len(parts) > 1:
-                variable = parts[0].strip().split()[-1]  # Mendapatkan nama variabel
-                local_variables.add(variable)
-
-    return len(local_variables)
+    # Satu pemindaian token dengan lingkup: val/var (termasuk destrukturisasi),
+    # variabel for, parameter lambda dan catch; `value = ...` tidak terhitung
+    return patterns.count_local_variables(function_content)
 
 
 # Contoh penggunaan dengan kode dalam metode 'onCreate'
@@ -227,36 +214,26 @@ print(f"Total NOLV: {nolv}")
 # Fungsi untuk menghitung CYCLO_METHOD (kompleksitas siklomatik)
 def calculate_cyclomatic_complexity(function_content):
     # Mencari semua cabang logis dalam konten menggunakan kata kunci kontrol alur
-    logical_branches = re.findall(
-        r"\b(if|else|for|while|when|switch|case|try|catch)\b", function_content
-    )
+    logical_branches = patterns.BRANCH.findall(function_content)
     return len(logical_branches) + 1  # +1 untuk fungsi itu sendiri
 
 
 # Fungsi untuk menghitung NUMBER_CONSTRUCTOR_NOTDEFAULTCONSTRUCTOR_METHOD
 def count_non_default_constructors(content, class_name):
-    # Mencari konstruktor dalam kelas dengan nama class_name
-    constructors = re.findall(
-        rf"class\s+{class_name}\s*.*?\((.*?)\)", content, re.DOTALL
-    )
-    non_default_constructors = 0  # Inisialisasi penghitung konstruktor non-default
-    for constructor in constructors:
-        # Jika ada parameter dalam konstruktor, itu berarti konstruktor non-default
-        if constructor and not re.match(r"\s*\)", constructor):
-            non_default_constructors += 1
-    return non_default_constructors  # Mengembalikan jumlah konstruktor non-default
+    # Konstruktor primer berparameter, dicari dengan lookahead terbatas pada header kelas
+    return patterns.scan_declarations(content)["constructors"].get(class_name, 0)
 
 
 # Fungsi untuk mencari semua fungsi dalam konten file Kotlin
 def find_functions(content):
     # Mengembalikan semua nama fungsi yang ditemukan dalam konten
-    return re.findall(r"fun\s+(\w+)\s*\(", content)
+    return patterns.FUNCTION_NAME.findall(content)
 
 
 # Fungsi untuk mencari semua kelas dalam konten file Kotlin
 def find_classes(content):
     # Mengembalikan semua nama kelas yang ditemukan dalam konten
-    return re.findall(r"class\s+(\w+)", content)
+    return patterns.CLASS_NAME.findall(content)
 
 
 # Fungsi untuk menghapus semua file di dalam direktori
@@ -273,65 +250,122 @@ def clear_directory(directory):
                 print(f"Failed to delete {file_path}. Reason: {e}")
 
 
+# Fungsi untuk menghitung metrik per fungsi dari isi satu file Kotlin
+def analyze_file_functions(content, file, project_name, extraction_date):
+    results = []  # Baris hasil untuk file ini
+    # Paket, kelas, fungsi, dan konstruktor dalam satu pass regex
+    declarations = patterns.scan_declarations(content)
+    package = declarations["package"] or "default"  # Menentukan paket
+    file_dependencies = dependencies.index_file(content, package)
+
+    # Skrip tanpa kelas (build.gradle.kts): satu baris per blok tingkat atas
+    if script.is_plain_script(file, content):
+        for block_name, block in script.top_level_blocks(content):
+            results.append(
+                {
+                    "Extraction Date": extraction_date,
+                    "Project": project_name,
+                    "Package": package,
+                    "Class": file,
+                    "Function": block_name,
+                    "NOLV_METHOD": calculate_nolv(block),
+                    "CYCLO_METHOD": calculate_cyclomatic_complexity(block),
+                    "NUMBER_CONSTRUCTOR_NOTDEFAULTCONSTRUCTOR_METHOD": 0,
+                }
+            )
+        return package, file_dependencies, results
+
+    # Mencari semua kelas dan fungsi dalam konten file
+    classes = declarations["class_names"]
+    functions = declarations["function_names"]
+    for class_name in classes:
+        # Menghitung konstruktor non-default untuk kelas tersebut
+        non_default_constructors = declarations["constructors"].get(class_name, 0)
+
+        for function in functions:
+            # Mengambil isi dari fungsi yang sedang dianalisis
+            function_content = clones.extract_function_content(content, function)
+
+            # Menghitung metrik untuk setiap fungsi
+            nolv = calculate_nolv(function_content)
+            cyclo = calculate_cyclomatic_complexity(function_content)
+
+            # Menyimpan hasil analisis dalam bentuk dictionary
+            results.append(
+                {
+                    "Extraction Date": extraction_date,
+                    "Project": project_name,
+                    "Package": package,
+                    "Class": class_name,
+                    "Function": function,
+                    # "FunctionContent": function_content,  # Menambahkan kolom baru berisi isi fungsi
+                    "NOLV_METHOD": nolv,
+                    "CYCLO_METHOD": cyclo,
+                    "NUMBER_CONSTRUCTOR_NOTDEFAULTCONSTRUCTOR_METHOD": non_default_constructors,
+                }
+            )
+    return package, file_dependencies, results
+
+
 # Fungsi untuk membaca zip dan mengolah file Kotlin secara per function
-def analyze_kotlin_files_per_function(zip_file, project_name):
-    clear_directory("kotlin_files")  # Membersihkan folder sebelum ekstraksi
-    with zipfile.ZipFile(zip_file, "r") as zip_ref:
-        zip_ref.extractall("kotlin_files")  # Mengekstrak semua file ZIP ke dalam folder
+def analyze_kotlin_files_per_function(zip_file, project_name, excludes=None, progress=None):
+    # Setiap pemanggilan mengekstrak ke direktori sementara sendiri, jadi
+    # beberapa sesi/pekerjaan tidak saling menimpa file
+    with tempfile.TemporaryDirectory() as temp_dir:
+        extract_zip(zip_file, temp_dir)
+        return analyze_directory_per_function(temp_dir, project_name, excludes, progress)
+
 
+def analyze_directory_per_function(directory, project_name, excludes=None, progress=None):
     packages = set()  # Set untuk menyimpan nama paket unik
     results = []  # List untuk menyimpan hasil analisis
+    dependency_index = []  # Indeks import/referensi per file untuk metrik kopling
     extraction_date = datetime.now().strftime(
         "%Y-%m-%d"
     )  # Mendapatkan tanggal ekstraksi
-
-    # Iterasi melalui semua file dalam direktori kotlin_files
-    for root, _, files in os.walk("kotlin_files"):
-        for file in files:
-            if file.endswith(".kt"):  # Memeriksa apakah file adalah file Kotlin
-                file_path = os.path.join(root, file)
-                with open(file_path, "r", encoding="utf-8") as f:
-                    content = f.read()  # Membaca konten file
-
-                # Mencari nama paket dalam file Kotlin
-                package_name = re.search(r"package\s+([\w\.]+)", content)
-                package = (
-                    package_name.group(1) if package_name else "default"
-                )  # Menentukan paket
-                packages.add(package)  # Menambahkan nama paket ke set
-
-                # Mencari semua kelas dalam konten file
-                classes = find_classes(content)
-                for class_name in classes:
-                    # Menghitung konstruktor non-default untuk kelas tersebut
-                    non_default_constructors = count_non_default_constructors(
-                        content, class_name
-                    )
-
-                    # Mencari semua fungsi dalam konten file
-                    functions = find_functions(content)
-                    for function in functions:
-                        # Mengambil isi dari fungsi yang sedang dianalisis
-                        function_content = extract_function_content(content, function)
-
-                        # Menghitung metrik untuk setiap fungsi
-                        nolv = calculate_nolv(function_content)
-                        cyclo = calculate_cyclomatic_complexity(function_content)
-
-                        # Menyimpan hasil analisis dalam bentuk dictionary
-                        results.append(
-                            {
-                                "Extraction Date": extraction_date,
-                                "Project": project_name,
-                                "Package": package,
-                                "Class": class_name,
-                                "Function": function,
-                                # "FunctionContent": function_content,  # Menambahkan kolom baru berisi isi fungsi
-                                "NOLV_METHOD": nolv,
-                                "CYCLO_METHOD": cyclo,
-                                "NUMBER_CONSTRUCTOR_NOTDEFAULTCONSTRUCTOR_METHOD": non_default_constructors,
-                            }
-                        )
+    analyzed = {}  # (digest isi, nama file) -> hasil analyze_file_functions
+
+    # Iterasi melalui file Kotlin, tanpa masuk ke direktori yang diabaikan
+    files = list(ignore.walk(directory, archive.KOTLIN_EXTENSIONS, excludes))
+    for number, (root, file) in enumerate(files, start=1):
+        if progress:
+            progress(number, len(files))
+        file_path = os.path.join(root, file)
+        data = scan.read_bytes(file_path)
+        # Salinan identik dianalisis sekali; nama file ikut menjadi kunci
+        # karena skrip tanpa kelas memakainya sebagai nama Class
+        key = (scan.content_digest(data), file)
+        if key not in analyzed:
+            analyzed[key] = analyze_file_functions(
+                scan.decode_source(data), file, project_name, extraction_date
+            )
+        package, file_dependencies, file_results = analyzed[key]
+        packages.add(package)  # Menambahkan nama paket ke set
+        dependency_index.append(file_dependencies)
+        # Salinan dict: metrik kopling ditambahkan per baris di bawah
+        results.extend(dict(row) for row in file_results)
+
+    # Menambahkan metrik kopling kelas dan paket ke setiap baris
+    coupling = dependencies.analyze_dependencies(dependency_index)
+    class_coupling = coupling["classes"].set_index(["Package", "Class"])
+    class_coupling = dict(
+        zip(class_coupling.index, zip(class_coupling["Fan In"], class_coupling["Fan Out"]))
+    )
+    package_coupling = coupling["packages"].set_index("Package")
+    package_coupling = dict(
+        zip(
+            package_coupling.index,
+            zip(package_coupling["Ca"], package_coupling["Ce"], package_coupling["Instability"]),
+        )
+    )
+    for result in results:
+        fan_in, fan_out = class_coupling.get((result["Package"], result["Class"]), (0, 0))
+        ca, ce, instability = package_coupling.get(result["Package"], (0, 0, 0))
+        result["FANIN_CLASS"] = int(fan_in)
+        result["FANOUT_CLASS"] = int(fan_out)
+        result["CA_PACKAGE"] = int(ca)
+        result["CE_PACKAGE"] = int(ce)
+        result["INSTABILITY_PACKAGE"] = float(instability)
     return results  # Mengembalikan hasil analisis sebagai list of dictionaries
 
 
@@ -412,59 +446,60 @@ def identify_code_smells(lines):
 
 
 # Fungsi untuk menghitung laporan kompleksitas
-def calculate_complexity_report(directory):
-    loc = 0  # Total baris kode
-    sloc = 0  # Total baris kode sumber
-    lloc = 0  # Total baris logis
-    cloc = 0  # Total baris komentar
-    cognitive_complexity = 0  # Kompleksitas kognitif
-    code_smells = 0  # Jumlah code smells
-    comment_ratio = 0  # Rasio komentar
-    mcc_count = 0  # Hitungan kompleksitas siklomatik
-    total_code_smells = 0  # Total code smells terdeteksi
-
-    # Menelusuri direktori untuk mencari file .kt
-    for root, dirs, files_in_dir in os.walk(directory):
-        for file in files_in_dir:
-            if file.endswith(".kt"):  # Memeriksa file Kotlin
-                file_path = os.path.join(root, file)
-                with open(file_path, "r", encoding="utf-8") as f:
-                    lines = f.readlines()  # Membaca semua baris dalam file
-
-                    # Menghitung total baris kode (loc)
-                    loc += len(lines)
-
-                    # Menghitung kode sumber (sloc), baris logis (lloc), dan komentar (cloc)
-                    for line in lines:
-                        stripped_line = (
-                            line.strip()
-                        )  # Menghapus spasi di awal dan akhir
-                        if stripped_line.startswith("//"):
-                            cloc += 1  # Menghitung baris komentar
-                        elif stripped_line != "":
-                            sloc += 1  # Menghitung baris sumber
-                            lloc += 1  # Menghitung setiap baris non-kosong sebagai baris logis
-
-                            # Menghitung kompleksitas kognitif dan MCC
-                            cognitive_complexity += calculate_cognitive_complexity(
-                                stripped_line
-                            )
-                            mcc_count += calculate_mcc(stripped_line)
-
-                    # Menghitung total code smells
-                    total_code_smells += identify_code_smells(lines)
+def calculate_complexity_report(directory, excludes=None, progress=None):
+    file_rows = []  # Hitungan per file dalam bentuk kolom, dijumlahkan di akhir
+    function_bodies = []  # Pasangan ((file, fungsi), isi fungsi) untuk deteksi klon
+    analyzed = {}  # Digest isi file -> (hitungan baris, isi fungsi)
+
+    # Menelusuri direktori untuk mencari file .kt dan .kts, tanpa masuk ke direktori yang diabaikan
+    files = list(ignore.walk(directory, archive.KOTLIN_EXTENSIONS, excludes))
+    for root, file in files:
+        file_path = os.path.join(root, file)
+        if progress:
+            progress(len(file_rows) + 1, len(files))
+        # Pemindaian byte-level pada file yang di-mmap, tanpa objek per baris
+        with scan.mapped_file(file_path) as buf:
+            # Salinan file yang identik hanya dipindai sekali
+            key = scan.content_digest(buf)
+            if key not in analyzed:
+                counts = scan.scan_buffer(buf)
+                content = scan.decode_source(buf[:])
+                analyzed[key] = (counts, clones.function_bodies(content))
+        counts, functions = analyzed[key]
+
+        # Mengumpulkan isi setiap fungsi untuk deteksi duplikasi
+        for function, function_content in functions:
+            function_bodies.append(((file_path, function), function_content))
+
+        file_rows.append(
+            {
+                "file": file_path,
+                "loc": counts["loc"],  # Total baris kode (loc)
+                "sloc": counts["sloc"],
+                "lloc": counts["sloc"],  # Setiap baris non-kosong dihitung sebagai baris logis
+                "cloc": counts["cloc"],
+                # Kompleksitas kognitif dan MCC: satu poin per baris berisi kata kunci kontrol
+                "cognitive_complexity": counts["keyword_lines"],
+                "mcc": counts["keyword_lines"],
+                "code_smells": counts["long_lines"],
+            }
+        )
+
+    # Menjumlahkan semua kolom per file dalam satu operasi tervektorisasi
+    columns = ["loc", "sloc", "lloc", "cloc", "cognitive_complexity", "mcc", "code_smells"]
+    totals = pd.DataFrame(file_rows, columns=["file"] + columns)[columns].sum()
+    loc, sloc, lloc, cloc = (int(totals[c]) for c in ("loc", "sloc", "lloc", "cloc"))
+    # Fungsi duplikat (kelompok klon) dihitung sebagai code smell
+    clone_groups = clones.find_clone_groups(function_bodies)
+    duplicated_methods = sum(len(group) for group in clone_groups)
+    total_code_smells = int(totals["code_smells"]) + duplicated_methods
 
     # Menghitung metrik
-    if lloc > 0:
-        comment_ratio = (
-            (cloc / sloc) * 100 if sloc > 0 else 0
-        )  # Menghitung rasio komentar
-        mcc_per_1000_lloc = (
-            (mcc_count / (lloc / 1000)) if lloc > 0 else 0
-        )  # MCC per 1000 baris logis
-        code_smells_per_1000_lloc = (
-            (total_code_smells / (lloc / 1000)) if lloc > 0 else 0
-        )  # Code smells per 1000 baris logis
+    comment_ratio = (cloc / sloc) * 100 if sloc > 0 else 0  # Menghitung rasio komentar
+    mcc_per_1000_lloc = aggregate.per_1000(int(totals["mcc"]), lloc)  # MCC per 1000 baris logis
+    code_smells_per_1000_lloc = aggregate.per_1000(
+        total_code_smells, lloc
+    )  # Code smells per 1000 baris logis
 
     # Mengembalikan hasil laporan kompleksitas
     return {
@@ -472,14 +507,50 @@ def calculate_complexity_report(directory):
         "sloc": sloc,  # Total baris sumber
         "lloc": lloc,  # Total baris logis
         "cloc": cloc,  # Total baris komentar
-        "cognitive_complexity": cognitive_complexity,  # Kompleksitas kognitif
+        "cognitive_complexity": int(totals["cognitive_complexity"]),  # Kompleksitas kognitif
         "code_smells": total_code_smells,  # Total code smells
+        "duplicated_methods": duplicated_methods,  # Fungsi yang termasuk kelompok klon
+        "clone_groups": clone_groups,  # Kelompok fungsi duplikat
         "comment_ratio": comment_ratio,  # Rasio komentar
         "mcc_per_1000_lloc": mcc_per_1000_lloc,  # MCC per 1000 baris logis
         "code_smells_per_1000_lloc": code_smells_per_1000_lloc,  # Code smells per 1000 baris logis
     }
 
 
+# Pekerjaan antrian (lihat program.index.run_job): setiap pekerjaan
+# mengekstrak arsipnya ke direktori sementara sendiri
+def kotlin_files_job(data, excludes, progress=None):
+    with tempfile.TemporaryDirectory() as temp_dir:
+        extract_zip(BytesIO(data), temp_dir)
+        return analyze_kotlin_files(temp_dir, list(excludes), progress=progress)
+
+
+def complexity_job(data, excludes, progress=None):
+    with tempfile.TemporaryDirectory() as temp_dir:
+        extract_zip(BytesIO(data), temp_dir)
+        results = calculate_complexity_report(temp_dir, list(excludes), progress)
+        # Path klon dibuat relatif sebelum direktori sementara dihapus
+        results["clone_groups"] = [
+            [(os.path.relpath(path, temp_dir), function) for path, function in group]
+            for group in results["clone_groups"]
+        ]
+    return results
+
+
+def download_report_job(data, project_name, excludes, progress=None):
+    return analyze_kotlin_files_per_function(BytesIO(data), project_name, list(excludes), progress)
+
+
+def sampled_complexity_job(data, excludes, progress=None):
+    report = None
+    with tempfile.TemporaryDirectory() as temp_dir:
+        extract_zip(BytesIO(data), temp_dir)
+        for report in sampling.progressive_report(temp_dir, excludes=list(excludes)):
+            if progress:
+                progress(report["files_sampled"], report["files_total"], report)
+    return report
+
+
 # Fungsi untuk menampilkan halaman ringkasan laporan
 def show_summary_report_page():
     st.title("Summary Report")  # Menampilkan judul halaman
@@ -490,65 +561,52 @@ def show_summary_report_page():
     )
 
     if uploaded_file is not None:  # Jika file diunggah
-        # Menggunakan direktori sementara untuk mengekstrak file ZIP
-        with tempfile.TemporaryDirectory() as temp_dir:
-            zip_path = os.path.join(
-                temp_dir, uploaded_file.name
-            )  # Membuat path lengkap untuk file ZIP yang diunggah
-
-            # Menyimpan file ZIP yang diunggah
-            with open(zip_path, "wb") as f:
-                f.write(
-                    uploaded_file.getbuffer()
-                )  # Menyimpan konten file ke dalam direktori sementara
-
-            # Mengekstrak file ZIP
-            extract_zip(zip_path, temp_dir)
-
-            # Menjalankan analisis file Kotlin
-            results = analyze_kotlin_files(temp_dir)
-
-            # Menampilkan ringkasan laporan
-            st.subheader("Summary Report:")  # Menampilkan subjudul
-            st.write(
-                "Number of Packages:", results["number of packages"]
-            )  # Menampilkan jumlah paket
-            st.write(
-                "Number of Kotlin Files:", results["number of files"]
-            )  # Menampilkan jumlah file Kotlin
-            st.write(
-                "Number of Classes:", results["number of classes"]
-            )  # Menampilkan jumlah kelas
-            st.write(
-                "Number of Functions:", results["number of functions"]
-            )  # Menampilkan jumlah fungsi
-            st.write(
-                "Number of Properties:", results["number of properties"]
-            )  # Menampilkan jumlah properti
-
-            # Penjelasan untuk setiap metrik dalam Bahasa Indonesia
-            st.subheader("Penjelasan Metrik:")  # Menampilkan subjudul penjelasan metrik
-            st.write(
-                """
-            **1. Lines of Code (LOC)**: Total baris kode, termasuk baris kosong dan komentar. Ini menunjukkan ukuran keseluruhan dari proyek.
+        # Analisis berjalan di antrian pekerjaan; rerun hanya membaca status
+        results = index.run_job(kotlin_files_job, uploaded_file, tuple(exclude_patterns()))
+        if results is None:
+            return
+
+        # Menampilkan ringkasan laporan
+        st.subheader("Summary Report:")  # Menampilkan subjudul
+        st.write(
+            "Number of Packages:", results["number of packages"]
+        )  # Menampilkan jumlah paket
+        st.write(
+            "Number of Kotlin Files:", results["number of files"]
+        )  # Menampilkan jumlah file Kotlin
+        st.write(
+            "Number of Classes:", results["number of classes"]
+        )  # Menampilkan jumlah kelas
+        st.write(
+            "Number of Functions:", results["number of functions"]
+        )  # Menampilkan jumlah fungsi
+        st.write(
+            "Number of Properties:", results["number of properties"]
+        )  # Menampilkan jumlah properti
+
+        # Penjelasan untuk setiap metrik dalam Bahasa Indonesia
+        st.subheader("Penjelasan Metrik:")  # Menampilkan subjudul penjelasan metrik
+        st.write(
+            """
+        **1. Lines of Code (LOC)**: Total baris kode, termasuk baris kosong dan komentar. Ini menunjukkan ukuran keseluruhan dari proyek.
 
-            **2. Source Lines of Code (SLOC)**: Baris kode sumber yang sebenarnya, tanpa menghitung baris kosong atau komentar. Ini menunjukkan kode yang dieksekusi.
+        **2. Source Lines of Code (SLOC)**: Baris kode sumber yang sebenarnya, tanpa menghitung baris kosong atau komentar. Ini menunjukkan kode yang dieksekusi.
 
-            **3. Logical Lines of Code (LLOC)**: Baris logis dari kode yang mengekspresikan satu operasi, seperti satu pernyataan. Ini memberikan gambaran yang lebih tepat tentang kompleksitas fungsional kode.
+        **3. Logical Lines of Code (LLOC)**: Baris logis dari kode yang mengekspresikan satu operasi, seperti satu pernyataan. Ini memberikan gambaran yang lebih tepat tentang kompleksitas fungsional kode.
 
-            **4. Comment Lines of Code (CLOC)**: Jumlah baris yang berisi komentar. Komentar membantu pengembang lain memahami kode, sehingga persentase yang sehat dari CLOC penting.
+        **4. Comment Lines of Code (CLOC)**: Jumlah baris yang berisi komentar. Komentar membantu pengembang lain memahami kode, sehingga persentase yang sehat dari CLOC penting.
 
-            **5. Cognitive Complexity**: Mengukur betapa sulitnya memahami kode secara keseluruhan. Nilai yang lebih tinggi berarti kode lebih sulit dipahami.
+        **5. Cognitive Complexity**: Mengukur betapa sulitnya memahami kode secara keseluruhan. Nilai yang lebih tinggi berarti kode lebih sulit dipahami.
 
-            **6. Code Smells**: Jumlah potensi masalah di kode yang dapat mengindikasikan kebutuhan perbaikan (misalnya, duplikasi kode, kode yang terlalu panjang, dll.).
+        **6. Code Smells**: Jumlah potensi masalah di kode yang dapat mengindikasikan kebutuhan perbaikan (misalnya, duplikasi kode, kode yang terlalu panjang, dll.).
 
-            **7. Comment Source Ratio**: Persentase baris komentar dibandingkan dengan kode sumber. Persentase ini menunjukkan seberapa baik kode terdokumentasi.
+        **7. Comment Source Ratio**: Persentase baris komentar dibandingkan dengan kode sumber. Persentase ini menunjukkan seberapa baik kode terdokumentasi.
 
-            **8. MCC (McCabe Cyclomatic Complexity) per 1,000 LLOC**: Mengukur kompleksitas jalur kode berdasarkan jumlah cabang logika (if, while, dll.). Nilai yang lebih tinggi menunjukkan kode yang lebih sulit untuk diuji dan dipelihara.
+        **8. MCC (McCabe Cyclomatic Complexity) per 1,000 LLOC**: Mengukur kompleksitas jalur kode berdasarkan jumlah cabang logika (if, while, dll.). Nilai yang lebih tinggi menunjukkan kode yang lebih sulit untuk diuji dan dipelihara.
 
-            **9. Code Smells per 1,000 LLOC**: Rasio jumlah code smells per 1.000 baris logis. Semakin tinggi angkanya, semakin besar kemungkinan ada masalah kualitas kode.
-            """
-            )
+        **9. Code Smells per 1,000 LLOC**: Rasio jumlah code smells per 1.000 baris logis. Semakin tinggi angkanya, semakin besar kemungkinan ada masalah kualitas kode.
+        """
+        )
 
 # Fungsi untuk menampilkan laporan detail
 def show_detailed_report_page():
@@ -560,44 +618,31 @@ def show_detailed_report_page():
     )
 
     if uploaded_file is not None:  # Jika file diunggah
-        # Menggunakan direktori sementara untuk mengekstrak file ZIP
-        with tempfile.TemporaryDirectory() as temp_dir:
-            zip_path = os.path.join(
-                temp_dir, uploaded_file.name
-            )  # Membuat path lengkap untuk file ZIP yang diunggah
-
-            # Menyimpan file ZIP yang diunggah
-            with open(zip_path, "wb") as f:
-                f.write(
-                    uploaded_file.getbuffer()
-                )  # Menyimpan konten file ke dalam direktori sementara
-
-            # Mengekstrak file ZIP
-            extract_zip(zip_path, temp_dir)
-
-            # Menjalankan analisis file Kotlin
-            results = analyze_kotlin_files(temp_dir)
-
-            # Menampilkan rincian yang dikelompokkan berdasarkan paket
-            st.subheader("Details by Package")  # Menampilkan subjudul
-
-            for index, (package, details) in enumerate(
-                results["Packages"].items(), start=1
-            ):
-                st.write(f"**Package {index}:** {package}")  # Menampilkan nama paket
-                st.write(
-                    f"**Files ({len(details['files'])}):** {details['files']}"
-                )  # Menampilkan daftar file dalam paket
-                st.write(
-                    f"**Classes ({len(details['classes'])}):** {details['classes']}"
-                )  # Menampilkan daftar kelas dalam paket
-                st.write(
-                    f"**Functions ({len(details['functions'])}):** {details['functions']}"
-                )  # Menampilkan daftar fungsi dalam paket
-                st.write(
-                    f"**Properties ({len(details['properties'])}):** {details['properties']}"
-                )  # Menampilkan daftar properti dalam paket
-                st.write("---")  # Menampilkan garis pemisah
+        # Analisis berjalan di antrian pekerjaan; rerun hanya membaca status
+        results = index.run_job(kotlin_files_job, uploaded_file, tuple(exclude_patterns()))
+        if results is None:
+            return
+
+        # Menampilkan rincian yang dikelompokkan berdasarkan paket
+        st.subheader("Details by Package")  # Menampilkan subjudul
+
+        for number, (package, details) in enumerate(
+            results["Packages"].items(), start=1
+        ):
+            st.write(f"**Package {number}:** {package}")  # Menampilkan nama paket
+            st.write(
+                f"**Files ({len(details['files'])}):** {list(details['files'])}"
+            )  # Menampilkan daftar file dalam paket
+            st.write(
+                f"**Classes ({len(details['classes'])}):** {list(details['classes'])}"
+            )  # Menampilkan daftar kelas dalam paket
+            st.write(
+                f"**Functions ({len(details['functions'])}):** {list(details['functions'])}"
+            )  # Menampilkan daftar fungsi dalam paket
+            st.write(
+                f"**Properties ({len(details['properties'])}):** {list(details['properties'])}"
+            )  # Menampilkan daftar properti dalam paket
+            st.write("---")  # Menampilkan garis pemisah
 
 
 # Fungsi untuk menampilkan halaman laporan kompleksitas
@@ -608,55 +653,83 @@ def show_complexity_report_page():
     uploaded_file = st.file_uploader(
         "Upload a ZIP file containing Kotlin files", type="zip"
     )
+    # Mode perkiraan untuk codebase besar: sampel berstrata yang makin tepat
+    approximate = st.checkbox("Approximate mode (stratified sampling)")
 
     if uploaded_file is not None:  # Jika file diunggah
-        # Menggunakan direktori sementara untuk mengekstrak file ZIP
-        with tempfile.TemporaryDirectory() as temp_dir:
-            zip_path = os.path.join(
-                temp_dir, uploaded_file.name
-            )  # Membuat path lengkap untuk file ZIP yang diunggah
-
-            # Menyimpan file ZIP yang diunggah
-            with open(zip_path, "wb") as f:
-                f.write(
-                    uploaded_file.getbuffer()
-                )  # Menyimpan konten file ke dalam direktori sementara
-
-            # Mengekstrak file ZIP
-            extract_zip(zip_path, temp_dir)
-
-            # Menjalankan analisis laporan kompleksitas
-            results = calculate_complexity_report(temp_dir)
-
-            # Menampilkan laporan kompleksitas
-            st.subheader("Complexity Report:")  # Menampilkan subjudul
-            st.write(
-                "Total Lines of Code (LOC):", results["loc"]
-            )  # Menampilkan total baris kode
-            st.write(
-                "Source Lines of Code (SLOC):", results["sloc"]
-            )  # Menampilkan baris kode sumber
-            st.write(
-                "Logical Lines of Code (LLOC):", results["lloc"]
-            )  # Menampilkan baris logis kode
-            st.write(
-                "Comment Lines of Code (CLOC):", results["cloc"]
-            )  # Menampilkan baris komentar kode
-            st.write(
-                "Cognitive Complexity:", results["cognitive_complexity"]
-            )  # Menampilkan kompleksitas kognitif
-            st.write(
-                "Number of Total Code Smells:", results["code_smells"]
-            )  # Menampilkan jumlah code smells
-            st.write(
-                "Comment Source Ratio (%):", results["comment_ratio"]
-            )  # Menampilkan rasio komentar terhadap kode sumber
-            st.write(
-                "MCC per 1,000 LLOC:", results["mcc_per_1000_lloc"]
-            )  # Menampilkan MCC per 1.000 LLOC
-            st.write(
-                "Code Smells per 1,000 LLOC:", results["code_smells_per_1000_lloc"]
-            )  # Menampilkan code smells per 1.000 LLOC
+        if approximate:
+            show_sampled_complexity_report(uploaded_file, tuple(exclude_patterns()))
+            return
+
+        # Analisis berjalan di antrian pekerjaan; rerun hanya membaca status
+        results = index.run_job(complexity_job, uploaded_file, tuple(exclude_patterns()))
+        if results is None:
+            return
+
+        # Menampilkan laporan kompleksitas
+        st.subheader("Complexity Report:")  # Menampilkan subjudul
+        st.write(
+            "Total Lines of Code (LOC):", results["loc"]
+        )  # Menampilkan total baris kode
+        st.write(
+            "Source Lines of Code (SLOC):", results["sloc"]
+        )  # Menampilkan baris kode sumber
+        st.write(
+            "Logical Lines of Code (LLOC):", results["lloc"]
+        )  # Menampilkan baris logis kode
+        st.write(
+            "Comment Lines of Code (CLOC):", results["cloc"]
+        )  # Menampilkan baris komentar kode
+        st.write(
+            "Cognitive Complexity:", results["cognitive_complexity"]
+        )  # Menampilkan kompleksitas kognitif
+        st.write(
+            "Number of Total Code Smells:", results["code_smells"]
+        )  # Menampilkan jumlah code smells
+        st.write(
+            "Duplicated Methods:", results["duplicated_methods"]
+        )  # Menampilkan jumlah fungsi duplikat
+        st.write(
+            "Comment Source Ratio (%):", results["comment_ratio"]
+        )  # Menampilkan rasio komentar terhadap kode sumber
+        st.write(
+            "MCC per 1,000 LLOC:", results["mcc_per_1000_lloc"]
+        )  # Menampilkan MCC per 1.000 LLOC
+        st.write(
+            "Code Smells per 1,000 LLOC:", results["code_smells_per_1000_lloc"]
+        )  # Menampilkan code smells per 1.000 LLOC
+
+        # Menampilkan kelompok fungsi duplikat
+        if results["clone_groups"]:
+            st.subheader("Clone Groups")
+            for number, group in enumerate(results["clone_groups"], start=1):
+                members = ", ".join(f"{path}::{function}" for path, function in group)
+                st.write(f"**Group {number}:** {members}")
+
+
+# Fungsi untuk menampilkan estimasi kompleksitas yang diperbarui per batch
+def show_sampled_complexity_report(uploaded_file, excludes=None):
+    st.subheader("Estimated Complexity Report:")
+    # Estimasi batch terakhir tampil selama pekerjaan masih berjalan
+    report = index.run_job(
+        sampled_complexity_job, uploaded_file, excludes, show_partial=show_sampled_estimates
+    )
+    if report is None:
+        return
+    show_sampled_estimates(report)
+    st.caption(
+        f"Code smells include {report['duplicated_methods']} duplicated methods found among the sampled files; "
+        "before the last batch this part is a lower bound."
+    )
+
+
+def show_sampled_estimates(report):
+    estimates = pd.DataFrame(
+        report["estimates"], index=["Estimate", "CI Low (95%)", "CI High (95%)"]
+    ).T
+    label = "exact" if report["exact"] else "sampled"
+    st.write(f"{report['files_sampled']}/{report['files_total']} files {label}")
+    st.dataframe(estimates)
 
 
 # Fungsi untuk menampilkan halaman Download Report
@@ -667,19 +740,26 @@ def show_download_report_page():
     uploaded_zip = st.file_uploader("Upload Kotlin ZIP", type="zip")
 
     if uploaded_zip and project_name:
-        st.success("File uploaded successfully")
-        results = analyze_kotlin_files_per_function(
-            BytesIO(uploaded_zip.read()), project_name
+        results = index.run_job(
+            download_report_job, uploaded_zip, project_name, tuple(exclude_patterns())
         )
 
         if results:
             df = pd.DataFrame(results)
 
-            total_nolv = df["NOLV_METHOD"].sum()
-            total_cyclo = df["CYCLO_METHOD"].sum()
-            total_not_default_constructors = df[
-                "NUMBER_CONSTRUCTOR_NOTDEFAULTCONSTRUCTOR_METHOD"
+            # Menghitung semua total sekaligus dalam satu operasi tervektorisasi
+            totals = df[
+                [
+                    "NOLV_METHOD",
+                    "CYCLO_METHOD",
+                    "NUMBER_CONSTRUCTOR_NOTDEFAULTCONSTRUCTOR_METHOD",
+                ]
             ].sum()
+            total_nolv = totals["NOLV_METHOD"]
+            total_cyclo = totals["CYCLO_METHOD"]
+            total_not_default_constructors = totals[
+                "NUMBER_CONSTRUCTOR_NOTDEFAULTCONSTRUCTOR_METHOD"
+            ]
 
             col1, col2, col3 = st.columns(3)
             with col1:
@@ -714,10 +794,155 @@ def show_download_report_page():
             )
 
             st.info(f"Displaying rows {start_row + 1} to {end_row}")
+
+            # Ringkasan per paket dan per kelas dari hasil per fungsi
+            rollups = aggregate.aggregate_metrics(
+                df, cc_column="CYCLO_METHOD", loc_column=None, method_column="Function"
+            )
+            st.subheader("Package Summary")
+            st.dataframe(rollups["packages"])
+            st.subheader("Class Summary")
+            st.dataframe(rollups["classes"])
+
+            # Menyimpan snapshot ke basis data riwayat untuk laporan tren
+            if st.button("Save to History"):
+                conn = history.connect()
+                snapshot_id = history.ingest_dataframe(
+                    conn, df, project_name, df["Extraction Date"].iloc[0]
+                )
+                conn.close()
+                st.success(f"Saved as snapshot {snapshot_id}")
     else:
         st.warning("Please enter a project name and upload a Kotlin zip file.")
 
 
+# Analisis dependensi di-cache per isi ZIP agar rerun Streamlit tidak menghitung ulang
+@st.cache_data(show_spinner="Building dependency graph...")
+def dependency_report(zip_bytes, excludes=None):
+    with tempfile.TemporaryDirectory() as temp_dir:
+        extract_zip(BytesIO(zip_bytes), temp_dir)
+        results = analyze_kotlin_files(temp_dir, excludes)
+    return dependencies.analyze_dependencies(results["Dependency Index"])
+
+
+# Fungsi untuk menampilkan halaman laporan dependensi
+def show_dependency_report_page():
+    st.title("Dependency Report")  # Menampilkan judul halaman
+
+    uploaded_file = st.file_uploader(
+        "Upload a ZIP file containing Kotlin files", type="zip"
+    )
+
+    if uploaded_file is not None:  # Jika file diunggah
+        report = dependency_report(uploaded_file.getvalue(), exclude_patterns())
+
+        # Metrik kopling per paket (Ca, Ce, Instability)
+        st.subheader("Package Coupling")
+        st.dataframe(report["packages"])
+        st.download_button(
+            label="Download Package CSV",
+            data=download_csv(report["packages"]),
+            file_name="kotlin_package_coupling.csv",
+            mime="text/csv",
+        )
+
+        # Fan-in dan fan-out per kelas
+        st.subheader("Class Coupling")
+        st.dataframe(report["classes"])
+        st.download_button(
+            label="Download Class CSV",
+            data=download_csv(report["classes"]),
+            file_name="kotlin_class_coupling.csv",
+            mime="text/csv",
+        )
+
+        # Siklus dependensi (komponen terhubung kuat)
+        st.subheader("Dependency Cycles")
+        if not report["package_cycles"] and not report["class_cycles"]:
+            st.write("No cycles found.")
+        for cycle in report["package_cycles"]:
+            st.write("**Package cycle:**", " -> ".join(cycle))
+        for cycle in report["class_cycles"]:
+            st.write("**Class cycle:**", " -> ".join(cycle))
+
+
+# Fungsi untuk menampilkan halaman tren dari basis data riwayat
+def show_trend_report_page():
+    st.header("Trend Report")
+
+    conn = history.connect()
+    try:
+        # Mengimpor CSV Download Report lama ke basis data riwayat
+        uploaded_csv = st.file_uploader("Import Download Report CSV", type="csv")
+        if uploaded_csv is not None and st.button("Import CSV"):
+            snapshot_ids = history.ingest_csv(conn, uploaded_csv)
+            st.success(f"Imported {len(snapshot_ids)} snapshot(s)")
+
+        # Riwayat langsung dari repositori git lokal, satu snapshot per commit
+        with st.expander("Analyze Local Git History"):
+            repo_path = st.text_input("Repository path")
+            revision_range = st.text_input("Revision range", value="HEAD")
+            max_commits = st.number_input("Last N commits (0 = all)", min_value=0, value=100)
+            if repo_path and st.button("Analyze History"):
+                try:
+                    # Rentang diawali "-" ditolak sebelum sampai ke git
+                    githistory.check_revision_range(revision_range)
+                except ValueError as e:
+                    st.error(str(e))
+                else:
+                    with st.spinner("Analyzing commits..."):
+                        result = githistory.analyze_history(
+                            repo_path, revision_range, max_commits or None
+                        )
+                        snapshot_ids = githistory.ingest_history(
+                            conn, os.path.basename(os.path.abspath(repo_path)), result["snapshots"]
+                        )
+                    st.success(
+                        f"Saved {len(snapshot_ids)} commit snapshot(s); "
+                        f"{result['file_versions']} file versions from {result['parsed_blobs']} parsed blobs"
+                    )
+                    st.subheader("Hotspots (Churn x CC)")
+                    st.dataframe(result["hotspots"])
+                    st.download_button(
+                        label="Download Hotspots CSV",
+                        data=download_csv(result["hotspots"]),
+                        file_name="kotlin_hotspots.csv",
+                        mime="text/csv",
+                    )
+
+        projects = history.list_projects(conn)
+        if not projects:
+            st.warning("No snapshots yet. Save a report from the Download Report page.")
+            return
+
+        project = st.selectbox("Project", projects)
+        metric = st.selectbox("Metric", history.list_metrics(conn, project))
+        limit = st.number_input("Last N snapshots", min_value=1, value=90)
+
+        # Tren tingkat proyek
+        st.subheader("Project Trend")
+        project_df = history.project_trend(conn, project, metric, limit)
+        st.line_chart(project_df, x="snapshot", y=["total", "mean", "max"])
+
+        # Tren per metode
+        method = st.selectbox("Method", history.list_methods(conn, project))
+        if method:
+            st.subheader(f"Method Trend: {method}")
+            method_df = history.method_trend(conn, project, method, metric, limit)
+            st.line_chart(method_df, x="snapshot", y="value", color="class")
+            st.write(method_df)
+
+        # Smell dari snapshot terakhir; kolom signature hanya ada pada snapshot AST/riwayat git
+        st.subheader(f"Above Threshold: {metric}")
+        threshold = st.number_input("Threshold", value=10.0)
+        st.dataframe(history.metric_above(conn, project, metric, threshold))
+        if "Parameters" in history.list_metrics(conn, project):
+            st.subheader(f"Too Many Parameters (> {signatures.TOO_MANY_PARAMETERS})")
+            st.dataframe(history.too_many_parameters(conn, project, signatures.TOO_MANY_PARAMETERS))
+    finally:
+        conn.close()
+
+
 # Fungsi utama untuk menjalankan aplikasi Streamlit
 def main():
     # Menambahkan sidebar yang lebih interaktif menggunakan `streamlit-option-menu`
@@ -742,13 +967,18 @@ def style_sidebar():
                 "Summary Report",  # Pilihan laporan ringkasan
                 "Detailed Report",  # Pilihan laporan detail
                 "Complexity Report",  # Pilihan laporan kompleksitas
+                "Dependency Report",  # Pilihan laporan dependensi
                 "Download Report",  # Pilihan laporan unduh
+                "Trend Report",  # Pilihan laporan tren riwayat
             ],
             icons=[
+                "diagram-3",  # Ikon untuk halaman AST
                 "graph-up",  # Ikon untuk laporan ringkasan
                 "list-task",  # Ikon untuk laporan detail
                 "bar-chart",  # Ikon untuk laporan kompleksitas
+                "diagram-2",  # Ikon untuk laporan dependensi
                 "download",  # Ikon untuk laporan unduh
+                "clock-history",  # Ikon untuk laporan tren
             ],
             menu_icon="menu-button-wide",  # Ikon untuk judul menu
             default_index=0,  # Indeks default (dimulai dari 0)
@@ -770,8 +1000,22 @@ def style_sidebar():
                 },  # Gaya untuk link yang dipilih
             },
         )
+        # Pola direktori/file yang dilewati saat menelusuri proyek (sintaks .gitignore)
+        st.text_area(
+            "Exclude patterns",
+            value="\n".join(ignore.DEFAULT_EXCLUDES),
+            key="exclude_patterns",
+            help="One .gitignore-style pattern per line. .gitignore files in the project are applied as well.",
+        )
     return selected  # Mengembalikan opsi yang dipilih
 
+
+# Fungsi untuk membaca pola pengecualian dari sidebar
+def exclude_patterns():
+    return ignore.parse_patterns(
+        st.session_state.get("exclude_patterns", "\n".join(ignore.DEFAULT_EXCLUDES))
+    )
+
 import sys
 # Tambahkan folder induk ke path agar Python bisa mengenali 'program' sebagai modul
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
@@ -793,8 +1037,12 @@ def main():
         show_detailed_report_page()  # Menampilkan halaman laporan detail
     elif page == "Complexity Report":  # Jika pilihan adalah laporan kompleksitas
         show_complexity_report_page()  # Menampilkan halaman laporan kompleksitas
+    elif page == "Dependency Report":  # Jika pilihan adalah laporan dependensi
+        show_dependency_report_page()  # Menampilkan halaman laporan dependensi
     elif page == "Download Report":  # Jika pilihan adalah laporan unduh
         show_download_report_page()  # Menampilkan halaman laporan unduh
+    elif page == "Trend Report":  # Jika pilihan adalah laporan tren
+        show_trend_report_page()  # Menampilkan halaman laporan tren
     elif page == "AST":
         show_ast_page()
 
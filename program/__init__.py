@@ -1 +1,2 @@
-from .index import *
\ No newline at end of file
+# Submodul diimpor langsung (mis. `from program import index`), sehingga CLI
+# seperti program.gate dan program.shard tidak ikut memuat streamlit.
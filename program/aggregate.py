@@ -0,0 +1,81 @@
+import numpy as np
+import pandas as pd
+
+# Kolom kunci untuk setiap tingkat agregasi
+PACKAGE_KEYS = ["Package"]
+CLASS_KEYS = ["Package", "Class"]
+
+
+def per_1000(count, lines):
+    """Menghitung kepadatan sebuah hitungan per 1000 baris (LOC atau LLOC)."""
+    return (count / (lines / 1000)) if lines > 0 else 0
+
+
+def method_rows(df, method_column="Method"):
+    """Membuang baris placeholder/error sehingga hanya tersisa baris metode."""
+    mask = pd.Series(True, index=df.index)
+    if "Error" in df.columns:
+        mask &= df["Error"].isna()
+    if method_column in df.columns:
+        mask &= ~df[method_column].isin(["None", "Error"])
+    return df[mask]
+
+
+def normalize_woc(df, cc_column="CC", keys=CLASS_KEYS):
+    """Menghitung WOC (CC / total CC per kelas) secara tervektorisasi."""
+    cc = pd.to_numeric(df[cc_column], errors="coerce").fillna(0)
+    totals = cc.groupby([df[key] for key in keys], sort=False).transform("sum")
+    return (cc / totals.where(totals != 0)).fillna(0)
+
+
+def _summarize(frame, keys, cc_column, loc_column):
+    """Ringkasan CC (mean, p90, max) dan LOC untuk satu tingkat agregasi."""
+    grouped = frame.groupby(keys, sort=False)
+    cc = grouped[cc_column]
+
+    summary = cc.agg(["count", "sum", "mean", "max"])
+    summary.columns = ["Methods", "CC Total", "CC Mean", "CC Max"]
+    summary.insert(3, "CC P90", cc.quantile(0.9))
+
+    if loc_column is not None:
+        loc_total = grouped[loc_column].sum()
+        summary["LOC Total"] = loc_total
+        # Kepadatan CC per 1000 LOC metode (bukan LLOC: baris metode dihitung fisik)
+        summary["CC per 1000 LOC"] = (
+            summary["CC Total"] / loc_total.where(loc_total > 0) * 1000
+        ).fillna(0)
+
+    return summary.reset_index()
+
+
+def aggregate_metrics(df, cc_column="CC", loc_column="LOC", method_column="Method"):
+    """
+    Menghitung semua rollup (proyek, paket, kelas) dalam satu tahap agregasi.
+
+    Mengembalikan dictionary berisi ringkasan proyek serta tabel ringkasan
+    per paket dan per kelas.
+    """
+    frame = method_rows(df, method_column)
+    columns = [cc_column] + ([loc_column] if loc_column is not None else [])
+    # astype: tanpa baris metode, apply tidak mengubah kolom object menjadi angka
+    numeric = frame[columns].apply(pd.to_numeric, errors="coerce").fillna(0).astype(float)
+    frame = pd.concat([frame[CLASS_KEYS], numeric], axis=1)
+
+    cc = frame[cc_column].to_numpy(dtype=float)
+    project = {
+        "methods": int(cc.size),
+        "cc_total": float(cc.sum()),
+        "cc_mean": float(cc.mean()) if cc.size else 0,
+        "cc_p90": float(np.quantile(cc, 0.9)) if cc.size else 0,
+        "cc_max": float(cc.max()) if cc.size else 0,
+    }
+    if loc_column is not None:
+        loc = float(frame[loc_column].sum())
+        project["loc_total"] = loc
+        project["cc_per_1000_loc"] = per_1000(project["cc_total"], loc)
+
+    return {
+        "project": project,
+        "packages": _summarize(frame, PACKAGE_KEYS, cc_column, loc_column),
+        "classes": _summarize(frame, CLASS_KEYS, cc_column, loc_column),
+    }
@@ -0,0 +1,141 @@
+import io
+import os
+import tarfile
+import tempfile
+import zipfile
+
+import patoolib
+
+from program import ignore
+
+try:
+    # libarchive membaca RAR/7z langsung di dalam proses, tanpa unrar/7z
+    import libarchive
+except ImportError:  # dependensi opsional
+    libarchive = None
+
+KOTLIN_EXTENSIONS = (".kt", ".kts")
+TAR_SUFFIXES = (".tar", ".tar.gz", ".tgz", ".tar.bz2", ".tar.xz")
+
+
+class _BufferFile(io.RawIOBase):
+    """
+    File hanya-baca yang bisa di-seek di atas buffer (memoryview dari
+    `getbuffer()`, bytearray, mmap) tanpa menyalin seluruh isinya; hanya
+    potongan yang dibaca yang disalin.
+    """
+
+    def __init__(self, data):
+        self._view = memoryview(data).cast("B")
+        self._position = 0
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def readinto(self, buffer):
+        target = memoryview(buffer).cast("B")
+        chunk = self._view[self._position:self._position + len(target)]
+        target[:len(chunk)] = chunk
+        self._position += len(chunk)
+        return len(chunk)
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        if whence == io.SEEK_CUR:
+            offset += self._position
+        elif whence == io.SEEK_END:
+            offset += len(self._view)
+        if offset < 0:
+            raise ValueError("negative seek position")
+        self._position = offset
+        return offset
+
+    def tell(self):
+        return self._position
+
+
+def _open_buffer(data):
+    """File di atas isi arsip; BytesIO berbagi memori dengan bytes tanpa salinan."""
+    return io.BytesIO(data) if isinstance(data, bytes) else _BufferFile(data)
+
+
+def _wanted(member_name, extensions, rules=None):
+    """
+    Memeriksa apakah anggota arsip termasuk file sumber yang dicari. Dengan
+    aturan abaikan, anggota yang cocok dilewati dan .gitignore ikut dibaca.
+    """
+    if rules is None:
+        return member_name.lower().endswith(extensions)
+    if rules.excluded(member_name):
+        return False
+    return member_name.lower().endswith(extensions) or os.path.basename(
+        member_name.replace("\\", "/")
+    ) == ignore.GITIGNORE
+
+
+def _iter_zip(data, extensions, rules=None):
+    with zipfile.ZipFile(_open_buffer(data), "r") as zip_ref:
+        for info in zip_ref.infolist():
+            if not info.is_dir() and _wanted(info.filename, extensions, rules):
+                yield info.filename, zip_ref.read(info)
+
+
+def _iter_tar(data, extensions, rules=None):
+    with tarfile.open(fileobj=_open_buffer(data), mode="r:*") as tar_ref:
+        for info in tar_ref:
+            if info.isfile() and _wanted(info.name, extensions, rules):
+                yield info.name, tar_ref.extractfile(info).read()
+
+
+def _iter_libarchive(data, extensions, rules=None):
+    # memory_reader hanya menerima bytes; buffer lain dibaca sebagai stream
+    if isinstance(data, bytes):
+        reader = libarchive.memory_reader(data)
+    else:
+        reader = libarchive.stream_reader(_BufferFile(data))
+    with reader as archive:
+        for entry in archive:
+            if entry.isfile and _wanted(entry.pathname, extensions, rules):
+                yield entry.pathname, b"".join(entry.get_blocks())
+            # Anggota lain dilewati tanpa didekompresi ke disk
+
+
+def _iter_patool(data, name, extensions, rules=None):
+    """Jalur cadangan lama: ekstraksi penuh memakai program eksternal."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        archive_path = os.path.join(temp_dir, os.path.basename(name))
+        with open(archive_path, "wb") as f:
+            f.write(data)
+        out_dir = os.path.join(temp_dir, "out")
+        os.mkdir(out_dir)
+        patoolib.extract_archive(archive_path, outdir=out_dir)
+        for root, _, files in os.walk(out_dir):
+            for file in files:
+                file_path = os.path.join(root, file)
+                member_name = os.path.relpath(file_path, out_dir)
+                if _wanted(member_name, extensions, rules):
+                    with open(file_path, "rb") as f:
+                        yield member_name, f.read()
+
+
+def iter_source_members(data, name, extensions=KOTLIN_EXTENSIONS, rules=None):
+    """
+    Mengalirkan (nama anggota, isi bytes) untuk file sumber di dalam arsip.
+
+    ZIP dan tar dibaca dengan pustaka standar, RAR/7z dengan libarchive jika
+    tersedia. Hanya anggota dengan ekstensi yang dicari yang didekompresi.
+    Dengan `rules` (ignore.IgnoreRules), anggota yang diabaikan dilewati dan
+    file .gitignore ikut dihasilkan untuk ignore.filter_members.
+    """
+    lower_name = name.lower()
+
+    # Buffer unggahan diteruskan apa adanya; tidak ada salinan seluruh arsip
+    if zipfile.is_zipfile(_open_buffer(data)):
+        return _iter_zip(data, extensions, rules)
+    if lower_name.endswith(TAR_SUFFIXES):
+        return _iter_tar(data, extensions, rules)
+    if libarchive is not None:
+        return _iter_libarchive(data, extensions, rules)
+    return _iter_patool(data, name, extensions, rules)
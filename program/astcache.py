@@ -0,0 +1,215 @@
+import functools
+import os
+import pickle
+import shutil
+import stat
+import tempfile
+from importlib import metadata
+
+from kopyt import Parser
+from program import scan
+
+
+
+def default_cache_dir():
+    """
+    Direktori cache per pengguna (tidak bergantung pada direktori kerja):
+    $KOTLIN_AST_CACHE, lalu $XDG_CACHE_HOME/%LOCALAPPDATA%, lalu ~/.cache.
+    """
+    if os.environ.get("KOTLIN_AST_CACHE"):
+        return os.environ["KOTLIN_AST_CACHE"]
+    base = os.environ.get("XDG_CACHE_HOME") or os.environ.get("LOCALAPPDATA")
+    if not base:
+        base = os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "kotlin-metrics", "ast")
+
+
+# Direktori cache pohon AST hasil parse kopyt; None menonaktifkan cache disk
+CACHE_DIR = default_cache_dir()
+# Batas ukuran cache disk; entri yang paling lama tidak dipakai dihapus lebih dulu
+MAX_CACHE_BYTES = 512 * 1024 * 1024
+# Setelah eviction ukuran cache turun ke fraksi ini dari batas
+EVICT_TARGET = 0.8
+# Naikkan jika bentuk data yang disimpan berubah; entri versi lama diabaikan
+CACHE_VERSION = 1
+try:
+    KOPYT_VERSION = metadata.version("kopyt")
+except metadata.PackageNotFoundError:
+    KOPYT_VERSION = "unknown"
+# Pohon terakhir yang dipakai per proses: semua metrik satu file berbagi satu parse
+MEMORY_ENTRIES = 16
+# Byte yang ditulis proses ini sejak pemeriksaan ukuran terakhir
+_written = 0
+
+
+def version_key():
+    """Nama subdirektori cache: format cache dan versi parser harus sama persis."""
+    return f"v{CACHE_VERSION}-kopyt-{KOPYT_VERSION}"
+
+
+def _entry_path(cache_dir, digest):
+    name = digest.hex()
+    return os.path.join(cache_dir, version_key(), name[:2], name + ".pickle")
+
+
+def _owned_privately(info):
+    """
+    True jika file/direktori milik pengguna ini dan tidak bisa ditulis orang
+    lain. Unpickle menjalankan kode, jadi entri yang bisa disisipkan pengguna
+    lain tidak boleh dibaca.
+    """
+    if not hasattr(os, "getuid"):
+        return True
+    return info.st_uid == os.getuid() and not info.st_mode & (stat.S_IWGRP | stat.S_IWOTH)
+
+
+@functools.lru_cache(maxsize=None)
+def _trusted_directory(cache_dir, directory):
+    """Semua direktori dari `directory` naik sampai akar cache harus privat dan bukan symlink."""
+    cache_dir = os.path.normpath(cache_dir)
+    path = os.path.normpath(directory)
+    while True:
+        try:
+            info = os.lstat(path)
+        except OSError:
+            return False
+        if not stat.S_ISDIR(info.st_mode) or not _owned_privately(info):
+            return False
+        if path == cache_dir or os.path.dirname(path) == path:
+            return True
+        path = os.path.dirname(path)
+
+
+def _make_private_directories(cache_dir, directory):
+    """Membuat direktori cache per tingkat dengan mode 0700 (makedirs hanya mengatur daun)."""
+    os.makedirs(cache_dir, mode=0o700, exist_ok=True)
+    path = cache_dir
+    for part in os.path.relpath(directory, cache_dir).split(os.sep):
+        path = os.path.join(path, part)
+        try:
+            os.mkdir(path, mode=0o700)
+        except FileExistsError:
+            pass
+
+
+def load(digest, cache_dir=CACHE_DIR):
+    """Pohon AST dari cache untuk digest isi file, atau None jika belum ada/rusak/tidak aman."""
+    if not cache_dir:
+        return None
+    path = _entry_path(cache_dir, digest)
+    try:
+        fd = os.open(path, os.O_RDONLY | getattr(os, "O_NOFOLLOW", 0))
+    except OSError:
+        return None
+    try:
+        with os.fdopen(fd, "rb") as f:
+            info = os.fstat(f.fileno())
+            if (
+                not stat.S_ISREG(info.st_mode)
+                or not _owned_privately(info)
+                or not _trusted_directory(cache_dir, os.path.dirname(path))
+            ):
+                return None
+            tree = pickle.load(f)
+        # mtime menandai pemakaian terakhir untuk eviction LRU
+        os.utime(path)
+        return tree
+    except Exception:
+        # Entri rusak (mis. proses terhenti saat menulis) diperlakukan sebagai miss
+        return None
+
+
+def store(digest, tree, cache_dir=CACHE_DIR):
+    """
+    Menyimpan pohon AST secara atomik (tulis ke file sementara lalu rename),
+    aman untuk beberapa proses worker sekaligus. Kegagalan tulis diabaikan.
+    """
+    global _written
+    if not cache_dir:
+        return
+    path = _entry_path(cache_dir, digest)
+    try:
+        # Hanya pemilik yang boleh membaca/menulis cache (lihat `load`)
+        _make_private_directories(cache_dir, os.path.dirname(path))
+        data = pickle.dumps(tree, protocol=pickle.HIGHEST_PROTOCOL)
+        fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(temp_path, path)
+    except (OSError, RecursionError, pickle.PicklingError):
+        # Pohon yang sangat dalam atau disk read-only: cukup tanpa cache
+        return
+    # Ukuran cache diperiksa sesekali, bukan pada setiap tulis
+    _written += len(data)
+    if _written >= MAX_CACHE_BYTES * (1 - EVICT_TARGET):
+        _written = 0
+        evict(cache_dir)
+
+
+@functools.lru_cache(maxsize=MEMORY_ENTRIES)
+def _parse(code, cache_dir):
+    digest = scan.content_digest(code.encode("utf-8", errors="surrogatepass"))
+    tree = load(digest, cache_dir)
+    if tree is None:
+        tree = Parser(code).parse()
+        store(digest, tree, cache_dir)
+    return tree
+
+
+def parse(code, cache_dir=None):
+    """
+    Pengganti `Parser(code).parse()` dengan cache berkunci hash isi file.
+
+    Urutan pencarian: pohon di memori proses, file cache di disk, lalu parse
+    kopyt. Pohon yang dikembalikan dipakai bersama, jadi visitor metrik
+    tidak boleh mengubahnya. Error parse tidak di-cache.
+    """
+    return _parse(code, CACHE_DIR if cache_dir is None else cache_dir)
+
+
+def prune(cache_dir=CACHE_DIR):
+    """Menghapus entri cache dari versi format/parser lain. Mengembalikan jumlah direktori."""
+    if not cache_dir or not os.path.isdir(cache_dir):
+        return 0
+    removed = 0
+    for name in os.listdir(cache_dir):
+        if name != version_key():
+            shutil.rmtree(os.path.join(cache_dir, name), ignore_errors=True)
+            removed += 1
+    return removed
+
+
+def evict(cache_dir=CACHE_DIR, max_bytes=None):
+    """
+    Menghapus entri yang paling lama tidak dipakai (mtime tertua) sampai
+    ukuran cache di bawah `EVICT_TARGET` dari batas. Mengembalikan jumlah entri.
+    """
+    max_bytes = MAX_CACHE_BYTES if max_bytes is None else max_bytes
+    root = os.path.join(cache_dir, version_key()) if cache_dir else None
+    if not root or not os.path.isdir(root):
+        return 0
+    entries = []
+    total = 0
+    for directory, _, names in os.walk(root):
+        for name in names:
+            path = os.path.join(directory, name)
+            try:
+                info = os.stat(path)
+            except OSError:
+                continue
+            entries.append((info.st_mtime, info.st_size, path))
+            total += info.st_size
+    if total <= max_bytes:
+        return 0
+    removed = 0
+    entries.sort()
+    for _, size, path in entries:
+        if total <= max_bytes * EVICT_TARGET:
+            break
+        try:
+            os.remove(path)
+        except OSError:
+            continue
+        total -= size
+        removed += 1
+    return removed
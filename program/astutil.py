@@ -0,0 +1,57 @@
+from kopyt import node
+
+_child_slots = {}  # Cache nama slot per tipe node
+
+
+def _slots(node_type):
+    """Semua nama slot (kecuali posisi) dari sebuah tipe node kopyt."""
+    slots = _child_slots.get(node_type)
+    if slots is None:
+        # Subkelas kopyt bisa mendeklarasikan ulang slot induknya; ambil sekali saja
+        slots = tuple(
+            dict.fromkeys(
+                slot
+                for cls in reversed(node_type.__mro__)
+                for slot in getattr(cls, "__slots__", ())
+                if slot != "position"
+            )
+        )
+        _child_slots[node_type] = slots
+    return slots
+
+
+def iter_child_nodes(item):
+    """Menghasilkan node anak langsung dari sebuah node kopyt, sesuai urutan sumber."""
+    for slot in _slots(type(item)):
+        value = getattr(item, slot, None)
+        if isinstance(value, node.Node):
+            yield value
+        elif isinstance(value, (list, tuple)):
+            for element in value:
+                if isinstance(element, node.Node):
+                    yield element
+
+
+def walk(item):
+    """Menelusuri semua node turunan (depth-first, iteratif)."""
+    stack = [item]
+    while stack:
+        current = stack.pop()
+        yield current
+        stack.extend(reversed(list(iter_child_nodes(current))))
+
+
+def referenced_names(item, shadowed=frozenset()):
+    """
+    Kumpulan identifier dan nama akses anggota (`this.x`, `a.x`) di dalam node.
+    Identifier polos dalam `shadowed` (mis. parameter) dilewati; aksesnya
+    lewat `this.x` tetap dihitung.
+    """
+    names = set()
+    for current in walk(item):
+        if isinstance(current, node.SimpleIdentifier):
+            if current.value not in shadowed:
+                names.add(current.value)
+        elif isinstance(current, node.NavigationSuffix) and isinstance(current.suffix, str):
+            names.add(current.suffix)
+    return names
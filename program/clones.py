@@ -0,0 +1,231 @@
+import hashlib
+import re
+import zlib
+from collections import defaultdict
+
+import numpy as np
+
+from program import patterns
+
+# Token Kotlin sederhana: string, komentar, identifier, angka, dan simbol
+TOKEN = re.compile(
+    r'"""[\s\S]*?"""|"(?:\\.|[^"\\\n])*"|\'(?:\\.|[^\'\\\n])*\''
+    r"|//[^\n]*|/\*[\s\S]*?\*/|[A-Za-z_]\w*|\d[\w.]*|\S"
+)
+KEYWORDS = frozenset(
+    """
+    as break class continue do else false for fun if in interface is null object
+    package return super this throw true try typealias typeof val var when while
+    by catch constructor finally get import init set where override private
+    protected public internal open abstract final lateinit suspend inline data
+    sealed companion
+    """.split()
+)
+
+SHINGLE_SIZE = 5  # Panjang jendela token untuk rolling hash
+PRIME = (1 << 31) - 1  # Modulus untuk rolling hash dan permutasi MinHash
+BASE = 1_000_003
+NUM_PERM = 32
+BANDS = 8  # 8 band x 4 baris per band
+ROWS = NUM_PERM // BANDS
+
+_rng = np.random.default_rng(20240501)  # Benih tetap agar hasil deterministik
+_PERM_A = _rng.integers(1, PRIME, size=NUM_PERM, dtype=np.int64)
+_PERM_B = _rng.integers(0, PRIME, size=NUM_PERM, dtype=np.int64)
+
+
+def extract_function_content(content, function_name):
+    # Mencari fungsi dengan nama tertentu
+    start_idx = content.find(f"fun {function_name}(")
+    if start_idx == -1:
+        return ""
+
+    # Melewati daftar parameter (bisa berisi kurung bersarang pada nilai default)
+    paren_idx = content.find("(", start_idx)
+    depth = 0
+    for paren_idx in range(paren_idx, len(content)):
+        if content[paren_idx] == "(":
+            depth += 1
+        elif content[paren_idx] == ")":
+            depth -= 1
+            if depth == 0:
+                break
+
+    # Menemukan posisi kurung kurawal pertama
+    brace_idx = content.find("{", paren_idx)
+    if brace_idx == -1:
+        return ""
+
+    # Fungsi berbadan ekspresi (`= ...`) atau tanpa badan tidak punya blok;
+    # kurung kurawal berikutnya milik deklarasi lain
+    if patterns.EXPRESSION_BODY.search(content, paren_idx + 1, brace_idx):
+        return ""
+    start_idx = brace_idx
+
+    # Stack untuk melacak kurung kurawal bersarang
+    stack = []
+    function_body = []
+
+    # Memulai pemrosesan dari posisi kurung pertama
+    for idx, char in enumerate(content[start_idx:], start=start_idx):
+        if char == "{":
+            stack.append("{")
+        elif char == "}":
+            stack.pop()
+
+        # Menambahkan karakter ke body fungsi jika stack tidak kosong
+        function_body.append(char)
+
+        # Ketika stack kosong, kita sudah sampai akhir fungsi
+        if not stack:
+            break
+
+    return "".join(function_body).strip()
+
+
+def function_bodies(content):
+    """
+    (nama fungsi, isi fungsi) untuk setiap nama fungsi unik di file, masukan
+    find_clone_groups. Dipakai bersama oleh laporan penuh dan mode sampel.
+    """
+    return [
+        (function, extract_function_content(content, function))
+        for function in dict.fromkeys(patterns.FUNCTION_NAME.findall(content))
+    ]
+
+
+def normalize_tokens(body):
+    """
+    Mengubah isi fungsi menjadi aliran token ternormalisasi.
+
+    Komentar dibuang, identifier non-keyword menjadi `ID`, dan literal menjadi
+    `LIT`, sehingga fungsi yang hanya berbeda nama variabel tetap terdeteksi.
+    """
+    tokens = []
+    for token in TOKEN.findall(body):
+        first = token[0]
+        if token.startswith(("//", "/*")):
+            continue
+        if first in "\"'" or first.isdigit():
+            tokens.append("LIT")
+        elif first.isalpha() or first == "_":
+            tokens.append(token if token in KEYWORDS else "ID")
+        else:
+            tokens.append(token)
+    return tokens
+
+
+def shingle_hashes(tokens, k=SHINGLE_SIZE):
+    """Rolling hash polinomial untuk setiap jendela k token."""
+    if len(tokens) < k:
+        return np.empty(0, dtype=np.int64)
+
+    codes = [zlib.crc32(token.encode()) % PRIME for token in tokens]
+    top = pow(BASE, k - 1, PRIME)
+    value = 0
+    for code in codes[:k]:
+        value = (value * BASE + code) % PRIME
+    hashes = [value]
+    for old, new in zip(codes, codes[k:]):
+        # Geser jendela: buang token lama, tambahkan token baru
+        value = ((value - old * top) * BASE + new) % PRIME
+        hashes.append(value)
+    return np.unique(np.asarray(hashes, dtype=np.int64))
+
+
+def minhash_signature(hashes):
+    """Tanda tangan MinHash (NUM_PERM nilai) dari himpunan hash shingle."""
+    if hashes.size == 0:
+        return np.full(NUM_PERM, PRIME, dtype=np.int64)
+    permuted = (_PERM_A[:, None] * hashes[None, :] + _PERM_B[:, None]) % PRIME
+    return permuted.min(axis=1)
+
+
+def _find(parent, item):
+    while parent[item] != item:
+        parent[item] = parent[parent[item]]
+        item = parent[item]
+    return item
+
+
+class CloneIndex:
+    """
+    Indeks klon inkremental: fungsi ditambahkan satu per satu dan kelompok
+    klon dijaga dengan union-find.
+
+    Klon identik digabung lewat hash token ternormalisasi; hanya satu wakil
+    per aliran token yang masuk bucket LSH. Fungsi baru diverifikasi terhadap
+    semua anggota bucket yang belum sekelompok dengannya, jadi pasangan klon
+    di antara anggota selain yang pertama tidak terlewat.
+    """
+
+    def __init__(self, threshold=0.8, min_tokens=30):
+        self.threshold = threshold
+        self.min_tokens = min_tokens
+        self.keys = []
+        self.duplicated = 0  # Jumlah fungsi di kelompok berukuran minimal dua
+        self._parent = []
+        self._size = []
+        self._exact = {}  # Digest token -> indeks wakil
+        self._signatures = {}  # Indeks wakil -> tanda tangan MinHash
+        self._buckets = [defaultdict(list) for _ in range(BANDS)]
+
+    def _union(self, a, b):
+        root_a, root_b = _find(self._parent, a), _find(self._parent, b)
+        if root_a == root_b:
+            return
+        size_a, size_b = self._size[root_a], self._size[root_b]
+        self.duplicated += size_a + size_b - (size_a if size_a > 1 else 0) - (size_b if size_b > 1 else 0)
+        self._parent[root_b] = root_a
+        self._size[root_a] = size_a + size_b
+
+    def add(self, key, body):
+        tokens = normalize_tokens(body)
+        if len(tokens) < self.min_tokens:
+            return  # Fungsi terlalu kecil (getter, delegasi) bukan klon bermakna
+        index = len(self.keys)
+        self.keys.append(key)
+        self._parent.append(index)
+        self._size.append(1)
+
+        # Digest stabil antar proses; token tidak pernah berisi baris baru
+        token_key = hashlib.blake2b("\n".join(tokens).encode(), digest_size=16).digest()
+        twin = self._exact.get(token_key)
+        if twin is not None:
+            self._union(twin, index)
+            return
+        self._exact[token_key] = index
+
+        signature = minhash_signature(shingle_hashes(tokens))
+        self._signatures[index] = signature
+        for band, buckets in enumerate(self._buckets):
+            members = buckets[signature[band * ROWS:(band + 1) * ROWS].tobytes()]
+            for other in members:
+                if _find(self._parent, other) == _find(self._parent, index):
+                    continue
+                # Verifikasi kandidat dengan perkiraan kemiripan Jaccard
+                if np.mean(self._signatures[other] == signature) >= self.threshold:
+                    self._union(other, index)
+            members.append(index)
+
+    def groups(self):
+        """Kelompok klon (list kunci, urut penambahan) berukuran minimal dua."""
+        groups = defaultdict(list)
+        for index, key in enumerate(self.keys):
+            groups[_find(self._parent, index)].append(key)
+        return [group for group in groups.values() if len(group) > 1]
+
+
+def find_clone_groups(bodies, threshold=0.8, min_tokens=30):
+    """
+    Mencari kelompok fungsi duplikat dari iterable (kunci, isi fungsi).
+
+    Klon identik dikelompokkan lewat hash token ternormalisasi; klon mirip
+    ditemukan lewat LSH banding atas tanda tangan MinHash, sehingga tidak ada
+    perbandingan berpasangan atas seluruh fungsi. Mengembalikan list kelompok
+    (list kunci) berukuran minimal dua.
+    """
+    index = CloneIndex(threshold, min_tokens)
+    for key, body in bodies:
+        index.add(key, body)
+    return index.groups()
@@ -0,0 +1,147 @@
+from kopyt import node
+
+from program.astutil import iter_child_nodes
+
+LOOPS = (node.ForStatement, node.WhileStatement, node.DoWhileStatement)
+FUNCTION_LITERALS = (node.LambdaLiteral, node.AnonymousFunction, node.FunctionDeclaration)
+LOGICAL_OPERATORS = (node.Conjunction, node.Disjunction)
+
+
+def _else_if(else_body):
+    """Mengembalikan IfExpression jika cabang else berupa `else if` langsung."""
+    if isinstance(else_body, node.Statement) and isinstance(else_body.statement, node.IfExpression):
+        return else_body.statement
+    if isinstance(else_body, node.IfExpression):
+        return else_body
+    return None
+
+
+class _ComplexityVisitor:
+    """
+    Menghitung cognitive complexity (aturan SonarSource), max nesting, dan
+    jumlah variabel lokal (NOLV) dalam satu penelusuran AST kopyt.
+    """
+
+    def __init__(self, function_name):
+        self.function_name = function_name
+        self.score = 0
+        self.max_nesting = 0
+        self.local_variables = 0
+
+    def visit(self, item, nesting=0, depth=0, operator=None):
+        if isinstance(item, node.IfExpression):
+            self._visit_if(item, nesting, depth)
+        elif isinstance(item, node.WhenExpression):
+            self._increment(nesting, depth + 1)
+            for child in iter_child_nodes(item):
+                if isinstance(child, node.WhenSubject):
+                    self.visit(child, nesting, depth)
+                else:
+                    self.visit(child, nesting + 1, depth + 1)
+        elif isinstance(item, LOOPS):
+            self._increment(nesting, depth + 1)
+            for child in iter_child_nodes(item):
+                if child is item.body:
+                    self._visit_body(child, nesting + 1, depth + 1)
+                else:
+                    self.visit(child, nesting, depth)
+        elif isinstance(item, node.WhenEntry):
+            for child in iter_child_nodes(item):
+                if child is item.body:
+                    self._visit_body(child, nesting, depth)
+                else:
+                    self.visit(child, nesting, depth)
+        elif isinstance(item, node.TryExpression):
+            # `try` tidak menambah skor, tetapi dihitung sebagai tingkat nesting
+            self.max_nesting = max(self.max_nesting, depth + 1)
+            self.visit(item.try_block, nesting, depth + 1)
+            for catch_block in item.catch_blocks:
+                self._increment(nesting, depth + 1)
+                self.local_variables += 1  # Parameter `catch (e: ...)`
+                self.visit(catch_block.block, nesting + 1, depth + 1)
+            if item.finally_block is not None:
+                self.visit(item.finally_block, nesting, depth)
+        elif isinstance(item, FUNCTION_LITERALS):
+            # Lambda dan fungsi lokal menambah nesting tanpa menambah skor
+            for child in iter_child_nodes(item):
+                self.visit(child, nesting + 1, depth)
+        elif isinstance(item, LOGICAL_OPERATORS):
+            # Satu poin per urutan operator logika yang sama (a && b && c = +1)
+            if operator != item.operator:
+                self.score += 1
+            self.visit(item.left, nesting, depth, item.operator)
+            self.visit(item.right, nesting, depth, item.operator)
+        elif isinstance(item, node.ClassBody):
+            # Properti object/kelas lokal adalah anggota, bukan variabel lokal
+            for member in item.members:
+                if isinstance(member, node.PropertyDeclaration):
+                    for child in iter_child_nodes(member):
+                        if child is not member.declaration:
+                            self.visit(child, nesting, depth)
+                else:
+                    self.visit(member, nesting, depth)
+        else:
+            if isinstance(item, node.VariableDeclaration) and item.name != "_":
+                # val/var, destrukturisasi, variabel for, dan parameter lambda
+                self.local_variables += 1
+            elif isinstance(item, (node.BreakExpression, node.ContinueExpression)) and item.label:
+                self.score += 1  # Lompatan ke label
+            elif self._is_recursive_call(item):
+                self.score += 1
+            for child in iter_child_nodes(item):
+                self.visit(child, nesting, depth)
+
+    def _visit_body(self, body, nesting, depth):
+        """
+        Badan struktur kontrol. kopyt mem-parse blok `{ ... }` yang berisi `->`
+        (mis. `when`) sebagai LambdaLiteral tanpa parameter; itu tetap blok
+        biasa, bukan lambda, jadi tidak menambah nesting lagi.
+        """
+        if isinstance(body, node.LambdaLiteral) and not body.parameters:
+            for child in iter_child_nodes(body):
+                self.visit(child, nesting, depth)
+        else:
+            self.visit(body, nesting, depth)
+
+    def _increment(self, nesting, depth):
+        self.score += 1 + nesting
+        self.max_nesting = max(self.max_nesting, depth)
+
+    def _visit_if(self, item, nesting, depth):
+        self._increment(nesting, depth + 1)
+        while True:
+            self.visit(item.condition, nesting, depth)
+            if item.if_body is not None:
+                self._visit_body(item.if_body, nesting + 1, depth + 1)
+
+            else_if = _else_if(item.else_body)
+            if else_if is not None:
+                # `else if` +1 tanpa bobot nesting, dan tidak menambah kedalaman
+                self.score += 1
+                item = else_if
+                continue
+            if item.else_body is not None:
+                self.score += 1
+                self._visit_body(item.else_body, nesting + 1, depth + 1)
+            return
+
+    def _is_recursive_call(self, item):
+        return (
+            isinstance(item, node.PostfixUnaryExpression)
+            and isinstance(item.expression, node.SimpleIdentifier)
+            and item.expression.value == self.function_name
+            and bool(item.suffixes)
+            and isinstance(item.suffixes[0], node.CallSuffix)
+        )
+
+
+def function_complexity(function_declaration):
+    """Cognitive complexity, max nesting struktural, dan NOLV dari sebuah FunctionDeclaration."""
+    visitor = _ComplexityVisitor(function_declaration.name)
+    if function_declaration.body is not None:
+        visitor.visit(function_declaration.body)
+    return {
+        "Cognitive Complexity": visitor.score,
+        "Max Nesting": visitor.max_nesting,
+        "NOLV": visitor.local_variables,
+    }
@@ -0,0 +1,107 @@
+from kopyt import node
+
+from program.astutil import referenced_names
+
+
+def class_fields(class_declaration):
+    """Nama properti kelas, termasuk parameter konstruktor `val`/`var`."""
+    fields = []
+    constructor = getattr(class_declaration, "constructor", None)
+    if constructor is not None:
+        for parameter in constructor.parameters:
+            if parameter.mutability is not None:
+                fields.append(parameter.name)
+
+    body = class_declaration.body
+    for member in body.members if body is not None else []:
+        if isinstance(member, node.PropertyDeclaration):
+            declaration = member.declaration
+            if isinstance(declaration, node.MultiVariableDeclaration):
+                fields.extend(variable.name for variable in declaration)
+            else:
+                fields.append(declaration.name)
+    return list(dict.fromkeys(fields))
+
+
+def method_field_bitsets(class_declaration, methods):
+    """
+    Bitset properti yang dirujuk oleh setiap metode (bit ke-i = properti ke-i),
+    serta himpunan metode lain yang dipanggilnya.
+    """
+    fields = class_fields(class_declaration)
+    bit_of = {name: 1 << index for index, name in enumerate(fields)}
+    method_names = {method.name for method in methods}
+
+    bitsets = []
+    calls = []
+    for method in methods:
+        # Parameter bernama sama dengan properti menutupi properti itu
+        parameters = {parameter.parameter.name for parameter in method.parameters or ()}
+        names = referenced_names(method.body, parameters) if method.body is not None else set()
+        bits = 0
+        for name in names & bit_of.keys():
+            bits |= bit_of[name]
+        bitsets.append(bits)
+        calls.append((names & method_names) - {method.name})
+    return bitsets, calls
+
+
+def lcom4(method_names, bitsets, calls):
+    """LCOM4: jumlah komponen terhubung metode (berbagi properti atau saling memanggil)."""
+    parent = list(range(len(method_names)))
+
+    def find(item):
+        while parent[item] != item:
+            parent[item] = parent[parent[item]]
+            item = parent[item]
+        return item
+
+    def union(a, b):
+        parent[find(b)] = find(a)
+
+    # Metode yang memakai bit properti yang sama digabung lewat pemilik pertama bit itu
+    owner_of_bit = {}
+    for index, bits in enumerate(bitsets):
+        while bits:
+            lowest = bits & -bits
+            bits ^= lowest
+            if lowest in owner_of_bit:
+                union(owner_of_bit[lowest], index)
+            else:
+                owner_of_bit[lowest] = index
+
+    index_of = {}
+    for index, name in enumerate(method_names):
+        index_of.setdefault(name, []).append(index)
+    for index, called in enumerate(calls):
+        for name in called:
+            for other in index_of[name]:
+                union(index, other)
+
+    return len({find(index) for index in range(len(method_names))})
+
+
+def tcc(bitsets):
+    """TCC: proporsi pasangan metode yang berbagi minimal satu properti."""
+    count = len(bitsets)
+    pairs = count * (count - 1) // 2
+    if pairs == 0:
+        return 0
+    connected = sum(
+        1
+        for first in range(count)
+        if bitsets[first]
+        for second in range(first + 1, count)
+        if bitsets[first] & bitsets[second]
+    )
+    return connected / pairs
+
+
+def class_cohesion(class_declaration):
+    """Menghitung LCOM4 dan TCC dari deklarasi kelas yang sudah di-parse."""
+    body = class_declaration.body
+    members = body.members if body is not None else []
+    methods = [member for member in members if isinstance(member, node.FunctionDeclaration)]
+    bitsets, calls = method_field_bitsets(class_declaration, methods)
+    method_names = [method.name for method in methods]
+    return {"LCOM4": lcom4(method_names, bitsets, calls), "TCC": tcc(bitsets)}
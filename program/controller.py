@@ -1,8 +1,22 @@
 import os
-import tempfile
-import patoolib
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import numpy as np
 import pandas as pd
-from kopyt import Parser, node  # Gunakan `kopyt` sebagai parser AST Kotlin
+from kopyt import node  # Gunakan `kopyt` sebagai parser AST Kotlin (parse lewat astcache)
+from kopyt.lexer import Lexer
+from program import archive
+from program import astcache
+from program import cognitive
+from program import cohesion
+from program import ignore
+from program import languages
+from program import rules
+from program import scan
+from program import script
+from program import signatures
+from program import spans
+from program import spill
+from program import transport
 
 def manual_max_nesting(body_str):
     """ Menghitung max nesting secara manual dari string kode """
@@ -40,19 +54,24 @@ def count_cc_manual(method_code):
                 cc += 1  # Setiap struktur kontrol menambah CC
     return cc
 
+def read_code(file_path, code=None):
+    """Membaca kode dari file, kecuali isinya sudah tersedia di memori."""
+    if code is not None:
+        return code
+    return scan.read_source(file_path)
+
 def count_woc(cc_values):
     """Menghitung Weighted Operations Count (WOC)."""
-    total_CC = sum(cc_values)
-    return [cc / total_CC if total_CC else 0 for cc in cc_values]
+    cc_array = np.asarray(cc_values, dtype=float)
+    total_CC = cc_array.sum()
+    return (cc_array / total_CC).tolist() if total_CC else [0] * len(cc_array)
 
-def count_num_final_not_static_attributes(file_path):
+def count_num_final_not_static_attributes(file_path, code=None):
     """Count the number of final non-static attributes in a Kotlin project."""
     try:
-        with open(file_path, "r", encoding="utf-8") as f:
-            code = f.read()
+        code = read_code(file_path, code)
         
-        parser = Parser(code)
-        result = parser.parse()
+        result = astcache.parse(code)
 
         if not result.declarations:
             return 0
@@ -95,14 +114,12 @@ def count_num_final_not_static_attributes(file_path):
         print(f"Error processing file {file_path}: {e}")
         return 0
 
-def count_num_static_not_final_attributes(file_path):
+def count_num_static_not_final_attributes(file_path, code=None):
     """Count the number of static but not final attributes in a Kotlin project."""
     try:
-        with open(file_path, "r", encoding="utf-8") as f:
-            code = f.read()
+        code = read_code(file_path, code)
         
-        parser = Parser(code)
-        result = parser.parse()
+        result = astcache.parse(code)
 
         if not result.declarations:
             return 0
@@ -145,202 +162,47 @@ def count_num_static_not_final_attributes(file_path):
         print(f"Error processing file {file_path}: {e}")
         return 0
 
-def number_public_visibility_methods(file_path):
-    """Count the number of public visibility methods in a Kotlin project."""
+def count_rule(file_path, code, rule_name):
+    """Nilai tingkat file satu aturan metrik (program.rules) untuk satu file Kotlin."""
     try:
-        with open(file_path, "r", encoding="utf-8") as f:
-            code = f.read()
-        
-        parser = Parser(code)
-        result = parser.parse()
-
-        if not result.declarations:
-            return 0
-        
-        public_method_count = 0
-
-        for declaration in result.declarations:
-            if isinstance(declaration, node.ClassDeclaration):
-                print(f"Class: {declaration.name}")
-                for member in declaration.body.members:
-                    if isinstance(member, node.FunctionDeclaration):
-                        # Check if the method is public (no visibility modifier or explicitly marked as 'public')
-                        modifiers = getattr(member, "modifiers", [])
-                        is_public = "private" not in modifiers and "protected" not in modifiers and "internal" not in modifiers
-                        
-                        if is_public:
-                            print(f"Public method: {member.name}")
-                            public_method_count += 1
+        code = read_code(file_path, code)
         
-        return public_method_count
+        result = astcache.parse(code)
+        return rules.evaluate(result, rules.active())["file"].get(rule_name, 0)
     
     except Exception as e:
         print(f"Error processing file {file_path}: {e}")
         return 0
 
 
-def number_private_visibility_methods(file_path):
-    """Count the number of private visibility methods in a Kotlin project."""
-    try:
-        with open(file_path, "r", encoding="utf-8") as f:
-            code = f.read()
-        
-        parser = Parser(code)
-        result = parser.parse()
+def number_public_visibility_methods(file_path, code=None):
+    """Count the number of public visibility methods in a Kotlin project."""
+    return count_rule(file_path, code, "number_public_visibility_methods")
 
-        if not result.declarations:
-            return 0
-        
-        private_method_count = 0
 
-        for declaration in result.declarations:
-            if isinstance(declaration, node.ClassDeclaration):
-                print(f"Class: {declaration.name}")
-                for member in declaration.body.members:
-                    if isinstance(member, node.FunctionDeclaration):
-                        # Check if the method is private
-                        modifiers = getattr(member, "modifiers", [])
-                        is_private = "private" in modifiers
-                        
-                        if is_private:
-                            print(f"Private method: {member.name}")
-                            private_method_count += 1
-        
-        return private_method_count
-    
-    except Exception as e:
-        print(f"Error processing file {file_path}: {e}")
-        return 0
+def number_private_visibility_methods(file_path, code=None):
+    """Count the number of private visibility methods in a Kotlin project."""
+    return count_rule(file_path, code, "number_private_visibility_methods")
 
-def number_protected_visibility_methods(file_path):
+def number_protected_visibility_methods(file_path, code=None):
     """Count the number of protected visibility methods in a Kotlin project."""
-    try:
-        with open(file_path, "r", encoding="utf-8") as f:
-            code = f.read()
-        
-        parser = Parser(code)
-        result = parser.parse()
-
-        if not result.declarations:
-            return 0
-        
-        protected_method_count = 0
-
-        for declaration in result.declarations:
-            if isinstance(declaration, node.ClassDeclaration):
-                print(f"Class: {declaration.name}")
-                for member in declaration.body.members:
-                    if isinstance(member, node.FunctionDeclaration):
-                        # Check if the method is protected
-                        modifiers = getattr(member, "modifiers", [])
-                        is_protected = "protected" in modifiers
-                        
-                        if is_protected:
-                            print(f"Protected method: {member.name}")
-                            protected_method_count += 1
-        
-        return protected_method_count
-    
-    except Exception as e:
-        print(f"Error processing file {file_path}: {e}")
-        return 0
+    return count_rule(file_path, code, "number_protected_visibility_methods")
 
 
-def number_package_visibility_methods(file_path):
+def number_package_visibility_methods(file_path, code=None):
     """Count the number of package visibility methods in a Kotlin project."""
-    try:
-        with open(file_path, "r", encoding="utf-8") as f:
-            code = f.read()
-        
-        parser = Parser(code)
-        result = parser.parse()
-
-        if not result.declarations:
-            return 0
-        
-        package_method_count = 0
-
-        for declaration in result.declarations:
-            if isinstance(declaration, node.ClassDeclaration):
-                print(f"Class: {declaration.name}")
-                for member in declaration.body.members:
-                    if isinstance(member, node.FunctionDeclaration):
-                        # Check if the method has package visibility (no explicit visibility modifier)
-                        modifiers = getattr(member, "modifiers", [])
-                        is_package_visibility = (
-                            "public" not in modifiers and
-                            "private" not in modifiers and
-                            "protected" not in modifiers and
-                            "internal" not in modifiers
-                        )
-
-                        if is_package_visibility:
-                            print(f"Package visibility method: {member.name}")
-                            package_method_count += 1
-
-        return package_method_count
-    
-    except Exception as e:
-        print(f"Error processing file {file_path}: {e}")
-        return 0
+    return count_rule(file_path, code, "number_package_visibility_methods")
 
-def number_standard_design_methods(file_path):
+def number_standard_design_methods(file_path, code=None):
     """Count the number of standard design pattern methods in a Kotlin project."""
-    try:
-        with open(file_path, "r", encoding="utf-8") as f:
-            code = f.read()
-        
-        parser = Parser(code)
-        result = parser.parse()
+    return count_rule(file_path, code, "number_standard_design_methods")
 
-        if not result.declarations:
-            return 0
-        
-        design_method_count = 0
-        design_pattern_indicators = {
-            # Factory pattern indicators
-            'create', 'make', 'newInstance', 'of', 'from',
-            # Builder pattern indicators
-            'build', 'builder', 'construct', 'assemble',
-            # Singleton pattern indicators
-            'getInstance', 'instance',
-            # Other common patterns
-            'clone', 'copy', 'parse', 'load', 'save'
-        }
-
-        for declaration in result.declarations:
-            if isinstance(declaration, node.ClassDeclaration):
-                print(f"Class: {declaration.name}")
-                for member in declaration.body.members:
-                    if isinstance(member, node.FunctionDeclaration):
-                        method_name = member.name.lower()
-                        
-                        # Check if method name matches any design pattern indicator
-                        if any(indicator in method_name for indicator in design_pattern_indicators):
-                            print(f"Design method: {member.name}")
-                            design_method_count += 1
-                        
-                        # Check for factory methods by return type
-                        if hasattr(member, 'return_type') and member.return_type:
-                            return_type = str(member.return_type)
-                            if 'factory' in return_type.lower() or 'companion' in str(member.parents).lower():
-                                print(f"Factory method: {member.name}")
-                                design_method_count += 1
-        
-        return design_method_count
-    
-    except Exception as e:
-        print(f"Error processing file {file_path}: {e}")
-        return 0
-
-def number_constructor_DefaultConstructor_methods(file_path):
+def number_constructor_DefaultConstructor_methods(file_path, code=None):
     """Count the number of default constructors in a Kotlin project using AST parsing."""
     try:
-        with open(file_path, "r", encoding="utf-8") as f:
-            code = f.read()
+        code = read_code(file_path, code)
         
-        parser = Parser(code)
-        result = parser.parse()
+        result = astcache.parse(code)
         
         default_constructors = 0
         
@@ -388,14 +250,24 @@ def number_constructor_DefaultConstructor_methods(file_path):
         print(f"Error processing file {file_path}: {e}")
         return 0
 
-def extracted_method(file_path):
+def method_metrics(member, body_source):
+    """
+    Metrik satu metode: LOC dan CC dari irisan teks badannya (spans),
+    cognitive complexity, max nesting, dan NOLV dari node AST. Dipakai
+    bersama oleh extracted_method dan gate.
+    """
+    return {
+        "LOC": body_source.count("\n") + 1 if body_source else 0,
+        "CC": count_cc_manual(body_source) if body_source else 0,
+        **cognitive.function_complexity(member),
+    }
+
+def extracted_method(file_path, code=None):
     """Ekstrak informasi metode dari file Kotlin."""
     try:
-        with open(file_path, "r", encoding="utf-8") as f:
-            code = f.read()
+        code = read_code(file_path, code)
         
-        parser = Parser(code)
-        result = parser.parse()
+        result = astcache.parse(code)
         package_name = result.package.name if result.package else "Unknown"
 
         if not result.declarations:
@@ -409,70 +281,191 @@ def extracted_method(file_path):
         
         datas = []
         method_function = {}
-        for member in class_declaration.body.members:
+        method_signature = {}  # Indeks signature per metode, dari parse yang sama
+        members = class_declaration.body.members
+        # Satu irisan teks asli per metode; semua metrik teks memakai irisan ini
+        member_sources = spans.member_sources(code, class_declaration.body, members)
+        for member, body_source in zip(members, member_sources):
             if isinstance(member, node.FunctionDeclaration):
-                function_names = member.name
-                loc_count = str(member.body).count("\n") + 1 if member.body else 0
-                maxnesting = manual_max_nesting(str(member.body)) if member.body else 0
-                cc_value = count_cc_manual(str(member.body)) if member.body else 0
+                method_function[member.name] = method_metrics(member, body_source)
+                method_signature[member.name] = signatures.function_signature(member)
 
-                
-                method_function[function_names] = (cc_value, loc_count, maxnesting)
-
-        cc_values = [cc for cc, _, _ in method_function.values()]
+        cc_values = [metrics["CC"] for metrics in method_function.values()]
         woc_values = count_woc(cc_values)
-        count_num_final_not_static_attributes_values = count_num_final_not_static_attributes(file_path)
-        num_static_not_final_attributes_values = count_num_static_not_final_attributes(file_path)
-        number_public_visibility_methods_values = number_public_visibility_methods(file_path)
-        number_private_visibility_methods_values = number_private_visibility_methods(file_path)
-        number_protected_visibility_methods_values = number_protected_visibility_methods(file_path)
-        number_package_visibility_methods_values = number_package_visibility_methods(file_path)
-        number_standard_design_methods_values = number_standard_design_methods(file_path)
-        number_constructor_DefaultConstructor_values = number_constructor_DefaultConstructor_methods(file_path)
-
-        for (function_names, (cc_value, loc_count, maxnesting)), woc in zip(method_function.items(), woc_values):
+        count_num_final_not_static_attributes_values = count_num_final_not_static_attributes(file_path, code)
+        num_static_not_final_attributes_values = count_num_static_not_final_attributes(file_path, code)
+        # Semua metrik berbasis aturan (bawaan + aturan tim) dalam satu penelusuran
+        metric_rules = rules.active()
+        rule_evaluation = rules.evaluate(result, metric_rules)
+        number_constructor_DefaultConstructor_values = number_constructor_DefaultConstructor_methods(file_path, code)
+        cohesion_values = cohesion.class_cohesion(class_declaration)
+
+        for (function_names, metrics), woc in zip(method_function.items(), woc_values):
                 
                     datas.append({
                         "Package": package_name,
                         "Class": class_name,
                         "Method": function_names,
-                        "LOC": loc_count,
-                        "Max Nesting": maxnesting,
-                        "CC": cc_value,
+                        "LOC": metrics["LOC"],
+                        "Max Nesting": metrics["Max Nesting"],
+                        "CC": metrics["CC"],
+                        "Cognitive Complexity": metrics["Cognitive Complexity"],
+                        "NOLV": metrics["NOLV"],
                         "WOC": woc,
                         "count_num_final_not_static_attributes" : count_num_final_not_static_attributes_values,
                         "num_static_not_final_attributes" : num_static_not_final_attributes_values,
-                        "number_public_visibility_methods" : number_public_visibility_methods_values,
-                        "number_private_visibility_methods" : number_private_visibility_methods_values,
-                        "number_protected_visibility_methods" : number_protected_visibility_methods_values,
-                        "number_package_visibility_methods" : number_package_visibility_methods_values,
-                        "number_standard_design_methods" : number_standard_design_methods_values,
-                        "number_constructor_DefaultConstructor_methods" : number_constructor_DefaultConstructor_values
+                        **metric_rules.values(rule_evaluation, class_name, function_names),
+                        "number_constructor_DefaultConstructor_methods" : number_constructor_DefaultConstructor_values,
+                        "LCOM4" : cohesion_values["LCOM4"],
+                        "TCC" : cohesion_values["TCC"],
+                        **method_signature[function_names],
                         })
         
         return datas if datas else [{"Package": package_name, "Class": class_name, "Method": "None", "LOC": 0, "Max Nesting": 0, "CC": 0, "WOC": 0,"Error": "No functions found"}]
     
     except Exception as e:
-        return [{"Package": "Error", "Class": "Error", "Method": "Error", "LOC": "Error", "Max Nesting": 0, "CC": 0, "WOC": 0, "Error": str(e)}]
+        return [{"Package": "Error", "Class": "Error", "Method": "Error", "LOC": None, "Max Nesting": 0, "CC": 0, "WOC": 0, "Error": str(e)}]
+
+def tokenize_kotlin(code):
+    return list(Lexer(code, yield_comments=False))
+
+def parse_kotlin(code):
+    return astcache.parse(code)
+
+def analyze_kotlin(file_path, code):
+    """Skrip .kts tanpa kelas (mis. build Gradle) memakai pemindai ringan, bukan parser AST."""
+    if script.is_plain_script(file_path, code):
+        return script.analyze_script(file_path, code)
+    return extracted_method(file_path, code)
+
+KOTLIN = languages.LanguagePlugin("Kotlin", archive.KOTLIN_EXTENSIONS, tokenize_kotlin, parse_kotlin, analyze_kotlin)
+PLUGINS = (KOTLIN, languages.JAVA)
+# Di bawah jumlah file ini, biaya menyalakan proses worker lebih besar dari hasilnya
+PARALLEL_MIN_FILES = 16
+CHUNKS_PER_WORKER = 4
+
+def new_pool(workers):
+    """Pool proses worker dengan aturan metrik tim ikut diaktifkan, apa pun metode start prosesnya."""
+    return ProcessPoolExecutor(max_workers=workers, initializer=rules.activate, initargs=(rules.extra_rules(),))
+
+def analyze_member(member):
+    """Analisis satu anggota arsip (nama, bytes) dengan plugin bahasanya."""
+    member_name, content = member
+    plugin = languages.plugin_for(PLUGINS, member_name)
+    return plugin.analyze_source(member_name, scan.decode_source(content))
+
+def analyze_chunk(start, members):
+    """
+    Dijalankan di worker: analisis sekelompok anggota, lalu kirim barisnya
+    ke parent sebagai batch Arrow di shared memory (lihat transport.publish).
+    """
+    rows = []
+    for index, member in enumerate(members, start=start):
+        rows.extend({"Member Index": index, **row} for row in analyze_member(member))
+    return transport.publish(rows)
+
+def analyze_members(members, progress=None, workers=None, executor=None, memory_budget=None):
+    """
+    Analisis daftar (nama, bytes) menjadi satu DataFrame, dengan kolom
+    "Member Index" yang menunjuk posisi anggota di `members`. Daftar besar
+    dibagi per potongan ke beberapa proses worker. Dengan `executor` (pool
+    yang sudah hangat, mis. milik service), semua potongan dikirim ke pool
+    tersebut tanpa membuat pool baru.
+
+    Baris dibatasi `memory_budget`: jalur berurutan menampungnya di
+    spill.SpillList, jalur paralel menampung tabel per potongan di
+    spill.SpillParts. Melewati anggaran, data ditumpahkan ke disk dan
+    digabung di akhir.
+    """
+    total = len(members)
+    if progress:
+        progress(0, total)
+
+    workers = workers or os.cpu_count() or 1
+    if executor is None and (total < PARALLEL_MIN_FILES or workers < 2):
+        with spill.SpillList(memory_budget) as rows:
+            for done, member in enumerate(members, start=1):
+                rows.extend({"Member Index": done - 1, **row} for row in analyze_member(member))
+                if progress:
+                    progress(done, total)
+            return rows.to_frame()
+    if total == 0:
+        return pd.DataFrame()
+
+    workers = min(workers, total)
+    # Beberapa potongan per worker agar beban seimbang dan progres tetap halus
+    chunk_size = max(1, -(-total // (workers * CHUNKS_PER_WORKER)))
+    owned = executor is None
+    if owned:
+        executor = new_pool(workers)
+    futures = {}
+    parts = spill.SpillParts(memory_budget)
+    try:
+        for start in range(0, total, chunk_size):
+            futures[executor.submit(analyze_chunk, start, members[start:start + chunk_size])] = start
+        done = 0
+        for future in as_completed(futures):
+            start = futures.pop(future)
+            # Segmen dibaca begitu potongannya selesai, jadi shared memory
+            # tidak menumpuk; tabelnya tunduk pada anggaran memori
+            parts.put(start // chunk_size, transport.receive(future.result()))
+            done += min(chunk_size, total - start)
+            if progress:
+                progress(done, total)
+        return transport.combine(parts.parts())
+    except BaseException:
+        # Segmen shared memory dimiliki parent: batalkan potongan yang belum
+        # jalan dan lepaskan hasil potongan yang masih berjalan
+        for future in futures:
+            if not future.cancel():
+                future.add_done_callback(transport.release_future)
+        raise
+    finally:
+        parts.close()
+        if owned:
+            executor.shutdown()
+
+def parse_archive(data, name, progress=None, workers=None, excludes=None, executor=None, memory_budget=None):
+    """
+    Analisis semua file sumber (Kotlin dan Java) di dalam arsip dalam satu
+    ekstraksi, melaporkan progres per file. Urutan baris tetap mengikuti
+    urutan file di arsip.
+
+    Direktori build/generate (`excludes`, bawaan ignore.DEFAULT_EXCLUDES) dan
+    pola .gitignore di dalam arsip dilewati. Salinan file yang identik
+    dianalisis sekali lalu barisnya dipakai untuk setiap salinan.
+
+    `memory_budget` hanya membatasi baris hasil (lihat analyze_members). Isi
+    file sumber tetap di memori: semua anggota selama pemfilteran .gitignore
+    (yang harus membaca seluruh arsip dulu), lalu hanya salinan unik selama
+    analisis. Puncak memori kira-kira `data` + total file sumber terekstrak
+    + `memory_budget`.
+    """
+    ignore_rules = ignore.IgnoreRules(ignore.DEFAULT_EXCLUDES if excludes is None else excludes)
+    members = archive.iter_source_members(data, name, languages.source_extensions(PLUGINS), ignore_rules)
+
+    # Nama file ikut menjadi kunci: plugin dan nama skrip .kts bergantung padanya.
+    # Hanya salinan unik yang disimpan; bytes salinan lain dilepas sebelum analisis
+    keys = []
+    unique = {}
+    for member_name, content in ignore.filter_members(list(members), ignore_rules):
+        key = (scan.content_digest(content), os.path.basename(member_name))
+        keys.append(key)
+        unique.setdefault(key, (member_name, content))
+    df = analyze_members(list(unique.values()), progress, workers, executor, memory_budget)
+    if df.empty:
+        return df.drop(columns="Member Index", errors="ignore")
+
+    index_of = {key: index for index, key in enumerate(unique)}
+    order = pd.DataFrame({"Member Index": [index_of[key] for key in keys]})
+    return order.merge(df, on="Member Index", how="inner", sort=False).drop(columns="Member Index")
 
 def extract_and_parse(file):
-    """Ekstrak arsip ZIP/RAR dan proses file Kotlin."""
-    with tempfile.TemporaryDirectory() as temp_dir:
-        temp_file_path = os.path.join(temp_dir, file.name)
-        with open(temp_file_path, "wb") as f:
-            f.write(file.getbuffer())
-        
-        try:
-            patoolib.extract_archive(temp_file_path, outdir=temp_dir)
-            kotlin_files = [os.path.join(root, f) for root, _, files in os.walk(temp_dir) for f in files if f.endswith(".kt") or f.endswith(".kts")]
-            
-            results = []
-            for kotlin_file in kotlin_files:
-                results.extend(extracted_method(kotlin_file))
-            
-            return pd.DataFrame(results)
-        except Exception as e:
-            return str(e)
+    """Baca file Kotlin/Java langsung dari arsip ZIP/RAR/7z/tar dan proses di memori."""
+    try:
+        return parse_archive(file.getbuffer(), file.name)
+    except Exception as e:
+        return str(e)
 
 # def test_default_constructor_detection(file_path):
 #     """Test the default constructor detection on a specific file."""
@@ -0,0 +1,259 @@
+import re
+
+import numpy as np
+import pandas as pd
+
+IMPORT = re.compile(r"^\s*import\s+([\w.]+?)(\.\*)?(?:\s+as\s+\w+)?\s*$", re.M)
+# Satu lintasan token: string dan komentar dibuang, deklarasi membuka header
+# kelas, kurung menentukan badan kelas pemilik setiap referensi tipe
+DEPENDENCY_TOKEN = re.compile(
+    r'(?P<skip>"""[\s\S]*?"""|"(?:\\.|[^"\\\n])*"|\'(?:\\.|[^\'\\\n])*\'|//[^\n]*|/\*[\s\S]*?\*/)'
+    r"|\b(?:class|interface|object)\s+(?P<declaration>[A-Za-z_]\w*)"
+    r"|(?P<member>\b(?:fun|val|var|typealias|init)\b|;)"
+    r"|(?P<reference>\b[A-Z]\w*\b)"
+    r"|(?P<brace>[{}()])"
+)
+
+
+def class_references(content):
+    """
+    Referensi tipe per kelas yang dideklarasikan di file.
+
+    Referensi di header (`class Circle : Shape()`) dan di badan kelas
+    dicatat untuk kelas itu; kelas bersarang mencatat referensinya sendiri.
+    Referensi di luar kelas mana pun (fungsi tingkat atas) serta isi string
+    dan komentar diabaikan.
+    """
+    references = {}
+    stack = []  # (nama kelas, kedalaman `{` badannya)
+    header = None  # Kelas yang header-nya sedang dibaca (sebelum `{` badan)
+    parens = 0  # Kedalaman `(` di dalam header (konstruktor primer)
+    depth = 0
+    for match in DEPENDENCY_TOKEN.finditer(content):
+        kind = match.lastgroup
+        if kind == "skip":
+            continue
+        if kind == "declaration":
+            header, parens = match.group(kind), 0
+            references.setdefault(header, set())
+        elif kind == "reference":
+            owner = header or (stack[-1][0] if stack else None)
+            if owner is not None:
+                references[owner].add(match.group())
+        elif kind == "member":
+            # Kelas tanpa badan: header berakhir saat anggota/deklarasi berikutnya mulai
+            if header is not None and parens == 0:
+                header = None
+        else:
+            token = match.group()
+            if token == "(":
+                parens += header is not None
+            elif token == ")":
+                parens -= header is not None and parens > 0
+            elif token == "{":
+                depth += 1
+                if header is not None and parens == 0:
+                    stack.append((header, depth))
+                    header = None
+            else:
+                if stack and stack[-1][1] == depth:
+                    stack.pop()
+                depth -= 1
+    return references
+
+
+def index_file(content, package):
+    """
+    Mencatat deklarasi, import, dan referensi tipe dari satu file.
+
+    Dipanggil di dalam loop pembacaan file yang sudah ada, sehingga tidak
+    ada pembacaan file tambahan. `references` memetakan setiap kelas ke tipe
+    yang dirujuk di header dan badannya sendiri.
+    """
+    imports = []
+    wildcards = []
+    for name, wildcard in IMPORT.findall(content):
+        (wildcards if wildcard else imports).append(name)
+    references = class_references(content)
+    return {
+        "package": package,
+        "classes": list(references),
+        "imports": imports,
+        "wildcards": wildcards,
+        "references": references,
+    }
+
+
+def build_class_graph(records):
+    """
+    Membangun graf dependensi kelas dalam bentuk CSR (indptr, indices).
+
+    Referensi diselesaikan lewat import eksplisit, import wildcard, dan kelas
+    dalam paket yang sama. Tipe di luar proyek diabaikan.
+    """
+    names = []  # Nama lengkap (paket.Kelas) per ID node
+    packages = []  # Paket per ID node
+    ids = {}
+    for record in records:
+        for class_name in record["classes"]:
+            fqn = f"{record['package']}.{class_name}"
+            if fqn not in ids:
+                ids[fqn] = len(names)
+                names.append(fqn)
+                packages.append(record["package"])
+
+    sources = []
+    targets = []
+    for record in records:
+        explicit = {name.rsplit(".", 1)[-1]: name for name in record["imports"] if name in ids}
+        scopes = [record["package"]] + record["wildcards"]
+        for class_name, references in record["references"].items():
+            source = ids[f"{record['package']}.{class_name}"]
+            for reference in references:
+                fqn = explicit.get(reference)
+                if fqn is None:
+                    fqn = next(
+                        (f"{scope}.{reference}" for scope in scopes if f"{scope}.{reference}" in ids),
+                        None,
+                    )
+                if fqn is not None and ids[fqn] != source:
+                    sources.append(source)
+                    targets.append(ids[fqn])
+
+    return names, packages, _to_csr(len(names), sources, targets)
+
+
+def _to_csr(node_count, sources, targets):
+    """Mengubah daftar edge menjadi adjacency CSR tanpa edge ganda."""
+    if sources:
+        edges = np.unique(np.column_stack([sources, targets]).astype(np.int32), axis=0)
+    else:
+        edges = np.empty((0, 2), dtype=np.int32)
+    indptr = np.zeros(node_count + 1, dtype=np.int64)
+    np.cumsum(np.bincount(edges[:, 0], minlength=node_count), out=indptr[1:])
+    return indptr, edges[:, 1].copy()
+
+
+def strongly_connected_components(indptr, indices):
+    """Algoritma Tarjan (iteratif, tanpa rekursi) atas graf CSR."""
+    # List Python lebih cepat untuk akses per elemen di dalam loop
+    indptr = indptr.tolist()
+    indices = indices.tolist()
+    node_count = len(indptr) - 1
+    index_of = [-1] * node_count
+    lowlink = [0] * node_count
+    on_stack = [False] * node_count
+    stack = []
+    components = []
+    counter = 0
+
+    for root in range(node_count):
+        if index_of[root] != -1:
+            continue
+        work = [(root, indptr[root])]
+        index_of[root] = lowlink[root] = counter
+        counter += 1
+        stack.append(root)
+        on_stack[root] = True
+
+        while work:
+            node, edge = work[-1]
+            if edge < indptr[node + 1]:
+                work[-1] = (node, edge + 1)
+                neighbour = indices[edge]
+                if index_of[neighbour] == -1:
+                    index_of[neighbour] = lowlink[neighbour] = counter
+                    counter += 1
+                    stack.append(neighbour)
+                    on_stack[neighbour] = True
+                    work.append((neighbour, indptr[neighbour]))
+                elif on_stack[neighbour]:
+                    lowlink[node] = min(lowlink[node], index_of[neighbour])
+                continue
+
+            work.pop()
+            if work:
+                parent = work[-1][0]
+                lowlink[parent] = min(lowlink[parent], lowlink[node])
+            if lowlink[node] == index_of[node]:
+                component = []
+                while True:
+                    member = stack.pop()
+                    on_stack[member] = False
+                    component.append(member)
+                    if member == node:
+                        break
+                components.append(component)
+
+    return components
+
+
+def _cycles(components, labels):
+    """Komponen berukuran lebih dari satu adalah siklus dependensi."""
+    return [sorted(labels[member] for member in component) for component in components if len(component) > 1]
+
+
+def analyze_dependencies(records):
+    """
+    Menghitung metrik kopling dari indeks file.
+
+    Mengembalikan tabel kelas (fan-in/fan-out), tabel paket (Ca, Ce,
+    instability), serta siklus kelas dan paket (SCC berukuran > 1).
+    """
+    names, packages, (indptr, indices) = build_class_graph(records)
+    node_count = len(names)
+    if node_count == 0:
+        return {
+            "classes": pd.DataFrame(columns=["Package", "Class", "Fan In", "Fan Out"]),
+            "packages": pd.DataFrame(columns=["Package", "Ca", "Ce", "Instability"]),
+            "class_cycles": [],
+            "package_cycles": [],
+        }
+    sources = np.repeat(np.arange(node_count), np.diff(indptr))
+
+    fan_out = np.diff(indptr)
+    fan_in = np.bincount(indices, minlength=node_count)
+    classes = pd.DataFrame(
+        {
+            "Package": packages,
+            "Class": [name.rsplit(".", 1)[-1] for name in names],
+            "Fan In": fan_in,
+            "Fan Out": fan_out,
+        }
+    )
+
+    package_names, package_of = np.unique(np.asarray(packages, dtype=object), return_inverse=True)
+    package_count = len(package_names)
+    src_package = package_of[sources]
+    dst_package = package_of[indices]
+    cross = src_package != dst_package
+
+    # Ce: kelas di dalam paket yang bergantung pada kelas di luar paket
+    efferent_classes = np.unique(sources[cross])
+    efferent = np.bincount(package_of[efferent_classes], minlength=package_count)
+    # Ca: kelas di luar paket yang bergantung pada kelas di dalam paket
+    afferent_pairs = np.unique(np.column_stack([dst_package[cross], sources[cross]]), axis=0)
+    afferent = np.bincount(afferent_pairs[:, 0], minlength=package_count)
+    coupling = afferent + efferent
+    packages_df = pd.DataFrame(
+        {
+            "Package": package_names,
+            "Ca": afferent,
+            "Ce": efferent,
+            "Instability": np.divide(efferent, coupling, out=np.zeros(package_count), where=coupling > 0),
+        }
+    )
+
+    # Graf paket diturunkan dari edge kelas yang melintasi batas paket
+    package_indptr, package_indices = _to_csr(
+        package_count, src_package[cross].tolist(), dst_package[cross].tolist()
+    )
+
+    return {
+        "classes": classes,
+        "packages": packages_df,
+        "class_cycles": _cycles(strongly_connected_components(indptr, indices), names),
+        "package_cycles": _cycles(
+            strongly_connected_components(package_indptr, package_indices), package_names
+        ),
+    }
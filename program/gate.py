@@ -0,0 +1,347 @@
+"""
+Mode quality gate untuk CI: gagal jika ada metode yang melewati ambang.
+
+Contoh:
+    python -m program.gate --config gate.json --format sarif --output gate.sarif src/Foo.kt src/Bar.kt
+"""
+import argparse
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from kopyt import node
+from program import astcache
+from program import controller
+from program import ignore
+from program import java
+from program import languages
+from program import scan
+from program import script
+from program import signatures
+from program import spans
+
+# Ambang bawaan: metode dengan nilai di atas ambang dianggap pelanggaran
+DEFAULT_THRESHOLDS = {"CC": 15, "Max Nesting": 4}
+# Metrik per metode yang boleh dipakai di konfigurasi
+GATE_METRICS = ("CC", "Max Nesting", "Cognitive Complexity", "NOLV", "LOC", "Parameters")
+RULE_IDS = {
+    "CC": "cyclomatic-complexity",
+    "Max Nesting": "max-nesting",
+    "Cognitive Complexity": "cognitive-complexity",
+    "NOLV": "local-variables",
+    "LOC": "method-length",
+    "Parameters": "too-many-parameters",
+}
+ERROR_RULE = "analysis-error"
+# Exit code: lulus, gagal ambang, kesalahan konfigurasi/pemakaian
+PASSED, FAILED, USAGE_ERROR = 0, 1, 2
+
+
+def load_config(path=None):
+    """
+    Konfigurasi gate dari file JSON:
+        {"thresholds": {"CC": 15, "Max Nesting": 4}, "budget": 0, "exclude": ["build/"]}
+    `thresholds` digabung dengan DEFAULT_THRESHOLDS (nilai null menonaktifkan
+    ambang bawaan); `budget` = jumlah pelanggaran yang masih ditoleransi;
+    `exclude` = pola gaya .gitignore yang dilewati (bawaan ignore.DEFAULT_EXCLUDES).
+    """
+    config = {"thresholds": dict(DEFAULT_THRESHOLDS), "budget": 0, "exclude": list(ignore.DEFAULT_EXCLUDES)}
+    if path:
+        with open(path, "r", encoding="utf-8") as f:
+            loaded = json.load(f)
+        config["thresholds"].update(loaded.get("thresholds", {}))
+        config["budget"] = loaded.get("budget", config["budget"])
+        config["exclude"] = list(loaded.get("exclude", config["exclude"]))
+    config["thresholds"] = {
+        metric: limit for metric, limit in config["thresholds"].items() if limit is not None
+    }
+
+    unknown = set(config["thresholds"]) - set(GATE_METRICS)
+    if unknown:
+        raise ValueError(f"Unknown metric(s) in thresholds: {', '.join(sorted(unknown))}")
+    for metric, limit in config["thresholds"].items():
+        if isinstance(limit, bool) or not isinstance(limit, (int, float)):
+            raise ValueError(f"Threshold for {metric} must be a number")
+    if not isinstance(config["budget"], int) or config["budget"] < 0:
+        raise ValueError("budget must be a non-negative integer")
+    return config
+
+
+def kotlin_method_metrics(file_path, code):
+    """
+    Jalur cepat untuk gate: satu kali parse per file, hanya metrik per metode
+    (controller.method_metrics) tanpa metrik tingkat kelas yang masing-masing
+    mem-parse ulang file. Metode kelas pertama dinilai seperti di
+    controller.extracted_method; fungsi tingkat atas dinilai dengan nama file
+    sebagai kelas, seperti blok skrip.
+    """
+    if script.is_plain_script(file_path, code):
+        return script.analyze_script(file_path, code)
+
+    result = astcache.parse(code)
+    package_name = result.package.name if result.package else "Unknown"
+    declarations = result.declarations or []
+
+    def method_row(class_name, member, body_source):
+        return {
+            "Package": package_name,
+            "Class": class_name,
+            "Method": member.name,
+            "Line": member.position.line,
+            **controller.method_metrics(member, body_source),
+            "Parameters": signatures.function_signature(member)["Parameters"],
+        }
+
+    rows = []
+    if any(isinstance(declaration, node.FunctionDeclaration) for declaration in declarations):
+        file_name = os.path.basename(file_path)
+        for declaration, body_source in zip(declarations, spans.declaration_sources(code, declarations)):
+            if isinstance(declaration, node.FunctionDeclaration):
+                rows.append(method_row(file_name, declaration, body_source))
+
+    class_declaration = next(
+        (
+            declaration for declaration in declarations
+            if isinstance(declaration, (node.ClassDeclaration, node.ObjectDeclaration)) and declaration.body is not None
+        ),
+        None,
+    )
+    if class_declaration is not None:
+        members = class_declaration.body.members
+        for member, body_source in zip(members, spans.member_sources(code, class_declaration.body, members)):
+            if isinstance(member, node.FunctionDeclaration):
+                rows.append(method_row(class_declaration.name, member, body_source))
+    return rows
+
+
+def check_file(path, thresholds):
+    """
+    Memeriksa satu file terhadap ambang. Mengembalikan (pelanggaran, error);
+    file yang gagal dianalisis dilaporkan sebagai error, bukan pelanggaran.
+    """
+    plugin = languages.plugin_for(controller.PLUGINS, path)
+    try:
+        code = scan.read_source(path)
+        if plugin is controller.KOTLIN:
+            rows = kotlin_method_metrics(path, code)
+        elif plugin is languages.JAVA:
+            # Kolom Line hanya untuk lokasi pelanggaran; laporan biasa tidak memuatnya
+            rows = java.analyze_java(path, code, with_line=True)
+        else:
+            rows = plugin.analyze(path, code)
+    except Exception as e:
+        return [], [{"path": path, "message": str(e)}]
+
+    violations = []
+    errors = []
+    for row in rows:
+        if row.get("Error"):
+            errors.append({"path": path, "message": row["Error"]})
+            continue
+        for metric, limit in thresholds.items():
+            value = row.get(metric)
+            if isinstance(value, (int, float)) and value > limit:
+                violations.append({
+                    "path": path,
+                    "line": row.get("Line"),
+                    "package": row["Package"],
+                    "class": row["Class"],
+                    "method": row["Method"],
+                    "metric": metric,
+                    "value": value,
+                    "threshold": limit,
+                })
+    return violations, errors
+
+
+def check_chunk(paths, thresholds):
+    """Dijalankan di worker: memeriksa sekelompok file."""
+    violations = []
+    errors = []
+    for path in paths:
+        file_violations, file_errors = check_file(path, thresholds)
+        violations.extend(file_violations)
+        errors.extend(file_errors)
+    return len(paths), violations, errors
+
+
+def collect_files(paths, excludes=None):
+    """
+    File sumber dari argumen: direktori ditelusuri dengan pemangkasan
+    (ignore.walk), file langsung dipakai kecuali cocok dengan pola abaikan.
+    """
+    extensions = languages.source_extensions(controller.PLUGINS)
+    ignore_rules = ignore.IgnoreRules(ignore.DEFAULT_EXCLUDES if excludes is None else excludes)
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            files.extend(
+                os.path.join(root, name) for root, name in ignore.walk(path, extensions, excludes)
+            )
+        elif (
+            path.lower().endswith(extensions)
+            # File yang dihapus pada diff CI tidak lagi ada di disk
+            and os.path.isfile(path)
+            and not ignore_rules.excluded(os.path.relpath(path))
+        ):
+            files.append(path)
+    return list(dict.fromkeys(files))
+
+
+def run_gate(files, thresholds, budget=0, fail_fast=True, workers=None):
+    """
+    Memeriksa file dan berhenti segera setelah jumlah pelanggaran melewati
+    `budget` (fail-fast). Daftar besar diperiksa paralel per potongan;
+    potongan yang belum berjalan dibatalkan saat anggaran terlampaui.
+    """
+    violations = []
+    errors = []
+    analyzed = 0
+    workers = workers or os.cpu_count() or 1
+
+    if len(files) < controller.PARALLEL_MIN_FILES or workers < 2:
+        for path in files:
+            file_violations, file_errors = check_file(path, thresholds)
+            analyzed += 1
+            violations.extend(file_violations)
+            errors.extend(file_errors)
+            if fail_fast and len(violations) > budget:
+                break
+    else:
+        # Potongan kecil: pembatalan fail-fast tidak menunggu potongan besar
+        chunk_size = max(1, min(32, len(files) // (workers * controller.CHUNKS_PER_WORKER)))
+        executor = ProcessPoolExecutor(max_workers=min(workers, len(files)))
+        try:
+            futures = [
+                executor.submit(check_chunk, files[start:start + chunk_size], thresholds)
+                for start in range(0, len(files), chunk_size)
+            ]
+            for future in as_completed(futures):
+                count, chunk_violations, chunk_errors = future.result()
+                analyzed += count
+                violations.extend(chunk_violations)
+                errors.extend(chunk_errors)
+                if fail_fast and len(violations) > budget:
+                    break
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    violations.sort(key=lambda v: (v["path"], v["line"] or 0, v["method"], v["metric"]))
+    return {
+        "passed": len(violations) <= budget,
+        "files_total": len(files),
+        "files_analyzed": analyzed,
+        "stopped_early": analyzed < len(files),
+        "budget": budget,
+        "thresholds": thresholds,
+        "violations": violations,
+        "errors": errors,
+    }
+
+
+def _location(path, line=None):
+    location = {"artifactLocation": {"uri": path.replace(os.sep, "/")}}
+    if line:
+        location["region"] = {"startLine": line}
+    return {"physicalLocation": location}
+
+
+def to_sarif(report):
+    """Laporan gate dalam format SARIF 2.1.0 (untuk code scanning di CI)."""
+    rules = [
+        {
+            "id": RULE_IDS[metric],
+            "name": metric,
+            "shortDescription": {"text": f"{metric} above {limit}"},
+        }
+        for metric, limit in report["thresholds"].items()
+    ]
+    rules.append({"id": ERROR_RULE, "shortDescription": {"text": "File could not be analyzed"}})
+
+    results = [
+        {
+            "ruleId": RULE_IDS[v["metric"]],
+            "level": "error",
+            "message": {
+                "text": f"{v['class']}.{v['method']}: {v['metric']} {v['value']} exceeds {v['threshold']}"
+            },
+            "locations": [_location(v["path"], v["line"])],
+        }
+        for v in report["violations"]
+    ]
+    results.extend(
+        {
+            "ruleId": ERROR_RULE,
+            "level": "warning",
+            "message": {"text": e["message"]},
+            "locations": [_location(e["path"])],
+        }
+        for e in report["errors"]
+    )
+    return {
+        "$schema": "https://json.schemastore.org/sarif-2.1.0.json",
+        "version": "2.1.0",
+        "runs": [{
+            "tool": {"driver": {"name": "kotlin-metrics-gate", "rules": rules}},
+            "results": results,
+            "invocations": [{"executionSuccessful": True}],
+            "properties": {
+                key: report[key]
+                for key in ("passed", "files_total", "files_analyzed", "stopped_early", "budget")
+            },
+        }],
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m program.gate",
+        description="Fail when any method exceeds the configured metric thresholds.",
+    )
+    parser.add_argument("paths", nargs="*", default=["."], help="changed files or directories (default: .)")
+    parser.add_argument("--config", help="JSON file with thresholds and budget")
+    parser.add_argument("--budget", type=int, help="number of violations tolerated (overrides config)")
+    parser.add_argument("--exclude", action="append", default=[], help=".gitignore-style pattern to skip (repeatable)")
+    parser.add_argument("--format", choices=("json", "sarif"), default="json")
+    parser.add_argument("--output", help="write the report to this file instead of stdout")
+    parser.add_argument("--no-fail-fast", action="store_true", help="analyze every file even after the budget is exceeded")
+    parser.add_argument("--workers", type=int, help="number of worker processes")
+    args = parser.parse_args(argv)
+
+    try:
+        config = load_config(args.config)
+        if args.budget is not None:
+            if args.budget < 0:
+                raise ValueError("budget must be a non-negative integer")
+            config["budget"] = args.budget
+    except (OSError, ValueError) as e:
+        print(f"gate: {e}", file=sys.stderr)
+        return USAGE_ERROR
+
+    report = run_gate(
+        collect_files(args.paths, config["exclude"] + args.exclude),
+        config["thresholds"],
+        config["budget"],
+        fail_fast=not args.no_fail_fast,
+        workers=args.workers,
+    )
+    document = to_sarif(report) if args.format == "sarif" else report
+    text = json.dumps(document, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+
+    status = "passed" if report["passed"] else "failed"
+    print(
+        f"gate {status}: {len(report['violations'])} violation(s), budget {report['budget']}, "
+        f"{report['files_analyzed']}/{report['files_total']} files analyzed",
+        file=sys.stderr,
+    )
+    return PASSED if report["passed"] else FAILED
+
+
+if __name__ == "__main__":
+    sys.exit(main())
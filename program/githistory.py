@@ -0,0 +1,251 @@
+import os
+import subprocess
+
+import pandas as pd
+
+from program import controller
+from program import history
+from program import ignore
+from program import languages
+
+
+# Isi blob yang ditampung sebelum dianalisis; blob dibaca bertahap dari commit terlama
+BLOB_BATCH_BYTES = 32 * 1024 * 1024
+
+
+def check_revision_range(revision_range):
+    """
+    Menolak rentang revisi yang bisa dibaca git sebagai opsi (diawali `-`),
+    mis. `--output=...` dari input pengguna.
+    """
+    if not revision_range or revision_range.startswith("-"):
+        raise ValueError(f"Invalid revision range: {revision_range!r}")
+    return revision_range
+
+
+def _git(repo, *args):
+    """Menjalankan perintah git lokal pada repositori dan mengembalikan stdout."""
+    result = subprocess.run(
+        ["git", "-C", repo, *args], check=True, capture_output=True, text=True
+    )
+    return result.stdout
+
+
+def list_commits(repo, revision_range="HEAD", max_count=None):
+    """Commit dalam rentang sebagai (sha, tanggal ISO), dari yang terlama."""
+    args = ["log", "--format=%H %cI"]
+    if max_count:
+        args.append(f"--max-count={int(max_count)}")
+    # --end-of-options: rentang tidak pernah ditafsirkan sebagai opsi git
+    output = _git(repo, *args, "--end-of-options", check_revision_range(revision_range))
+    # git log mengurutkan dari yang terbaru; --max-count memilih N commit terakhir
+    return [tuple(line.split(" ", 1)) for line in reversed(output.splitlines()) if line]
+
+
+def list_blobs(repo, commit, extensions, rules=None):
+    """File sumber pada sebuah commit sebagai (blob_id, path), tanpa path yang diabaikan."""
+    output = _git(repo, "ls-tree", "-r", "-z", "--end-of-options", commit)
+    blobs = []
+    for entry in output.split("\0"):
+        if not entry:
+            continue
+        meta, path = entry.split("\t", 1)
+        _, kind, blob_id = meta.split()
+        if kind == "blob" and path.lower().endswith(extensions):
+            if rules is None or not rules.excluded(path):
+                blobs.append((blob_id, path))
+    return blobs
+
+
+def read_blobs(repo, blob_ids):
+    """
+    Membaca isi banyak blob lewat satu proses `git cat-file --batch`,
+    menghasilkan (blob_id, bytes) sesuai urutan permintaan.
+    """
+    process = subprocess.Popen(
+        ["git", "-C", repo, "cat-file", "--batch"],
+        stdin=subprocess.PIPE,
+        stdout=subprocess.PIPE,
+    )
+    try:
+        for blob_id in blob_ids:
+            process.stdin.write(blob_id.encode() + b"\n")
+            process.stdin.flush()
+            header = process.stdout.readline().split()
+            if len(header) < 3 or header[1] != b"blob":
+                raise ValueError(f"Blob tidak ditemukan: {blob_id}")
+            content = process.stdout.read(int(header[2]))
+            process.stdout.read(1)  # Newline penutup setiap objek
+            yield blob_id, content
+    finally:
+        process.stdin.close()
+        process.stdout.close()
+        process.wait()
+
+
+def blob_sizes(repo, blob_ids):
+    """Ukuran (byte) banyak blob lewat satu `git cat-file --batch-check`, tanpa membaca isinya."""
+    blob_ids = list(blob_ids)
+    result = subprocess.run(
+        ["git", "-C", repo, "cat-file", "--batch-check"],
+        input="".join(f"{blob_id}\n" for blob_id in blob_ids),
+        check=True, capture_output=True, text=True,
+    )
+    sizes = {}
+    for line in result.stdout.splitlines():
+        parts = line.split()
+        if len(parts) == 3 and parts[1] == "blob":
+            sizes[parts[0]] = int(parts[2])
+    return sizes
+
+
+def file_churn(repo, revision_range="HEAD", extensions=None, max_count=None):
+    """Jumlah commit dan baris yang ditambah/dihapus per file dalam rentang."""
+    args = ["log", "--numstat", "--no-renames", "--format=%H"]
+    if max_count:
+        args.append(f"--max-count={int(max_count)}")
+    output = _git(repo, *args, "--end-of-options", check_revision_range(revision_range))
+
+    churn = {}
+    for line in output.splitlines():
+        parts = line.split("\t")
+        if len(parts) != 3 or (extensions and not parts[2].lower().endswith(extensions)):
+            continue
+        added, deleted, path = parts
+        # File biner ditandai "-" oleh numstat
+        added = int(added) if added.isdigit() else 0
+        deleted = int(deleted) if deleted.isdigit() else 0
+        commits, total_added, total_deleted = churn.get(path, (0, 0, 0))
+        churn[path] = (commits + 1, total_added + added, total_deleted + deleted)
+
+    frame = pd.DataFrame(
+        [(path, *values) for path, values in churn.items()],
+        columns=["Path", "Commits", "Lines Added", "Lines Deleted"],
+    )
+    frame["Churn"] = frame["Lines Added"] + frame["Lines Deleted"]
+    return frame
+
+
+def hotspots(snapshots, churn):
+    """
+    Skor hotspot per file: churn x total CC pada snapshot terakhir.
+    File yang sering berubah dan kompleks berada di urutan teratas.
+    """
+    if snapshots.empty or churn.empty:
+        return pd.DataFrame(columns=["Path", "Commits", "Churn", "CC Total", "Hotspot"])
+
+    latest = snapshots[snapshots["Commit"] == snapshots["Commit"].iloc[-1]]
+    rows = latest[latest["Error"].isna()] if "Error" in latest.columns else latest
+    complexity = (
+        rows.assign(CC=pd.to_numeric(rows["CC"], errors="coerce"))
+        .groupby("Path", sort=False)["CC"]
+        .sum()
+        .rename("CC Total")
+        .reset_index()
+    )
+    frame = churn.merge(complexity, on="Path", how="inner")
+    frame["Hotspot"] = frame["Churn"] * frame["CC Total"]
+    return frame[["Path", "Commits", "Churn", "CC Total", "Hotspot"]].sort_values(
+        "Hotspot", ascending=False, ignore_index=True
+    )
+
+
+def analyze_history(repo, revision_range="HEAD", max_count=None, progress=None, workers=None, excludes=None):
+    """
+    Menganalisis setiap commit dalam rentang tanpa checkout maupun ZIP.
+
+    ID blob git menjadi kunci cache: setiap versi file yang berbeda
+    dianalisis tepat sekali, lalu barisnya dipakai ulang oleh semua commit
+    yang memuat blob tersebut. Isi blob dibaca bertahap dari commit terlama
+    dan dianalisis per batch (BLOB_BATCH_BYTES), jadi yang ditampung di
+    memori hanya satu batch, bukan seluruh riwayat.
+    """
+    repo = os.path.abspath(repo)
+    extensions = languages.source_extensions(controller.PLUGINS)
+    commits = list_commits(repo, revision_range, max_count)
+    # Sumber build/generate yang ikut ter-commit dilewati seperti pada analisis direktori
+    ignore_rules = ignore.IgnoreRules(ignore.DEFAULT_EXCLUDES if excludes is None else excludes)
+    trees = {sha: list_blobs(repo, sha, extensions, ignore_rules) for sha, _ in commits}
+
+    # Nama file ikut menjadi kunci: plugin dan nama skrip .kts bergantung padanya
+    unique = list(dict.fromkeys(
+        (blob_id, os.path.basename(path)) for blobs in trees.values() for blob_id, path in blobs
+    ))
+    results = _analyze_blobs(repo, unique, progress, workers)
+
+    # Setiap commit hanya memetakan path ke indeks blob yang sudah dianalisis
+    member_index = {key: index for index, key in enumerate(unique)}
+    files = pd.DataFrame(
+        [
+            (sha, date, path, member_index[(blob_id, os.path.basename(path))])
+            for sha, date in commits
+            for blob_id, path in trees[sha]
+        ],
+        columns=["Commit", "Date", "Path", "Member Index"],
+    )
+    snapshots = files.merge(results, on="Member Index", how="inner", sort=False).drop(
+        columns="Member Index"
+    ) if not results.empty else files.drop(columns="Member Index")
+
+    churn = file_churn(repo, revision_range, extensions, max_count)
+    return {
+        "commits": len(commits),
+        "file_versions": sum(len(blobs) for blobs in trees.values()),
+        "parsed_blobs": len(unique),
+        "snapshots": snapshots,
+        "hotspots": hotspots(snapshots, churn),
+    }
+
+
+def _analyze_blobs(repo, unique, progress=None, workers=None):
+    """
+    Membaca dan menganalisis blob (blob_id, nama file) sesuai urutannya per
+    batch. "Member Index" hasilnya menunjuk posisi di `unique`.
+
+    Batch disusun dari ukuran blob, lalu setiap batch dibaca lewat proses
+    `git cat-file` sendiri yang sudah selesai sebelum analisis dimulai:
+    worker yang di-fork tidak boleh mewarisi pipe cat-file yang masih terbuka.
+    """
+    total = len(unique)
+    sizes = blob_sizes(repo, dict.fromkeys(blob_id for blob_id, _ in unique))
+    batches = []
+    batch_bytes = BLOB_BATCH_BYTES
+    for key in unique:
+        if batch_bytes >= BLOB_BATCH_BYTES:
+            batches.append([])
+            batch_bytes = 0
+        batches[-1].append(key)
+        batch_bytes += sizes.get(key[0], 0)
+
+    workers = workers or os.cpu_count() or 1
+    # Satu pool untuk semua batch, agar proses worker tidak dinyalakan ulang per batch
+    executor = None
+    if workers >= 2 and total >= controller.PARALLEL_MIN_FILES:
+        executor = controller.new_pool(min(workers, total))
+
+    frames = []
+    offset = 0
+    try:
+        for batch in batches:
+            contents = dict(read_blobs(repo, list(dict.fromkeys(blob_id for blob_id, _ in batch))))
+            members = [(name, contents[blob_id]) for blob_id, name in batch]
+            del contents
+            start = offset
+            batch_progress = (lambda done, _: progress(start + done, total)) if progress else None
+            rows = controller.analyze_members(members, batch_progress, workers, executor)
+            if not rows.empty:
+                rows["Member Index"] += start
+                frames.append(rows)
+            offset += len(batch)
+    finally:
+        if executor is not None:
+            executor.shutdown()
+    return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+
+
+def ingest_history(conn, project, snapshots):
+    """Menyimpan satu snapshot riwayat per commit, memakai tanggal commit."""
+    snapshot_ids = []
+    for (_, date), group in snapshots.groupby(["Commit", "Date"], sort=False):
+        snapshot_ids.append(history.ingest_dataframe(conn, group, project, date))
+    return snapshot_ids
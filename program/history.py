@@ -0,0 +1,199 @@
+import hashlib
+import sqlite3
+from datetime import datetime
+
+import pandas as pd
+
+HISTORY_DB = "metrics_history.db"
+
+# Kolom identitas; semua kolom numerik lain disimpan sebagai metrik (format panjang)
+IDENTITY_COLUMNS = ("Extraction Date", "Project", "Package", "Class", "Function", "Method", "Error")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS snapshots (
+    id INTEGER PRIMARY KEY,
+    project TEXT NOT NULL,
+    extraction_date TEXT NOT NULL,
+    content_hash TEXT
+);
+CREATE TABLE IF NOT EXISTS method_metrics (
+    snapshot_id INTEGER NOT NULL REFERENCES snapshots(id),
+    package TEXT NOT NULL,
+    class TEXT NOT NULL,
+    method TEXT NOT NULL,
+    metric TEXT NOT NULL,
+    value REAL
+);
+-- Indeks SQLite selalu diakhiri rowid (id), jadi indeks ini sudah urut (project, extraction_date, id)
+CREATE INDEX IF NOT EXISTS idx_snapshots_project_date ON snapshots(project, extraction_date);
+-- Snapshot yang sama (proyek, tanggal, isi) hanya disimpan sekali
+CREATE UNIQUE INDEX IF NOT EXISTS idx_snapshots_unique ON snapshots(project, extraction_date, content_hash);
+CREATE INDEX IF NOT EXISTS idx_metrics_method ON method_metrics(method, metric, snapshot_id);
+CREATE INDEX IF NOT EXISTS idx_metrics_class ON method_metrics(class, metric, snapshot_id);
+CREATE INDEX IF NOT EXISTS idx_metrics_package ON method_metrics(package, metric, snapshot_id);
+CREATE INDEX IF NOT EXISTS idx_metrics_snapshot ON method_metrics(snapshot_id, metric);
+CREATE INDEX IF NOT EXISTS idx_metrics_value ON method_metrics(metric, snapshot_id, value);
+"""
+
+# Snapshot terakhir sebuah proyek: tanggal ekstraksi terbaru, lalu ID terbesar
+LATEST_SNAPSHOT = (
+    "(SELECT id FROM snapshots WHERE project = ? ORDER BY extraction_date DESC, id DESC LIMIT 1)"
+)
+# `limit` snapshot terakhir sebuah proyek, dengan urutan yang sama
+RECENT_SNAPSHOTS = (
+    "(SELECT id FROM snapshots WHERE project = ? ORDER BY extraction_date DESC, id DESC LIMIT ?)"
+)
+
+
+def connect(db_path=HISTORY_DB):
+    """Membuka (dan bila perlu membuat) basis data riwayat metrik."""
+    conn = sqlite3.connect(db_path)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.executescript(SCHEMA)
+    return conn
+
+
+def content_hash(records):
+    """Hash SHA-256 dari baris metrik (package, class, method, metric, value), tanpa peduli urutan."""
+    digest = hashlib.sha256()
+    for record in sorted(records):
+        digest.update(repr(record).encode("utf-8"))
+        digest.update(b"\n")
+    return digest.hexdigest()
+
+
+def ingest_dataframe(conn, df, project, extraction_date=None):
+    """
+    Menyimpan hasil analisis per metode sebagai satu snapshot baru.
+
+    Mengembalikan ID snapshot. Semua baris dimasukkan dalam satu transaksi.
+    Jika proyek sudah punya snapshot dengan tanggal dan isi yang sama, ID
+    snapshot itu yang dikembalikan dan tidak ada baris yang ditambahkan.
+    """
+    extraction_date = extraction_date or datetime.now().strftime("%Y-%m-%d")
+    method_column = "Function" if "Function" in df.columns else "Method"
+    frame = df[df["Error"].isna()] if "Error" in df.columns else df
+
+    metrics = [
+        column
+        for column in frame.columns
+        if column not in IDENTITY_COLUMNS and pd.api.types.is_numeric_dtype(frame[column])
+    ]
+    long = frame.melt(
+        id_vars=["Package", "Class", method_column],
+        value_vars=metrics,
+        var_name="metric",
+        value_name="value",
+    ).dropna(subset=["value"])
+
+    records = [
+        (str(package), str(class_name), str(method), metric, float(value))
+        for package, class_name, method, metric, value in long.itertuples(index=False)
+    ]
+    digest = content_hash(records)
+
+    with conn:
+        cursor = conn.execute(
+            "INSERT INTO snapshots (project, extraction_date, content_hash) VALUES (?, ?, ?) "
+            "ON CONFLICT (project, extraction_date, content_hash) DO NOTHING",
+            (project, extraction_date, digest),
+        )
+        if cursor.rowcount == 0:
+            # Isi yang sama sudah pernah disimpan (mis. CSV diimpor ulang)
+            row = conn.execute(
+                "SELECT id FROM snapshots WHERE project = ? AND extraction_date = ? AND content_hash = ?",
+                (project, extraction_date, digest),
+            ).fetchone()
+            return row[0]
+        snapshot_id = cursor.lastrowid
+        conn.executemany(
+            "INSERT INTO method_metrics (snapshot_id, package, class, method, metric, value) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            ((snapshot_id, *record) for record in records),
+        )
+    return snapshot_id
+
+
+def ingest_csv(conn, csv_path):
+    """Mengimpor CSV Download Report lama (satu snapshot per Project/Extraction Date)."""
+    df = pd.read_csv(csv_path)
+    snapshot_ids = []
+    for (project, extraction_date), group in df.groupby(["Project", "Extraction Date"], sort=True):
+        snapshot_ids.append(ingest_dataframe(conn, group, project, extraction_date))
+    return snapshot_ids
+
+
+def list_projects(conn):
+    """Daftar proyek yang memiliki snapshot."""
+    return [row[0] for row in conn.execute("SELECT DISTINCT project FROM snapshots ORDER BY project")]
+
+
+def list_metrics(conn, project):
+    """Daftar metrik yang pernah disimpan untuk sebuah proyek."""
+    rows = conn.execute(
+        "SELECT DISTINCT m.metric FROM method_metrics m "
+        f"WHERE m.snapshot_id = {LATEST_SNAPSHOT} "
+        "ORDER BY m.metric",
+        (project,),
+    )
+    return [row[0] for row in rows]
+
+
+def list_methods(conn, project):
+    """Daftar metode pada snapshot terakhir sebuah proyek."""
+    rows = conn.execute(
+        "SELECT DISTINCT m.method FROM method_metrics m "
+        f"WHERE m.snapshot_id = {LATEST_SNAPSHOT} "
+        "ORDER BY m.method",
+        (project,),
+    )
+    return [row[0] for row in rows]
+
+
+def method_trend(conn, project, method, metric, limit=90, class_name=None):
+    """Nilai metrik sebuah metode pada `limit` snapshot terakhir (urut tanggal ekstraksi)."""
+    query = (
+        "SELECT s.id AS snapshot, s.extraction_date AS date, m.class AS class, m.value AS value "
+        "FROM method_metrics m JOIN snapshots s ON s.id = m.snapshot_id "
+        "WHERE m.method = ? AND m.metric = ? "
+        f"AND s.id IN {RECENT_SNAPSHOTS}"
+    )
+    params = [method, metric, project, limit]
+    if class_name is not None:
+        query += " AND m.class = ?"
+        params.append(class_name)
+    return pd.read_sql_query(query + " ORDER BY s.extraction_date, s.id", conn, params=params)
+
+
+def project_trend(conn, project, metric, limit=90):
+    """Total, rata-rata, dan maksimum sebuah metrik per snapshot proyek."""
+    query = (
+        "SELECT s.id AS snapshot, s.extraction_date AS date, "
+        "SUM(m.value) AS total, AVG(m.value) AS mean, MAX(m.value) AS max "
+        "FROM method_metrics m JOIN snapshots s ON s.id = m.snapshot_id "
+        "WHERE m.metric = ? "
+        f"AND s.id IN {RECENT_SNAPSHOTS} "
+        "GROUP BY s.id ORDER BY s.extraction_date, s.id"
+    )
+    return pd.read_sql_query(query, conn, params=[metric, project, limit])
+
+
+def metric_above(conn, project, metric, threshold):
+    """
+    Metode pada snapshot terakhir dengan nilai metrik di atas ambang.
+    Dijawab dengan range scan pada indeks (metric, snapshot_id, value).
+    """
+    query = (
+        "SELECT m.package AS package, m.class AS class, m.method AS method, m.value AS value "
+        "FROM method_metrics m "
+        "WHERE m.metric = ? "
+        f"AND m.snapshot_id = {LATEST_SNAPSHOT} "
+        "AND m.value > ? "
+        "ORDER BY m.value DESC"
+    )
+    return pd.read_sql_query(query, conn, params=[metric, project, threshold])
+
+
+def too_many_parameters(conn, project, threshold=5):
+    """Smell "too many parameters" pada snapshot terakhir sebuah proyek."""
+    return metric_above(conn, project, "Parameters", threshold)
@@ -0,0 +1,179 @@
+import os
+import posixpath
+import re
+
+# Direktori build, cache IDE/Gradle, dan sumber hasil generate yang dilewati.
+# build/ dan generated/ hanya dilewati di luar source set: di dalam src/
+# keduanya adalah direktori paket biasa (mis. src/main/kotlin/com/x/build/)
+DEFAULT_EXCLUDES = (
+    "build/",
+    ".gradle/",
+    ".git/",
+    ".idea/",
+    "node_modules/",
+    "generated/",
+    "!**/src/**/build/",
+    "!**/src/**/generated/",
+)
+GITIGNORE = ".gitignore"
+
+
+def _translate(pattern):
+    """Menerjemahkan glob gaya .gitignore (*, ?, **, [..]) menjadi regex."""
+    parts = []
+    index = 0
+    while index < len(pattern):
+        char = pattern[index]
+        if pattern.startswith("**/", index):
+            parts.append("(?:.*/)?")
+            index += 3
+            continue
+        if pattern.startswith("**", index):
+            parts.append(".*")
+            index += 2
+            continue
+        if char == "*":
+            parts.append("[^/]*")
+        elif char == "?":
+            parts.append("[^/]")
+        elif char == "[" and "]" in pattern[index + 1:]:
+            end = pattern.index("]", index + 1)
+            body = pattern[index + 1:end]
+            if body.startswith("!"):
+                body = "^" + body[1:]
+            parts.append(f"[{body}]")
+            index = end
+        elif char == "\\" and index + 1 < len(pattern):
+            index += 1
+            parts.append(re.escape(pattern[index]))
+        else:
+            parts.append(re.escape(char))
+        index += 1
+    return "".join(parts)
+
+
+def compile_pattern(line):
+    """
+    Satu baris .gitignore menjadi (regex, negasi, hanya_direktori), atau None
+    untuk baris kosong/komentar. Pola tanpa `/` di tengah berlaku di semua
+    kedalaman; pola dengan `/` relatif terhadap direktori .gitignore-nya.
+    """
+    line = line.rstrip("\r\n")
+    if not line.endswith("\\ "):
+        line = line.rstrip(" ")
+    if not line or line.startswith("#"):
+        return None
+
+    negate = line.startswith("!")
+    if negate or line.startswith("\\!") or line.startswith("\\#"):
+        line = line[1:]
+    directory_only = line.endswith("/")
+    line = line.rstrip("/")
+    if not line:
+        return None
+
+    anchored = "/" in line
+    line = line.lstrip("/")
+    regex = _translate(line)
+    if not anchored:
+        regex = "(?:.*/)?" + regex
+    return re.compile(regex + r"\Z"), negate, directory_only
+
+
+class IgnoreRules:
+    """
+    Kumpulan aturan abaikan (glob bawaan/konfigurasi dan isi .gitignore).
+    Path selalu relatif terhadap akar analisis dengan pemisah `/`; aturan
+    yang cocok paling akhir menentukan hasilnya, seperti git.
+    """
+
+    def __init__(self, patterns=DEFAULT_EXCLUDES):
+        self._rules = []
+        self.extend(patterns)
+
+    def extend(self, patterns, base=""):
+        """Menambah pola; `base` = direktori tempat .gitignore berada."""
+        for line in patterns:
+            compiled = compile_pattern(line)
+            if compiled:
+                self._rules.append((base.strip("/"), *compiled))
+
+    def add_gitignore(self, text, base=""):
+        self.extend(text.splitlines(), base)
+
+    def ignored(self, path, is_dir=False):
+        """Memeriksa satu path tanpa melihat direktori induknya."""
+        result = False
+        for base, regex, negate, directory_only in self._rules:
+            if directory_only and not is_dir:
+                continue
+            if base:
+                if not path.startswith(base + "/"):
+                    continue
+                relative = path[len(base) + 1:]
+            else:
+                relative = path
+            if regex.match(relative):
+                result = not negate
+        return result
+
+    def excluded(self, path):
+        """
+        Untuk daftar path datar (anggota arsip): path diabaikan jika dirinya
+        atau salah satu direktori induknya cocok dengan aturan.
+        """
+        parts = path.replace("\\", "/").strip("/").split("/")
+        for depth in range(1, len(parts)):
+            if self.ignored("/".join(parts[:depth]), is_dir=True):
+                return True
+        return self.ignored("/".join(parts))
+
+
+def walk(directory, extensions, excludes=None, use_gitignore=True):
+    """
+    Seperti os.walk, menghasilkan (root, nama file) untuk file sumber yang
+    tidak diabaikan. Direktori yang cocok dengan aturan dipangkas dari
+    `dirs` sehingga tidak pernah dimasuki; .gitignore dibaca saat ditemui.
+    """
+    rules = IgnoreRules(DEFAULT_EXCLUDES if excludes is None else excludes)
+    for root, dirs, files in os.walk(directory):
+        relative_root = os.path.relpath(root, directory).replace(os.sep, "/")
+        relative_root = "" if relative_root == "." else relative_root
+        if use_gitignore and GITIGNORE in files:
+            with open(os.path.join(root, GITIGNORE), "r", encoding="utf-8", errors="replace") as f:
+                rules.add_gitignore(f.read(), relative_root)
+
+        dirs[:] = [
+            name for name in dirs
+            if not rules.ignored(posixpath.join(relative_root, name), is_dir=True)
+        ]
+        for name in files:
+            if name.lower().endswith(extensions) and not rules.ignored(
+                posixpath.join(relative_root, name)
+            ):
+                yield root, name
+
+
+def filter_members(members, rules):
+    """
+    Menerapkan file .gitignore di dalam arsip pada daftar (nama, bytes):
+    semua .gitignore dibaca lebih dulu (yang lebih dangkal lebih dulu, agar
+    yang lebih dalam menang), lalu anggota yang cocok dibuang.
+    """
+    gitignores = [
+        (name.replace("\\", "/"), data)
+        for name, data in members
+        if posixpath.basename(name.replace("\\", "/")) == GITIGNORE
+    ]
+    for name, data in sorted(gitignores, key=lambda member: member[0].count("/")):
+        rules.add_gitignore(data.decode("utf-8", errors="replace"), posixpath.dirname(name))
+    return [
+        (name, data)
+        for name, data in members
+        if posixpath.basename(name.replace("\\", "/")) != GITIGNORE and not rules.excluded(name)
+    ]
+
+
+def parse_patterns(text):
+    """Pola dari input pengguna (satu per baris atau dipisah koma)."""
+    return [part.strip() for part in re.split(r"[\n,]", text or "") if part.strip()]
@@ -1,18 +1,103 @@
+import os
+import time
+
 import streamlit as st
 from program import controller as ct
+from program import aggregate
+from program import history
+from program import jobs
+from program import signatures
+
+@st.cache_resource
+def get_job_queue():
+    """Satu antrian pekerjaan bersama untuk semua sesi pengguna."""
+    return jobs.JobQueue(max_workers=2)
+
+def run_job(func, file, *args, show_partial=None, **kwargs):
+    """
+    Menjalankan `func(isi file, *args, **kwargs)` di antrian bersama dan
+    mengembalikan hasilnya jika sudah selesai. Selama berjalan, progres
+    (dan hasil sementara lewat `show_partial`) ditampilkan lalu halaman
+    di-rerun; jika gagal, pesan kesalahan ditampilkan dan hasilnya None.
+
+    ID pekerjaan disimpan di session_state per unggahan, jadi isi file
+    tidak di-hash ulang pada setiap rerun. Pekerjaan yang sudah dibuang
+    dari tabel antrian dikirim ulang.
+    """
+    queue = get_job_queue()
+    state_key = ("job", func.__module__, func.__qualname__, file.file_id, args, tuple(sorted(kwargs.items())))
+    job_id = st.session_state.get(state_key)
+    job = queue.status(job_id) if job_id is not None else None
+    if job is None:
+        job_id = queue.submit(func, file.getvalue(), *args, **kwargs)
+        st.session_state[state_key] = job_id
+        job = queue.status(job_id)
+
+    if job is not None and job["status"] == jobs.FAILED:
+        st.error(f"Error analyzing archive: {job['error']}")
+        return None
+    if job is not None and job["status"] == jobs.DONE:
+        return job["result"]
+    if job is not None and job["status"] == jobs.CANCELLED:
+        st.warning("Analysis cancelled")
+        if st.button("Run again", key=f"rerun-{job_id}"):
+            del st.session_state[state_key]
+            st.rerun()
+        return None
+
+    done, total = (job["done"], job["total"]) if job is not None else (0, 0)
+    if total:
+        eta = f", ETA {job['eta']:.0f}s" if job["eta"] is not None else ""
+        st.progress(done / total, text=f"Analyzing {done}/{total} files{eta}")
+    else:
+        st.progress(0.0, text=f"Analyzing... {done} files")
+    if show_partial is not None and job is not None and job["partial"] is not None:
+        show_partial(job["partial"])
+    if st.button("Cancel", key=f"cancel-{job_id}"):
+        queue.cancel(job_id)
+    time.sleep(1)
+    st.rerun()
+
+def show_results(df, project_name):
+    st.dataframe(df)
+
+    if df.empty:
+        return
+
+    # Ringkasan paket dan kelas dari hasil per metode
+    rollups = aggregate.aggregate_metrics(df)
+    st.subheader("Project Summary")
+    st.write(rollups["project"])
+    st.subheader("Package Summary")
+    st.dataframe(rollups["packages"])
+    st.subheader("Class Summary")
+    st.dataframe(rollups["classes"])
+
+    st.subheader(f"Too Many Parameters (> {signatures.TOO_MANY_PARAMETERS})")
+    st.dataframe(signatures.too_many_parameters(df))
+
+    # Baris AST membawa kolom signature (Parameters, dst.) ke riwayat
+    if st.button("Save to History"):
+        conn = history.connect()
+        try:
+            snapshot_id = history.ingest_dataframe(conn, df, project_name)
+        finally:
+            conn.close()
+        st.success(f"Saved as snapshot {snapshot_id}")
 
 def main():
     st.title("Kotlin Function Extractor")
 
-    file = st.file_uploader("Upload a RAR or ZIP file containing Kotlin files", type=["rar", "zip"])
+    file = st.file_uploader("Upload a RAR, ZIP, 7z or tar archive containing Kotlin or Java files", type=["rar", "zip", "7z", "tar", "gz", "tgz"])
 
     if file is not None:
-        df = ct.extract_and_parse(file)
-        if isinstance(df, str):
-            st.error(f"Error extracting archive: {df}")
-        else:
-            st.dataframe(df)
+        # Analisis berjalan di latar belakang; rerun hanya membaca status.
+        # Proses worker dibagi rata antar slot antrian
+        df = run_job(ct.parse_archive, file, file.name, workers=get_job_queue().process_workers)
+        if df is not None:
+            project_name = st.text_input("Project name", value=os.path.splitext(file.name)[0])
+            show_results(df, project_name)
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
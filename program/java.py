@@ -0,0 +1,427 @@
+import re
+
+from program import cohesion
+from program import rules
+
+# Lexer Java: komentar dan spasi dibuang, literal string/char menjadi satu token
+TOKEN = re.compile(
+    r'(?P<skip>//[^\n]*|/\*[\s\S]*?\*/|\s+)'
+    r'|(?P<text>"""[\s\S]*?"""|"(?:\\.|[^"\\\n])*"|\'(?:\\.|[^\'\\\n])*\')'
+    r"|(?P<word>[A-Za-z_$][\w$]*)"
+    r"|(?P<number>\d[\w.]*)"
+    r"|(?P<op>&&|\|\||->|::|[^\sA-Za-z_$\d])"
+)
+
+TYPE_KEYWORDS = ("class", "interface", "enum", "record")
+NOT_METHODS = frozenset(
+    ("if", "for", "while", "switch", "catch", "synchronized", "return", "new", "throw", "else", "try")
+)
+# Struktur kontrol yang dihitung sebagai tingkat Max Nesting (seperti cognitive.py:
+# `try`/`catch` ikut, `finally` tidak)
+CONTROL = frozenset(("if", "else", "for", "while", "do", "try", "catch", "switch", "synchronized"))
+# Struktur yang badannya menambah nesting cognitive (SonarSource); `try`,
+# `finally`, dan `synchronized` tidak, badan lambda ya (lihat _body_metrics)
+NESTING = frozenset(("if", "else", "for", "while", "do", "switch", "catch"))
+BRANCHES = frozenset(("if", "for", "while", "case", "catch", "&&", "||"))
+# Struktur yang menambah skor cognitive complexity sebesar 1 + nesting
+NESTED_INCREMENTS = frozenset(("if", "for", "while", "switch", "catch"))
+# Antarmuka fungsional standar yang diperlakukan sebagai parameter lambda
+FUNCTIONAL_TYPES = frozenset(
+    ("Runnable", "Callable", "Supplier", "Consumer", "BiConsumer", "Function", "BiFunction",
+     "Predicate", "BiPredicate", "UnaryOperator", "BinaryOperator")
+)
+MODIFIERS = frozenset(
+    ("public", "private", "protected", "static", "final", "abstract", "default", "synchronized", "native")
+)
+# Kata kunci yang bisa mendahului nama tetapi bukan tipe deklarasi variabel lokal
+NOT_TYPES = frozenset(
+    ("return", "new", "throw", "else", "case", "instanceof", "yield", "assert", "break", "continue", "do")
+)
+# Token setelah nama variabel pada deklarasi: `x =`, `x;`, `x :` (for-each), `x)` (catch/lambda), `x,`
+DECLARATION_END = frozenset(("=", ";", ":", ")", ","))
+# Token yang boleh ada di dalam argumen tipe generik `<...>`
+GENERIC_TOKENS = frozenset((".", ",", "?", "<", ">", "[", "]", "&"))
+
+
+def tokenize(code):
+    """Daftar token (jenis, teks, offset) tanpa komentar dan spasi."""
+    return [
+        (match.lastgroup, match.group(), match.start())
+        for match in TOKEN.finditer(code)
+        if match.lastgroup != "skip"
+    ]
+
+
+def _matching(tokens, start, opening, closing):
+    """Indeks token penutup yang cocok dengan token pembuka di `start`."""
+    depth = 0
+    for index in range(start, len(tokens)):
+        text = tokens[index][1]
+        if text == opening:
+            depth += 1
+        elif text == closing:
+            depth -= 1
+            if depth == 0:
+                return index
+    return len(tokens) - 1
+
+
+def _body_metrics(tokens, method_name=None):
+    """
+    CC, cognitive complexity, dan max nesting dari token badan metode,
+    dengan aturan yang sama seperti cognitive.py untuk Kotlin: `try` tidak
+    menambah nesting cognitive tetapi dihitung di Max Nesting, badan lambda
+    menambah nesting cognitive tetapi tidak Max Nesting, lompatan berlabel
+    dan rekursi langsung masing-masing +1.
+    """
+    cc = 1
+    cognitive = 0
+    max_nesting = 0
+    stack = []  # (nesting cognitive, nesting struktural) per blok `{`
+    nesting = depth = 0
+    pending = None  # Jenis blok untuk `{` berikutnya
+    parens = 0
+    in_case = False  # Di antara `case`/`default` dan `->`/`:`
+    previous_logical = None
+
+    for index, (kind, text, _) in enumerate(tokens):
+        following = tokens[index + 1][1] if index + 1 < len(tokens) else None
+        if text in BRANCHES:
+            cc += 1
+        if text in ("&&", "||"):
+            # Satu poin cognitive per urutan operator logika yang sama
+            if text != previous_logical:
+                cognitive += 1
+            previous_logical = text
+        elif text not in ("(", ")") and kind != "word":
+            previous_logical = None if text in (";", "{", "}") else previous_logical
+
+        if text in NESTED_INCREMENTS:
+            is_else_if = text == "if" and index and tokens[index - 1][1] == "else"
+            cognitive += 1 if is_else_if else 1 + nesting
+        elif text == "else" and following != "if":
+            cognitive += 1
+        elif text in ("break", "continue") and index + 1 < len(tokens) and tokens[index + 1][0] == "word":
+            cognitive += 1  # Lompatan ke label
+        elif kind == "word" and text == method_name and following == "(" \
+                and not (index and tokens[index - 1][1] in (".", "new")):
+            cognitive += 1  # Rekursi langsung
+
+        if text in CONTROL:
+            pending = (int(text in NESTING), 1)
+            max_nesting = max(max_nesting, depth + 1)
+        elif text in ("case", "default"):
+            in_case = True
+        elif text == "->":
+            # Cabang switch `case X -> {` adalah blok biasa, badan lambda menambah nesting
+            if following == "{":
+                pending = (0, 0) if in_case else (1, 0)
+            in_case = False
+        elif text == ":" and in_case:
+            in_case = False
+        elif text == "(":
+            parens += 1
+        elif text == ")":
+            parens -= 1
+        elif text == "{":
+            entry = pending or (0, 0)
+            stack.append(entry)
+            nesting += entry[0]
+            depth += entry[1]
+            pending = None
+        elif text == "}":
+            if stack:
+                entry = stack.pop()
+                nesting -= entry[0]
+                depth -= entry[1]
+        elif text == ";" and parens <= 0:
+            pending = None
+
+    return cc, cognitive, max_nesting
+
+
+def _closes_generic(tokens, index):
+    """True jika `>` di `index` menutup argumen tipe generik (`List<String>`), bukan perbandingan."""
+    depth = 0
+    for position in range(index, -1, -1):
+        kind, text, _ = tokens[position]
+        if text == ">":
+            depth += 1
+        elif text == "<":
+            depth -= 1
+            if depth == 0:
+                return position > 0 and tokens[position - 1][0] == "word"
+        elif kind != "word" and text not in GENERIC_TOKENS:
+            return False
+    return False
+
+
+def _local_variables(tokens):
+    """
+    NOLV metode Java dari token badan: deklarasi bertipe (`int x =`,
+    `List<T> xs;`, `for (T x : xs)`, `catch (E e)`, parameter lambda bertipe,
+    pola `instanceof T t`) beserta deklarator lanjutan `, y =`.
+    """
+    count = 0
+    depth = 0
+    declaring = None  # Kedalaman kurung deklarasi yang sedang berjalan
+    for index, (kind, text, _) in enumerate(tokens):
+        if text in ("(", "["):
+            depth += 1
+        elif text in (")", "]"):
+            depth -= 1
+        elif text in (";", "{", "}"):
+            declaring = None
+        if kind != "word" or index == 0 or index + 1 >= len(tokens):
+            continue
+        if tokens[index + 1][1] not in DECLARATION_END:
+            continue
+        previous_kind, previous, _ = tokens[index - 1]
+        if (previous_kind == "word" and previous not in NOT_TYPES) or previous == "]" \
+                or (previous == ">" and _closes_generic(tokens, index - 1)):
+            count += 1
+            declaring = depth
+        elif previous == "," and declaring == depth and tokens[index + 1][1] in ("=", ";", ","):
+            count += 1
+    return count
+
+
+def split_parameters(tokens):
+    """Memecah token daftar parameter per koma tingkat atas (generik `<K, V>` tidak dipecah)."""
+    parameters = [[]]
+    depth = 0
+    for token in tokens:
+        text = token[1]
+        if text in ("(", "<", "["):
+            depth += 1
+        elif text in (")", ">", "]"):
+            depth -= 1
+        elif text == "," and depth == 0:
+            parameters.append([])
+            continue
+        parameters[-1].append(token)
+    return [parameter for parameter in parameters if parameter]
+
+
+def signature(method):
+    """Indeks signature metode Java dengan kolom yang sama seperti signatures.function_signature."""
+    parameters = split_parameters(method["parameters"])
+    return {
+        "Parameters": len(parameters),
+        "Default Parameters": 0,  # Java tidak punya nilai default parameter
+        "Lambda Parameters": sum(
+            1 for parameter in parameters
+            if any(token[1] in FUNCTIONAL_TYPES for token in parameter[:-1])
+        ),
+        "Receiver": None,
+        "Suspend": 0,
+        "Inline": 0,
+    }
+
+
+def parse(code):
+    """
+    Parser struktural ringan: paket, kelas, field, dan metode beserta
+    token badannya. Badan metode dilewati utuh sehingga lambda dan kelas
+    anonim di dalamnya tidak dianggap metode kelas.
+    """
+    tokens = tokenize(code)
+    package = "Unknown"
+    classes = []
+    class_stack = []  # (kelas, indeks token `}` penutup)
+    statement = []  # Token pernyataan tingkat kelas yang sedang dikumpulkan
+    index = 0
+    line, counted = 1, 0  # Nomor baris dihitung bertahap; offset deklarasi selalu naik
+
+    while index < len(tokens):
+        text = tokens[index][1]
+        while class_stack and index > class_stack[-1][1]:
+            class_stack.pop()
+        current = class_stack[-1][0] if class_stack else None
+
+        if text == "@" and index + 1 < len(tokens) and tokens[index + 1][1] != "interface":
+            # Anotasi (`@A`, `@a.b.C`, `@A(...)`) dilewati bersama argumennya
+            index += 2
+            while index + 1 < len(tokens) and tokens[index][1] == "." and tokens[index + 1][0] == "word":
+                index += 2
+            if index < len(tokens) and tokens[index][1] == "(":
+                index = _matching(tokens, index, "(", ")") + 1
+            continue
+
+        if text == "package" and not classes:
+            end = index + 1
+            while end < len(tokens) and tokens[end][1] != ";":
+                end += 1
+            package = "".join(token[1] for token in tokens[index + 1:end])
+            index = end + 1
+            continue
+
+        if text in TYPE_KEYWORDS and index + 1 < len(tokens) and tokens[index + 1][0] == "word":
+            open_index = index
+            while open_index < len(tokens) and tokens[open_index][1] != "{":
+                open_index += 1
+            close_index = _matching(tokens, open_index, "{", "}")
+            new_class = {"name": tokens[index + 1][1], "fields": [], "methods": []}
+            classes.append(new_class)
+            class_stack.append((new_class, close_index))
+            statement = []
+            index = open_index + 1
+            continue
+
+        if current is not None and text == "(" and statement and statement[-1][0] == "word" \
+                and statement[-1][1] not in NOT_METHODS and "=" not in (t[1] for t in statement):
+            # Deklarasi metode/konstruktor: nama(param) [throws ...] { badan } atau ;
+            close_paren = _matching(tokens, index, "(", ")")
+            end = close_paren + 1
+            while end < len(tokens) and tokens[end][1] not in ("{", ";"):
+                end += 1
+            modifiers = {t[1] for t in statement if t[1] in MODIFIERS}
+            line += code.count("\n", counted, statement[-1][2])
+            counted = statement[-1][2]
+            method = {
+                "name": statement[-1][1],
+                "modifiers": modifiers,
+                "parameters": tokens[index + 1:close_paren],
+                "constructor": statement[-1][1] == current["name"],
+                "line": line,
+                "body": [],
+                "start": statement[0][2],
+                "end": tokens[end][2] if end < len(tokens) else len(code),
+            }
+            if end < len(tokens) and tokens[end][1] == "{":
+                body_end = _matching(tokens, end, "{", "}")
+                method["body"] = tokens[end:body_end + 1]
+                method["start"] = tokens[end][2]
+                method["end"] = tokens[body_end][2] + 1
+                end = body_end
+            current["methods"].append(method)
+            statement = []
+            index = end + 1
+            continue
+
+        if current is not None and text == "{":
+            words = [t[1] for t in statement]
+            if "=" in words:
+                # Penginisialisasi field (`= {1, 2}`, kelas anonim, lambda): lewati sampai `}`,
+                # pernyataan field berlanjut sampai `;`
+                index = _matching(tokens, index, "{", "}") + 1
+                continue
+            if not words or words == ["static"]:
+                # Blok inisialisasi `{ ... }` / `static { ... }`: isinya pernyataan, bukan anggota
+                index = _matching(tokens, index, "{", "}") + 1
+                statement = []
+                continue
+
+        if current is not None and text == ";":
+            # Pernyataan tingkat kelas yang berakhir dengan `;` adalah field
+            names = [t[1] for t in statement]
+            cut = names.index("=") if "=" in names else len(names)
+            if cut and statement[cut - 1][0] == "word":
+                current["fields"].append(
+                    {"name": names[cut - 1], "modifiers": set(names[:cut]) & MODIFIERS}
+                )
+            statement = []
+        elif text in ("{", "}"):
+            statement = []
+        elif current is not None:
+            statement.append(tokens[index])
+        index += 1
+
+    return {"package": package, "classes": classes}
+
+
+def rule_evaluation(java_class, compiled):
+    """
+    Aturan metrik (program.rules) untuk satu kelas Java: nama, modifier
+    metode/field, dan kelas dicocokkan dengan matcher yang sama seperti
+    Kotlin. Tipe tidak dilacak, jadi predikat type_contains tidak cocok.
+    Nilai tingkat file dihitung per kelas, seperti kolom kelas Java lainnya.
+    """
+    evaluation = rules.new_evaluation()
+    class_name = java_class["name"]
+    rules.record(evaluation, compiled.match("class", class_name, frozenset(), ""), class_name)
+    for field in java_class["fields"]:
+        matched = compiled.match("property", field["name"], frozenset(field["modifiers"]), "")
+        rules.record(evaluation, matched, class_name)
+    for method in java_class["methods"]:
+        matched = compiled.match("function", method["name"], frozenset(method["modifiers"]), "")
+        rules.record(evaluation, matched, class_name, method["name"])
+    return evaluation
+
+
+def analyze_java(file_path, code, with_line=False):
+    """
+    Ekstrak metrik per metode dari file Java dengan kolom yang sama seperti
+    extracted_method. `with_line` menambahkan kolom Line (baris nama metode)
+    seperti baris gate Kotlin.
+    """
+    try:
+        parsed = parse(code)
+        package_name = parsed["package"]
+        if not parsed["classes"]:
+            return [{"Package": package_name, "Class": "Unknown", "Method": "None", "LOC": 0, "Max Nesting": 0, "CC": 0, "WOC": 0, "Error": "No class declaration found"}]
+
+        datas = []
+        compiled = rules.active()
+        for java_class in parsed["classes"]:
+            methods = java_class["methods"]
+            fields = java_class["fields"]
+            field_names = [field["name"] for field in fields]
+            bit_of = {name: 1 << position for position, name in enumerate(field_names)}
+            method_names = {method["name"] for method in methods}
+
+            metrics = []
+            bitsets = []
+            calls = []
+            for method in methods:
+                body = method["body"]
+                loc = code.count("\n", method["start"], method["end"]) + 1 if body else 0
+                cc, cognitive, nesting = _body_metrics(body, method["name"]) if body else (0, 0, 0)
+                metrics.append((loc, nesting, cc, cognitive, _local_variables(body)))
+                words = {t[1] for t in body if t[0] == "word"}
+                bits = 0
+                for name in words & bit_of.keys():
+                    bits |= bit_of[name]
+                bitsets.append(bits)
+                calls.append((words & method_names) - {method["name"]})
+
+            visibility = [method["modifiers"] for method in methods]
+            class_values = {
+                "count_num_final_not_static_attributes": sum(1 for f in fields if "final" in f["modifiers"] and "static" not in f["modifiers"]),
+                "num_static_not_final_attributes": sum(1 for f in fields if "static" in f["modifiers"] and "final" not in f["modifiers"]),
+                "number_public_visibility_methods": sum(1 for m in visibility if "public" in m),
+                "number_private_visibility_methods": sum(1 for m in visibility if "private" in m),
+                "number_protected_visibility_methods": sum(1 for m in visibility if "protected" in m),
+                "number_package_visibility_methods": sum(1 for m in visibility if not m & {"public", "private", "protected"}),
+                "number_constructor_DefaultConstructor_methods": sum(
+                    1 for m in methods if m["constructor"] and not m["parameters"]
+                ) or (0 if any(m["constructor"] for m in methods) else 1),
+                "LCOM4": cohesion.lcom4([m["name"] for m in methods], bitsets, calls),
+                "TCC": cohesion.tcc(bitsets),
+            }
+
+            evaluation = rule_evaluation(java_class, compiled)
+            total_cc = sum(metric[2] for metric in metrics)
+            woc_values = [metric[2] / total_cc if total_cc else 0 for metric in metrics]
+            for method, (loc, nesting, cc, cognitive, nolv), woc in zip(methods, metrics, woc_values):
+                datas.append({
+                    "Package": package_name,
+                    "Class": java_class["name"],
+                    "Method": method["name"],
+                    **({"Line": method["line"]} if with_line else {}),
+                    "LOC": loc,
+                    "Max Nesting": nesting,
+                    "CC": cc,
+                    "Cognitive Complexity": cognitive,
+                    "NOLV": nolv,
+                    "WOC": woc,
+                    # Kolom visibilitas di class_values memakai aturan Java (tanpa modifier = paket)
+                    **compiled.values(evaluation, java_class["name"], method["name"]),
+                    **class_values,
+                    **signature(method),
+                })
+
+        return datas if datas else [{"Package": package_name, "Class": parsed["classes"][0]["name"], "Method": "None", "LOC": 0, "Max Nesting": 0, "CC": 0, "WOC": 0, "Error": "No functions found"}]
+
+    except Exception as e:
+        return [{"Package": "Error", "Class": "Error", "Method": "Error", "LOC": None, "Max Nesting": 0, "CC": 0, "WOC": 0, "Error": str(e)}]
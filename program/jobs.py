@@ -0,0 +1,148 @@
+import hashlib
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+# Status yang mungkin dimiliki sebuah pekerjaan
+PENDING = "pending"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+CANCELLED = "cancelled"
+# Status akhir: pekerjaan tidak akan berubah lagi
+FINISHED = (DONE, FAILED, CANCELLED)
+
+
+class Cancelled(Exception):
+    """Dilempar dari callback progres saat pekerjaan yang berjalan dibatalkan."""
+
+
+class JobQueue:
+    """
+    Antrian analisis di latar belakang dengan slot pekerja terbatas.
+
+    Setiap pekerjaan dicatat di tabel pekerjaan beserta progresnya. Hasil yang
+    sudah selesai disimpan dan dipakai ulang untuk input yang sama persis.
+
+    `process_workers` adalah jumlah proses worker yang boleh dipakai satu
+    pekerjaan, agar slot yang berjalan bersamaan tidak melebihi jumlah CPU.
+    """
+
+    def __init__(self, max_workers=2, max_results=32):
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="analysis"
+        )
+        self.process_workers = max(1, (os.cpu_count() or 1) // max_workers)
+        self._lock = threading.Lock()
+        self._jobs = OrderedDict()  # job_id -> catatan pekerjaan
+        self._by_key = {}  # kunci isi input -> job_id
+        self._cancelled = set()  # job_id yang diminta berhenti
+        self._max_results = max_results
+
+    def submit(self, func, data, *args, **kwargs):
+        """
+        Mendaftarkan `func(data, *args, progress=..., **kwargs)` dan langsung
+        mengembalikan ID pekerjaan.
+        """
+        key = (
+            func.__module__,
+            func.__qualname__,
+            hashlib.sha256(data).hexdigest(),
+            args,
+            tuple(sorted(kwargs.items())),
+        )
+
+        with self._lock:
+            job_id = self._by_key.get(key)
+            if job_id is not None and self._jobs[job_id]["status"] not in (FAILED, CANCELLED):
+                return job_id  # Input yang sama sedang/sudah dianalisis
+
+            job_id = uuid.uuid4().hex
+            self._jobs[job_id] = {
+                "status": PENDING,
+                "done": 0,
+                "total": 0,
+                "partial": None,
+                "started": None,
+                "finished": None,
+                "result": None,
+                "error": None,
+            }
+            self._by_key[key] = job_id
+            self._evict()
+
+        self._executor.submit(self._run, job_id, func, data, args, kwargs)
+        return job_id
+
+    def cancel(self, job_id):
+        """
+        Membatalkan pekerjaan. Pekerjaan yang masih antre tidak dijalankan;
+        yang sedang berjalan berhenti pada laporan progres berikutnya.
+        Mengembalikan False jika pekerjaan tidak ada atau sudah selesai.
+        """
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None or job["status"] in FINISHED:
+                return False
+            self._cancelled.add(job_id)
+            if job["status"] == PENDING:
+                job.update(status=CANCELLED, finished=time.monotonic())
+        return True
+
+    def status(self, job_id):
+        """Mengembalikan salinan catatan pekerjaan beserta perkiraan ETA."""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None:
+                return None
+            job = dict(job)
+
+        job["eta"] = None
+        if job["status"] == RUNNING and job["done"] and job["total"]:
+            elapsed = time.monotonic() - job["started"]
+            job["eta"] = elapsed / job["done"] * (job["total"] - job["done"])
+        return job
+
+    def _run(self, job_id, func, data, args, kwargs):
+        def progress(done, total, partial=None):
+            # `partial`: hasil sementara (mis. estimasi per batch) untuk ditampilkan
+            with self._lock:
+                if job_id in self._cancelled:
+                    raise Cancelled(job_id)
+                self._jobs[job_id]["done"] = done
+                self._jobs[job_id]["total"] = total
+                if partial is not None:
+                    self._jobs[job_id]["partial"] = partial
+
+        with self._lock:
+            # Dibatalkan (atau sudah dibuang) sebelum sempat berjalan
+            if job_id in self._cancelled or job_id not in self._jobs:
+                return
+            self._jobs[job_id].update(status=RUNNING, started=time.monotonic())
+        try:
+            result = func(data, *args, progress=progress, **kwargs)
+        except Cancelled:
+            self._update(job_id, status=CANCELLED, finished=time.monotonic())
+        except Exception as e:
+            self._update(job_id, status=FAILED, error=str(e), finished=time.monotonic())
+        else:
+            self._update(job_id, status=DONE, result=result, finished=time.monotonic())
+
+    def _update(self, job_id, **fields):
+        with self._lock:
+            self._jobs[job_id].update(fields)
+
+    def _evict(self):
+        """Membuang hasil selesai yang paling lama jika tabel melebihi batas."""
+        finished = [
+            job_id
+            for job_id, job in self._jobs.items()
+            if job["status"] in FINISHED
+        ]
+        for job_id in finished[: max(0, len(self._jobs) - self._max_results)]:
+            del self._jobs[job_id]
+            self._cancelled.discard(job_id)
+            self._by_key = {k: v for k, v in self._by_key.items() if v != job_id}
@@ -0,0 +1,40 @@
+from program import java
+
+JAVA_EXTENSIONS = (".java",)
+
+
+class LanguagePlugin:
+    """
+    Plugin bahasa untuk pipeline metrik: pencocok file, lexer, parser
+    struktural, dan visitor metrik yang menghasilkan baris per metode.
+    """
+
+    def __init__(self, name, extensions, tokenize, parse, analyze):
+        self.name = name
+        self.extensions = extensions
+        self.tokenize = tokenize
+        self.parse = parse
+        self.analyze = analyze
+
+    def matches(self, file_name):
+        return file_name.lower().endswith(self.extensions)
+
+    def analyze_source(self, file_name, code):
+        """Baris metrik untuk satu file, ditandai dengan nama bahasanya."""
+        return [{"Language": self.name, **row} for row in self.analyze(file_name, code)]
+
+
+JAVA = LanguagePlugin("Java", JAVA_EXTENSIONS, java.tokenize, java.parse, java.analyze_java)
+
+
+def plugin_for(plugins, file_name):
+    """Plugin pertama yang menangani file, atau None."""
+    for plugin in plugins:
+        if plugin.matches(file_name):
+            return plugin
+    return None
+
+
+def source_extensions(plugins):
+    """Gabungan ekstensi semua plugin, untuk menyaring anggota arsip sekali jalan."""
+    return tuple(extension for plugin in plugins for extension in plugin.extensions)
@@ -0,0 +1,159 @@
+import re
+
+# Registri pola regex untuk engine regex di main.py, dikompilasi sekali saat impor.
+PACKAGE = re.compile(r"package\s+([\w\.]+)")
+FUNCTION_NAME = re.compile(r"fun\s+(\w+)\s*\(")
+CLASS_NAME = re.compile(r"class\s+(\w+)")
+BRANCH = re.compile(r"\b(if|else|for|while|when|switch|case|try|catch)\b")
+EXPRESSION_BODY = re.compile(r"=|\bfun\b")
+EMPTY_PARAMETERS = re.compile(r"\(\s*\)")
+
+# Header konstruktor primer dengan lookahead terbatas pada baris yang sama:
+# `class A(`, `class A<T : B<T>>(`, `class A @Inject private constructor(`.
+# Tanpa `.*?` DOTALL, sehingga tidak bisa melompat ke kurung milik deklarasi lain.
+CONSTRUCTOR_HEADER = (
+    r"(?:[ \t]*<(?:[^<>{}()\n]|<[^<>{}()\n]*>){0,200}>)?"
+    r"[ \t]*(?:(?:[\w@.]+[ \t]+){0,4}constructor[ \t]*)?"
+    r"(?P<constructor>\()"
+)
+
+# Satu pola gabungan untuk satu kali finditer per file. Setiap alternatif
+# diawali literal, sehingga mesin sre melewati posisi yang tidak mungkin cocok.
+DECLARATION = re.compile(
+    r"(?P<package>package\s+(?P<package_name>[\w\.]+))"
+    r"|(?P<class>class\s+(?P<class_name>\w+))(?:" + CONSTRUCTOR_HEADER + r")?"
+    r"|(?P<function>fun\s+(?P<function_name>\w+))(?P<call>\s*\()?"
+    r"|(?P<property>(?:val|var)\s+\w+)"
+)
+
+
+def scan_declarations(content):
+    """
+    Mengumpulkan paket, kelas, fungsi, properti, dan konstruktor primer
+    non-default dalam satu pass finditer.
+    """
+    package = None
+    classes = []
+    class_names = []
+    functions = []
+    function_names = []
+    properties = []
+    constructors = {}  # nama kelas -> jumlah konstruktor primer berparameter
+
+    for match in DECLARATION.finditer(content):
+        if match.group("package"):
+            if package is None:
+                package = match.group("package_name")
+        elif match.group("class"):
+            name = match.group("class_name")
+            classes.append(match.group("class"))
+            class_names.append(name)
+            start = match.start("constructor")
+            if start != -1 and not EMPTY_PARAMETERS.match(content, start):
+                constructors[name] = constructors.get(name, 0) + 1
+        elif match.group("function"):
+            functions.append(match.group("function"))
+            if match.group("call") is not None:
+                function_names.append(match.group("function_name"))
+        elif match.group("property"):
+            properties.append(match.group("property"))
+
+    return {
+        "package": package,
+        "classes": classes,
+        "class_names": class_names,
+        "functions": functions,
+        "function_names": function_names,
+        "properties": properties,
+        "constructors": constructors,
+    }
+
+# Token untuk pemindaian variabel lokal: string dan komentar dilewati utuh
+LOCAL_TOKEN = re.compile(
+    r'(?P<skip>"""[\s\S]*?"""|"(?:\\.|[^"\\\n])*"|\'(?:\\.|[^\'\\\n])*\'|//[^\n]*|/\*[\s\S]*?\*/|\s+)'
+    r"|(?P<word>\w+)"
+    r"|(?P<op>->|\S)"
+)
+IDENTIFIER = re.compile(r"[A-Za-z_]\w*")
+# Token yang boleh muncul di daftar parameter lambda sebelum `->`
+LAMBDA_HEADER = frozenset(("(", ")", ",", ":", ".", "<", ">", "?"))
+# Header yang membuka lingkup anggota (properti di dalamnya bukan variabel lokal)
+MEMBER_SCOPES = frozenset(("object", "class", "interface"))
+
+
+def _parameter_names(tokens, start, stop_tokens):
+    """
+    Nama dalam daftar `a, (b, c): T, d: Map<K, V>` mulai dari `start` hingga
+    salah satu `stop_tokens` pada kedalaman 0. Tipe setelah `:` tidak dihitung.
+    Mengembalikan (nama, indeks token penutup), atau (None, indeks) jika daftar
+    terpotong oleh token yang tidak mungkin muncul di sana.
+    """
+    names = []
+    after_colon = False
+    parens = angles = 0
+    for index in range(start, len(tokens)):
+        token = tokens[index]
+        if parens == 0 and angles == 0 and token in stop_tokens:
+            return names, index
+        if token == "(":
+            parens += 1
+        elif token == ")":
+            parens -= 1
+        elif token == "<":
+            angles += 1
+        elif token == ">":
+            angles -= 1
+        elif token == ":":
+            after_colon = True
+        elif token == ",":
+            after_colon = after_colon and angles > 0
+        elif IDENTIFIER.fullmatch(token):
+            if not after_colon and token != "_":
+                names.append(token)
+        elif token not in LAMBDA_HEADER:
+            return None, index
+    return None, len(tokens)
+
+
+def count_local_variables(body):
+    """
+    NOLV dari aliran token dengan kesadaran lingkup: `val`/`var` (termasuk
+    destrukturisasi), variabel `for`, parameter lambda, dan parameter `catch`.
+    Properti di dalam `object`/kelas lokal dan cabang `when` tidak dihitung,
+    `_` diabaikan.
+    """
+    tokens = [match.group() for match in LOCAL_TOKEN.finditer(body) if match.lastgroup != "skip"]
+    scopes = []  # True untuk lingkup anggota (object/class lokal)
+    pending = None  # "member" atau "when" untuk `{` berikutnya
+    count = 0
+    index = 0
+
+    while index < len(tokens):
+        token = tokens[index]
+        if token in MEMBER_SCOPES and not (index and tokens[index - 1] == ":" and token == "class"):
+            # `Foo::class` adalah referensi kelas, bukan deklarasi
+            pending = "member"
+        elif token == "when":
+            pending = "when"
+        elif token == "{":
+            scopes.append(pending == "member")
+            if pending is None:
+                names, _ = _parameter_names(tokens, index + 1, ("->",))
+                count += len(names or ())
+            pending = None
+        elif token == "}":
+            if scopes:
+                scopes.pop()
+        elif token in ("val", "var") and not (scopes and scopes[-1]):
+            if index + 1 < len(tokens) and tokens[index + 1] == "(":
+                names, index = _parameter_names(tokens, index + 2, (")",))
+            else:
+                names = [tokens[index + 1]] if index + 1 < len(tokens) and tokens[index + 1] != "_" else []
+            count += len(names or ())
+        elif token in ("for", "catch") and index + 1 < len(tokens) and tokens[index + 1] == "(":
+            # `for (x in xs)`, `for ((k, v) in m)`, `catch (e: Exception)`
+            names, index = _parameter_names(tokens, index + 2, ("in", ")"))
+            count += len(names or ())
+            continue
+        index += 1
+    return count
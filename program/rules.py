@@ -0,0 +1,330 @@
+"""
+Aturan metrik deklaratif yang dikompilasi menjadi satu matcher gabungan.
+
+Satu aturan adalah dict (bisa dimuat dari JSON):
+    {"name": "number_factory_methods", "node": "function",
+     "name_contains": ["create", "make"], "modifiers_none": ["private"],
+     "level": "file"}
+
+node   : "function", "property", atau "class" (kelas/interface tingkat atas)
+level  : "file" (jumlah per file), "class" (jumlah per kelas), atau
+         "method" (0/1 per metode, hanya untuk node "function")
+Predikat (semua yang ditulis harus terpenuhi):
+    name_contains   salah satu substring ada di nama (tanpa beda huruf besar/kecil)
+    name_regex      regex yang dicari (re.search) di nama
+    modifiers_any   minimal satu modifier ada (anotasi ditulis "@Nama")
+    modifiers_all   semua modifier ada
+    modifiers_none  tidak ada satu pun modifier ini
+    type_contains   salah satu substring ada di tipe kembalian/tipe properti
+    scope           "class" (anggota langsung kelas) atau "companion"
+
+Semua substring `name_contains` dari semua aturan digabung menjadi satu
+regex, sehingga setiap nama dipindai sekali berapa pun jumlah aturannya,
+dan semua aturan dievaluasi dalam satu penelusuran pohon AST.
+"""
+import functools
+import json
+import re
+
+from kopyt import node
+from program import signatures
+
+NODE_TYPES = {
+    "function": node.FunctionDeclaration,
+    "property": node.PropertyDeclaration,
+    "class": node.ClassDeclaration,
+}
+LEVELS = ("file", "class", "method")
+SCOPES = ("class", "companion")
+LIST_PREDICATES = ("name_contains", "modifiers_any", "modifiers_all", "modifiers_none", "type_contains")
+RULE_KEYS = {"name", "node", "level", "name_regex", "scope", "description", *LIST_PREDICATES}
+# Kolom bawaan baris metode: aturan dengan nama ini akan menimpa metrik tersebut
+RESERVED_COLUMNS = frozenset((
+    "Language", "Package", "Class", "Method", "Function", "Line", "Member Index", "Error",
+    "Extraction Date", "Project", "LOC", "Max Nesting", "CC", "Cognitive Complexity", "NOLV", "WOC",
+    "count_num_final_not_static_attributes", "num_static_not_final_attributes",
+    "number_constructor_DefaultConstructor_methods", "LCOM4", "TCC",
+    *signatures.SIGNATURE_COLUMNS,
+))
+# Jumlah nama berbeda yang hasil pencocokannya disimpan per set aturan
+NAME_CACHE = 4096
+
+# Metrik bawaan yang dulu ditulis sebagai fungsi terpisah di controller:
+# hanya metode anggota langsung kelas tingkat atas, tanpa companion object
+DEFAULT_RULES = [
+    {
+        "name": "number_public_visibility_methods",
+        "node": "function",
+        "scope": "class",
+        "modifiers_none": ["private", "protected", "internal"],
+    },
+    {
+        "name": "number_private_visibility_methods",
+        "node": "function",
+        "scope": "class",
+        "modifiers_any": ["private"],
+    },
+    {
+        "name": "number_protected_visibility_methods",
+        "node": "function",
+        "scope": "class",
+        "modifiers_any": ["protected"],
+    },
+    {
+        "name": "number_package_visibility_methods",
+        "node": "function",
+        "scope": "class",
+        "modifiers_none": ["public", "private", "protected", "internal"],
+    },
+    {
+        "name": "number_standard_design_methods",
+        "node": "function",
+        "scope": "class",
+        "name_contains": [
+            # Factory
+            "create", "make", "newInstance", "of", "from",
+            # Builder
+            "build", "builder", "construct", "assemble",
+            # Singleton
+            "getInstance", "instance",
+            # Pola umum lain
+            "clone", "copy", "parse", "load", "save",
+        ],
+    },
+]
+
+
+def validate_rule(rule):
+    """Memeriksa satu aturan dan mengembalikan salinannya dengan nilai bawaan terisi."""
+    if not isinstance(rule, dict):
+        raise ValueError(f"Rule must be an object, got {type(rule).__name__}")
+    name = rule.get("name")
+    if not name or not isinstance(name, str):
+        raise ValueError("Rule needs a non-empty 'name'")
+    if name in RESERVED_COLUMNS:
+        raise ValueError(f"Rule {name}: name is a built-in metric column")
+    unknown = set(rule) - RULE_KEYS
+    if unknown:
+        raise ValueError(f"Rule {name}: unknown key(s) {', '.join(sorted(unknown))}")
+
+    rule = dict(rule)
+    rule.setdefault("level", "file")
+    if rule.get("node") not in NODE_TYPES:
+        raise ValueError(f"Rule {name}: 'node' must be one of {', '.join(NODE_TYPES)}")
+    if rule["level"] not in LEVELS:
+        raise ValueError(f"Rule {name}: 'level' must be one of {', '.join(LEVELS)}")
+    if rule["level"] == "method" and rule["node"] != "function":
+        raise ValueError(f"Rule {name}: level 'method' only applies to function rules")
+    if "scope" in rule and rule["scope"] not in SCOPES:
+        raise ValueError(f"Rule {name}: 'scope' must be one of {', '.join(SCOPES)}")
+    for key in LIST_PREDICATES:
+        if key in rule:
+            values = rule[key]
+            if not isinstance(values, (list, tuple)) or not all(isinstance(value, str) and value for value in values):
+                raise ValueError(f"Rule {name}: '{key}' must be a list of non-empty strings")
+            rule[key] = list(values)
+    if "name_regex" in rule:
+        try:
+            re.compile(rule["name_regex"])
+        except re.error as e:
+            raise ValueError(f"Rule {name}: invalid name_regex: {e}")
+    return rule
+
+
+class CompiledRules:
+    """
+    Set aturan yang sudah dikompilasi: aturan dikelompokkan per jenis node,
+    modifier menjadi frozenset, dan substring nama dari semua aturan menjadi
+    satu regex lookahead. Di setiap posisi regex mengambil substring
+    terpanjang; substring lain yang mulai di posisi sama adalah prefiksnya,
+    jadi aturan miliknya sudah ikut dipetakan ke substring terpanjang itu.
+    """
+
+    def __init__(self, rule_list):
+        self.rules = [validate_rule(rule) for rule in rule_list]
+        self.names = [rule["name"] for rule in self.rules]
+        duplicates = sorted({name for name in self.names if self.names.count(name) > 1})
+        if duplicates:
+            raise ValueError(f"Duplicate rule name(s): {', '.join(duplicates)}")
+        self.levels = {rule["name"]: rule["level"] for rule in self.rules}
+
+        terms = {}
+        for index, rule in enumerate(self.rules):
+            for term in rule.get("name_contains", ()):
+                terms.setdefault(term.lower(), set()).add(index)
+        self._term_rules = {
+            term: frozenset(index for other, indexes in terms.items() if other in term for index in indexes)
+            for term in terms
+        }
+        self._name_pattern = None
+        if terms:
+            alternatives = "|".join(re.escape(term) for term in sorted(terms, key=len, reverse=True))
+            self._name_pattern = re.compile(f"(?=({alternatives}))")
+
+        self._by_node = {kind: [] for kind in NODE_TYPES}
+        for index, rule in enumerate(self.rules):
+            self._by_node[rule["node"]].append((
+                index,
+                rule["name"],
+                rule["level"],
+                "name_contains" in rule,
+                re.compile(rule["name_regex"]) if "name_regex" in rule else None,
+                frozenset(rule.get("modifiers_any", ())),
+                frozenset(rule.get("modifiers_all", ())),
+                frozenset(rule.get("modifiers_none", ())),
+                tuple(term.lower() for term in rule.get("type_contains", ())),
+                rule.get("scope"),
+            ))
+        self._uses_type = {
+            kind: any(compiled[8] for compiled in compiled_rules)
+            for kind, compiled_rules in self._by_node.items()
+        }
+        self.match_name = functools.lru_cache(maxsize=NAME_CACHE)(self._match_name)
+
+    def _match_name(self, name):
+        """Indeks aturan yang substring `name_contains`-nya ada di nama (satu kali pindai)."""
+        if self._name_pattern is None or not name:
+            return frozenset()
+        matched = set()
+        for match in self._name_pattern.finditer(name.lower()):
+            matched |= self._term_rules[match.group(1)]
+        return frozenset(matched)
+
+    def match(self, kind, name, modifiers, type_text=None, scope="class"):
+        """Aturan yang cocok untuk satu node: list (nama aturan, level)."""
+        name_hits = None
+        matched = []
+        for index, rule_name, level, needs_name, regex, any_of, all_of, none_of, type_terms, rule_scope in self._by_node[kind]:
+            if rule_scope is not None and rule_scope != scope:
+                continue
+            if any_of and not any_of & modifiers:
+                continue
+            if all_of and not all_of <= modifiers:
+                continue
+            if none_of & modifiers:
+                continue
+            if needs_name:
+                if name_hits is None:
+                    name_hits = self.match_name(name)
+                if index not in name_hits:
+                    continue
+            if regex is not None and not regex.search(name):
+                continue
+            if type_terms and not any(term in type_text for term in type_terms):
+                continue
+            matched.append((rule_name, level))
+        return matched
+
+    def uses_type(self, kind):
+        return self._uses_type[kind]
+
+    def values(self, evaluation, class_name=None, method_name=None):
+        """Nilai semua aturan untuk satu baris metode, urut seperti definisi aturan."""
+        class_counts = evaluation["classes"].get(class_name, {})
+        method_counts = evaluation["methods"].get((class_name, method_name), {})
+        sources = {"file": evaluation["file"], "class": class_counts, "method": method_counts}
+        return {name: sources[self.levels[name]].get(name, 0) for name in self.names}
+
+
+def compile_rules(rule_list):
+    return CompiledRules(rule_list)
+
+
+def _modifiers(declaration):
+    return frozenset(str(modifier) for modifier in getattr(declaration, "modifiers", None) or ())
+
+
+def _property_name(member):
+    declaration = member.declaration
+    if isinstance(declaration, node.MultiVariableDeclaration):
+        return ",".join(variable.name for variable in declaration)
+    return declaration.name
+
+
+def _property_type(member):
+    declaration = member.declaration
+    return str(getattr(declaration, "type", None) or "").lower()
+
+
+def new_evaluation():
+    """Hasil evaluasi kosong: {"file": {}, "classes": {}, "methods": {}}."""
+    return {"file": {}, "classes": {}, "methods": {}}
+
+
+def record(evaluation, matched, class_name, method_name=None):
+    """Mencatat aturan yang cocok (hasil CompiledRules.match) sesuai levelnya."""
+    for rule_name, level in matched:
+        if level == "file":
+            counts = evaluation["file"]
+        elif level == "class":
+            counts = evaluation["classes"].setdefault(class_name, {})
+        else:
+            evaluation["methods"].setdefault((class_name, method_name), {})[rule_name] = 1
+            continue
+        counts[rule_name] = counts.get(rule_name, 0) + 1
+
+
+def evaluate(tree, compiled):
+    """
+    Menjalankan semua aturan pada pohon AST kopyt dalam satu penelusuran:
+    kelas/interface tingkat atas, anggota langsungnya, dan anggota companion
+    object. Mengembalikan {"file": {aturan: n}, "classes": {kelas: {aturan: n}},
+    "methods": {(kelas, metode): {aturan: 1}}}.
+    """
+    evaluation = new_evaluation()
+
+    def visit_members(members, class_name, scope):
+        for member in members:
+            if isinstance(member, node.FunctionDeclaration):
+                type_text = str(member.type or "").lower() if compiled.uses_type("function") else None
+                matched = compiled.match("function", member.name, _modifiers(member), type_text, scope)
+                record(evaluation, matched, class_name, member.name)
+            elif isinstance(member, node.PropertyDeclaration):
+                type_text = _property_type(member) if compiled.uses_type("property") else None
+                matched = compiled.match("property", _property_name(member), _modifiers(member), type_text, scope)
+                record(evaluation, matched, class_name)
+            elif isinstance(member, node.CompanionObject) and member.body is not None:
+                visit_members(member.body.members, class_name, "companion")
+
+    for declaration in tree.declarations or ():
+        if not isinstance(declaration, node.ClassDeclaration):
+            continue
+        record(evaluation, compiled.match("class", declaration.name, _modifiers(declaration), ""), declaration.name)
+        if declaration.body is not None:
+            visit_members(declaration.body.members, declaration.name, "class")
+
+    return evaluation
+
+
+def load_rules(path):
+    """Aturan tambahan dari file JSON: list aturan atau {"rules": [...]}."""
+    with open(path, "r", encoding="utf-8") as f:
+        loaded = json.load(f)
+    rule_list = loaded.get("rules", []) if isinstance(loaded, dict) else loaded
+    if not isinstance(rule_list, list):
+        raise ValueError("Rules file must contain a list of rules")
+    return [validate_rule(rule) for rule in rule_list]
+
+
+_extra_rules = []
+_active = None
+
+
+def activate(extra_rules=None):
+    """
+    Mengaktifkan aturan bawaan ditambah aturan tim untuk proses ini.
+    Dipanggil sebelum pool worker dibuat, atau sebagai initializer worker.
+    """
+    global _extra_rules, _active
+    _extra_rules = list(extra_rules or [])
+    _active = compile_rules(DEFAULT_RULES + _extra_rules)
+    return _active
+
+
+def active():
+    """Set aturan yang sedang aktif (bawaan saja jika activate() belum dipanggil)."""
+    return _active if _active is not None else activate()
+
+
+def extra_rules():
+    return list(_extra_rules)
@@ -0,0 +1,239 @@
+import bisect
+import os
+import random
+from statistics import NormalDist
+
+import numpy as np
+import pandas as pd
+
+from program import aggregate
+from program import archive
+from program import clones
+from program import ignore
+from program import scan
+
+# Batas kelompok ukuran file (byte) untuk stratifikasi
+SIZE_BINS = (2048, 8192, 32768)
+METRICS = ("loc", "sloc", "lloc", "cloc", "mcc", "code_smells")
+# Rasio yang dilaporkan: (nama, pembilang, penyebut, skala)
+RATIOS = (
+    ("comment_ratio", "cloc", "sloc", 100),
+    ("mcc_per_1000_lloc", "mcc", "lloc", 1000),
+    ("code_smells_per_1000_lloc", "code_smells", "lloc", 1000),
+)
+MOMENT_COLUMNS = (
+    ("n",)
+    + tuple(name for column in METRICS for name in (column, column + "^2"))
+    + tuple(f"{numerator}*{denominator}" for _, numerator, denominator, _ in RATIOS)
+)
+
+
+def list_files(directory, extensions=archive.KOTLIN_EXTENSIONS, excludes=None):
+    """
+    File sumber beserta stratumnya: (path, stratum, kelompok ukuran).
+    Stratum = direktori (padanan paket Kotlin) x kelompok ukuran file.
+    """
+    files = []
+    for root, name in ignore.walk(directory, extensions, excludes):
+        package = os.path.relpath(root, directory)
+        path = os.path.join(root, name)
+        size_bin = bisect.bisect(SIZE_BINS, os.path.getsize(path))
+        files.append((path, f"{package}|{size_bin}", size_bin))
+    return files
+
+
+def sample_order(files, seed=0):
+    """
+    Urutan pemrosesan acak berstrata: setiap prefiks urutan ini adalah
+    sampel dengan alokasi proporsional terhadap ukuran stratum.
+    """
+    rng = random.Random(seed)
+    strata = {}
+    for item in files:
+        strata.setdefault(item[1], []).append(item)
+
+    keyed = []
+    for members in strata.values():
+        rng.shuffle(members)
+        size = len(members)
+        for position, item in enumerate(members):
+            keyed.append(((position + rng.random()) / size, item))
+    keyed.sort(key=lambda pair: pair[0])
+    return [item for _, item in keyed]
+
+
+def measure(path):
+    """
+    Metrik per file dan isi fungsinya, dari pemindaian byte dan ekstraksi
+    fungsi yang sama dengan calculate_complexity_report.
+    """
+    with scan.mapped_file(path) as buf:
+        counts = scan.scan_buffer(buf)
+        content = scan.decode_source(buf[:])
+    metrics = {
+        "loc": counts["loc"],
+        "sloc": counts["sloc"],
+        "lloc": counts["sloc"],
+        "cloc": counts["cloc"],
+        "mcc": counts["keyword_lines"],
+        "code_smells": counts["long_lines"],
+    }
+    return metrics, clones.function_bodies(content)
+
+
+class StratumMoments:
+    """
+    Akumulator berjalan per stratum: n, jumlah, dan jumlah kuadrat setiap
+    metrik, serta jumlah perkalian pembilang x penyebut setiap rasio.
+    Estimasi dihitung dari akumulator ini, jadi setiap batch hanya
+    menambahkan barisnya sendiri tanpa membangun ulang seluruh sampel.
+    """
+
+    def __init__(self):
+        self._sums = {}
+
+    def add(self, stratum, metrics):
+        sums = self._sums.get(stratum)
+        if sums is None:
+            sums = self._sums[stratum] = dict.fromkeys(MOMENT_COLUMNS, 0)
+        sums["n"] += 1
+        for column in METRICS:
+            value = metrics[column]
+            sums[column] += value
+            sums[column + "^2"] += value * value
+        for _, numerator, denominator, _ in RATIOS:
+            sums[f"{numerator}*{denominator}"] += metrics[numerator] * metrics[denominator]
+
+    def arrays(self, strata):
+        """Akumulator sebagai array numpy sejajar `strata` (0 jika belum tersampel)."""
+        frame = pd.DataFrame.from_dict(self._sums, orient="index", columns=MOMENT_COLUMNS)
+        frame = frame.reindex(strata, fill_value=0).astype(float)
+        return {column: frame[column].to_numpy() for column in MOMENT_COLUMNS}
+
+
+def _variance(n, total, squares):
+    """Varians sampel (ddof=1) dari n, jumlah, dan jumlah kuadrat; NaN jika n < 2."""
+    with np.errstate(divide="ignore", invalid="ignore"):
+        variance = (squares - total * total / n) / (n - 1)
+    return np.where(n >= 2, np.maximum(variance, 0.0), np.nan)
+
+
+def _stratified_total(n, total, squares, size, bins):
+    """
+    Estimasi total berstrata dan variansnya dari momen per stratum (array
+    sejajar: n, jumlah, jumlah kuadrat, ukuran stratum, kelompok ukuran).
+
+    Stratum dengan satu sampel memakai varians gabungan kelompok ukurannya;
+    stratum yang belum tersampel diimputasi dari rata-rata kelompok ukuran.
+    """
+    count = n.sum()
+    overall_mean = total.sum() / count
+    overall_var = float(np.nan_to_num(_variance(count, total.sum(), squares.sum())))
+    bin_n = np.bincount(bins, n, minlength=len(SIZE_BINS) + 1)
+    bin_total = np.bincount(bins, total, minlength=len(SIZE_BINS) + 1)
+    bin_var = _variance(bin_n, bin_total, np.bincount(bins, squares, minlength=len(SIZE_BINS) + 1))
+    fallback_var = np.nan_to_num(bin_var[bins], nan=overall_var)
+    bin_count = np.maximum(np.where(bin_n[bins] > 0, bin_n[bins], count), 1)
+
+    sampled = n > 0
+    with np.errstate(divide="ignore", invalid="ignore"):
+        bin_mean = np.where(bin_n[bins] > 0, bin_total[bins] / bin_n[bins], overall_mean)
+        mean = np.where(sampled, total / n, bin_mean)
+    var = np.where(n >= 2, _variance(n, total, squares), fallback_var)
+
+    # Stratum yang tersampel penuh memakai jumlah sebenarnya (tanpa galat pembulatan)
+    estimate = np.where(n < size, size * mean, total).sum()
+    sampled_variance = size * size * (1 - n / size) * var / np.where(sampled, n, 1)
+    # Ketidakpastian nilai file yang belum dilihat + rata-rata kelompoknya
+    unsampled_variance = size * fallback_var + size * size * fallback_var / bin_count
+    variance = np.where(sampled, sampled_variance, unsampled_variance).sum()
+    return float(estimate), float(variance)
+
+
+def estimate(moments, population, bin_of, confidence=0.95, duplicated_methods=0):
+    """
+    Estimasi total dan densitas beserta interval kepercayaan dari momen
+    sampel berstrata (StratumMoments.arrays urut population.index). Rasio memakai estimator rasio dengan varians
+    linearisasi. `duplicated_methods` (fungsi dalam kelompok klon di antara
+    file yang sudah tersampel) ditambahkan ke code smells apa adanya.
+    """
+    z = NormalDist().inv_cdf(0.5 + confidence / 2)
+    n = moments["n"]
+    size = population.to_numpy(dtype=float)
+    bins = bin_of.reindex(population.index).to_numpy(dtype=int)
+    results = {}
+    totals = {}
+    for column in METRICS:
+        total, variance = _stratified_total(n, moments[column], moments[column + "^2"], size, bins)
+        totals[column] = total
+        margin = z * variance ** 0.5
+        results[column] = (total, max(total - margin, 0.0), total + margin)
+
+    if duplicated_methods:
+        totals["code_smells"] += duplicated_methods
+        results["code_smells"] = tuple(value + duplicated_methods for value in results["code_smells"])
+
+    for name, numerator, denominator, scale in RATIOS:
+        if totals[denominator] <= 0:
+            results[name] = (0.0, 0.0, 0.0)
+            continue
+        ratio = totals[numerator] / totals[denominator]
+        # Titik estimasi dengan rumus yang sama seperti laporan penuh
+        point = aggregate.per_1000(totals[numerator], totals[denominator]) if scale == 1000 else ratio * scale
+        # Momen residual d = pembilang - rasio x penyebut, diturunkan dari jumlah yang ada
+        residual_total = moments[numerator] - ratio * moments[denominator]
+        residual_squares = (
+            moments[numerator + "^2"]
+            - 2 * ratio * moments[f"{numerator}*{denominator}"]
+            + ratio * ratio * moments[denominator + "^2"]
+        )
+        _, variance = _stratified_total(n, residual_total, residual_squares, size, bins)
+        margin = z * variance ** 0.5 / totals[denominator]
+        results[name] = (point, max(point - margin * scale, 0.0), point + margin * scale)
+    return results
+
+
+def progressive_report(directory, batch_size=200, seed=0, confidence=0.95, excludes=None):
+    """
+    Menghasilkan estimasi yang makin tepat setelah setiap batch file.
+
+    Code smells = baris panjang + fungsi duplikat, seperti laporan penuh.
+    Fungsi duplikat hanya bisa dilihat di antara file yang sudah tersampel,
+    jadi sebelum batch terakhir bagian itu adalah batas bawah. Batch
+    terakhir mencakup semua file sehingga nilainya sama dengan
+    calculate_complexity_report (interval nol). Direktori tanpa file sumber
+    menghasilkan satu laporan persis bernilai nol.
+    """
+    files = sample_order(list_files(directory, excludes=excludes), seed)
+    if not files:
+        zero = (0.0, 0.0, 0.0)
+        yield {
+            "files_sampled": 0,
+            "files_total": 0,
+            "exact": True,
+            "duplicated_methods": 0,
+            "estimates": dict.fromkeys(METRICS + tuple(name for name, _, _, _ in RATIOS), zero),
+        }
+        return
+    population = pd.Series([stratum for _, stratum, _ in files], dtype=object).value_counts()
+    bin_of = pd.Series({stratum: size_bin for _, stratum, size_bin in files}, dtype=int)
+
+    moments = StratumMoments()
+    clone_index = clones.CloneIndex()
+    sampled = 0
+    for start in range(0, len(files), batch_size):
+        for path, stratum, _ in files[start:start + batch_size]:
+            metrics, bodies = measure(path)
+            moments.add(stratum, metrics)
+            for function, body in bodies:
+                clone_index.add((path, function), body)
+            sampled += 1
+        yield {
+            "files_sampled": sampled,
+            "files_total": len(files),
+            "exact": sampled == len(files),
+            "duplicated_methods": clone_index.duplicated,
+            "estimates": estimate(
+                moments.arrays(population.index), population, bin_of, confidence, clone_index.duplicated
+            ),
+        }
@@ -0,0 +1,134 @@
+import hashlib
+import mmap
+import re
+from contextlib import contextmanager
+
+# Pola byte-level dengan re.MULTILINE: setiap kecocokan mewakili satu baris,
+# sehingga penghitungan tidak perlu membuat objek string per baris.
+NEWLINE = re.compile(rb"\n")
+# `\r` tanpa `\n` juga akhir baris (newline universal pada loop lama)
+LONE_CR = re.compile(rb"\r(?!\n)")
+# Spasi yang dibuang str.strip(): ASCII, lalu spasi Unicode dalam UTF-8
+# (NEL, NBSP, U+1680, U+2000-U+200A, U+2028/2029, U+202F, U+205F, U+3000)
+ASCII_SPACE = rb"[ \t\r\f\v\x1c-\x1f]"
+UNICODE_SPACE = rb"\xc2[\x85\xa0]|\xe1\x9a\x80|\xe2\x80[\x80-\x8a\xa8\xa9\xaf]|\xe2\x81\x9f|\xe3\x80\x80"
+UNICODE_SPACE_PATTERN = re.compile(UNICODE_SPACE)
+UNICODE_SPACE_LEADS = (b"\xc2", b"\xe1", b"\xe2", b"\xe3")
+
+
+def _line_patterns(space):
+    """Pola baris kosong, baris komentar `//`, dan baris berkata kunci untuk kelas spasi `space`."""
+    return (
+        re.compile(rb"^" + space + rb"*$", re.M),
+        re.compile(rb"^" + space + rb"*//", re.M),
+        # Baris non-komentar yang memuat kata kunci struktur kontrol (substring,
+        # sama seperti calculate_cognitive_complexity/calculate_mcc di main.py)
+        re.compile(
+            rb"^(?!" + space + rb"*//)[^\n]*?(?:if|else|for|while|do|when|switch|case|try|catch)",
+            re.M,
+        ),
+    )
+
+
+# Varian Unicode lebih lambat, jadi hanya dipakai jika file memuat spasi Unicode
+LINE_PATTERNS = _line_patterns(ASCII_SPACE)
+UNICODE_LINE_PATTERNS = _line_patterns(rb"(?:" + ASCII_SPACE + rb"|" + UNICODE_SPACE + rb")")
+# Kandidat baris panjang (lebih dari 100 byte setelah spasi awal); spasi
+# Unicode ikut terhitung, lalu dibuang saat kandidat di-decode
+LONG_LINE_CANDIDATE = re.compile(rb"^" + ASCII_SPACE + rb"*[^\n]{101,}", re.M)
+
+
+def decode_source(data):
+    """Decode bytes sumber sebagai UTF-8 tanpa pernah memunculkan UnicodeDecodeError."""
+    try:
+        return data.decode("utf-8")
+    except UnicodeDecodeError:
+        # Byte yang rusak diganti U+FFFD agar analisis tetap berjalan
+        return data.decode("utf-8", errors="replace")
+
+
+def read_source(file_path):
+    """Membaca file sumber dengan decoding yang toleran terhadap encoding rusak."""
+    with open(file_path, "rb") as f:
+        return decode_source(f.read())
+
+
+def read_bytes(file_path):
+    with open(file_path, "rb") as f:
+        return f.read()
+
+
+def content_digest(data):
+    """Kunci isi untuk deduplikasi: salinan file yang identik mendapat digest sama."""
+    return hashlib.blake2b(data, digest_size=16).digest()
+
+
+@contextmanager
+def mapped_file(file_path):
+    """Memetakan file ke memori (mmap); file kosong menghasilkan b''."""
+    with open(file_path, "rb") as f:
+        if f.seek(0, 2) == 0:
+            yield b""
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            yield mapped
+
+
+def has_unicode_space(buf):
+    """Apakah buffer memuat spasi Unicode; byte awalnya dicari dulu dengan find() yang cepat."""
+    return (
+        any(buf.find(lead) != -1 for lead in UNICODE_SPACE_LEADS)
+        and UNICODE_SPACE_PATTERN.search(buf) is not None
+    )
+
+
+def count_long_lines(buf, limit=100):
+    """Menghitung baris yang panjangnya (setelah strip) melebihi batas karakter."""
+    count = 0
+    for match in LONG_LINE_CANDIDATE.finditer(buf):
+        # Hanya kandidat yang di-decode, untuk menghitung karakter bukan byte
+        if len(match.group().decode("utf-8", errors="replace").strip()) > limit:
+            count += 1
+    return count
+
+
+def scan_buffer(buf):
+    """
+    Menghitung metrik baris langsung pada bytes/mmap.
+
+    Hasilnya setara dengan loop readlines()/strip() lama: loc, baris kosong,
+    baris komentar `//`, baris sumber, baris berisi kata kunci kontrol, dan
+    baris yang terlalu panjang. Seperti loop lama, `\r\n` dan `\r` tunggal
+    adalah akhir baris dan spasi Unicode (mis. NBSP) dianggap spasi.
+    """
+    if not buf:
+        return {"loc": 0, "blank": 0, "cloc": 0, "sloc": 0, "keyword_lines": 0, "long_lines": 0}
+    if LONE_CR.search(buf):
+        # Jarang (file Mac klasik): satu salinan dengan `\n` sebagai akhir baris
+        buf = buf[:].replace(b"\r\n", b"\n").replace(b"\r", b"\n")
+
+    blank_line, comment_line, keyword_line = (
+        UNICODE_LINE_PATTERNS if has_unicode_space(buf) else LINE_PATTERNS
+    )
+    ends_with_newline = buf[-1:] == b"\n"
+    # mmap tidak punya .count(); findall(b"\n") hanya mengembalikan singleton b"\n"
+    loc = len(NEWLINE.findall(buf)) + (0 if ends_with_newline else 1)
+    blank = len(blank_line.findall(buf))
+    if ends_with_newline:
+        blank -= 1  # "Baris" kosong setelah newline terakhir bukan baris sungguhan
+    cloc = len(comment_line.findall(buf))
+
+    return {
+        "loc": loc,
+        "blank": blank,
+        "cloc": cloc,
+        "sloc": loc - blank - cloc,
+        "keyword_lines": len(keyword_line.findall(buf)),
+        "long_lines": count_long_lines(buf),
+    }
+
+
+def scan_file(file_path):
+    """Menjalankan scan_buffer pada file yang dipetakan ke memori."""
+    with mapped_file(file_path) as buf:
+        return scan_buffer(buf)
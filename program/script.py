@@ -0,0 +1,90 @@
+import os
+import re
+
+from program import spans
+
+SCRIPT_EXTENSIONS = (".kts",)
+# Deklarasi tipe di kolom pertama (tingkat teratas), dengan modifier opsional
+TOP_LEVEL_TYPE = re.compile(r"^(?:[a-z]+[ \t]+)*(?:class|object|interface)[ \t]+\w", re.M)
+# Nama blok dari baris header: `android {`, `tasks.register("x") {`, `fun foo() {`
+BLOCK_NAME = re.compile(r"^[ \t]*(?:(?:[a-z]+[ \t]+)*fun[ \t]+(?:<[^>\n]*>[ \t]*)?)?([\w.]+)")
+FUNCTION_NAME = re.compile(r"\bfun\s+(?:<[^>]*>\s*)?([\w.]+)\s*\(")
+BRANCH = re.compile(r"\b(?:if|for|while|when|catch)\b|&&|\|\|")
+PACKAGE = re.compile(r"^[ \t]*package[ \t]+([\w.]+)", re.M)
+
+
+def is_plain_script(file_name, code):
+    """File .kts tanpa deklarasi kelas tingkat atas (mis. build.gradle.kts)."""
+    return file_name.lower().endswith(SCRIPT_EXTENSIONS) and not TOP_LEVEL_TYPE.search(code)
+
+
+def _block_name(header):
+    """Nama blok tingkat atas dari teks sebelum `{` pembukanya."""
+    last_line = header.rstrip().rsplit("\n", 1)[-1]
+    match = BLOCK_NAME.match(last_line)
+    if match:
+        return match.group(1)
+    # Header multi-baris (`fun f(\n a: Int\n) {`): ambil deklarasi fun terakhir
+    functions = FUNCTION_NAME.findall(header)
+    return functions[-1] if functions else "<block>"
+
+
+def top_level_blocks(code):
+    """
+    Blok `{ ... }` tingkat atas dalam skrip, sebagai (nama, teks blok).
+    String dan komentar dilewati oleh tokenizer kurung kurawal yang sama
+    dengan spans.block_end.
+    """
+    blocks = []
+    boundary = 0
+    position = 0
+    while True:
+        match = spans.BRACE_TOKEN.search(code, position)
+        if match is None:
+            return blocks
+        if match.group() != "{":
+            position = match.end()
+            continue
+        start = match.start()
+        end = spans.block_end(code, start)
+        blocks.append((_block_name(code[boundary:start]), code[start:end]))
+        boundary = position = end
+
+
+def _max_depth(block):
+    """Kedalaman kurung kurawal terdalam di dalam blok (blok itu sendiri = 0)."""
+    depth = max_depth = 0
+    for match in spans.BRACE_TOKEN.finditer(block):
+        token = match.group()
+        if token == "{":
+            depth += 1
+            max_depth = max(max_depth, depth)
+        elif token == "}":
+            depth -= 1
+    return max(max_depth - 1, 0)
+
+
+def analyze_script(file_path, code):
+    """Metrik per blok tingkat atas untuk skrip tanpa kelas, tanpa parser AST."""
+    package_match = PACKAGE.search(code)
+    package_name = package_match.group(1) if package_match else "Unknown"
+    script_name = os.path.basename(file_path)
+
+    blocks = top_level_blocks(code)
+    if not blocks:
+        return [{"Package": package_name, "Class": script_name, "Method": "None", "LOC": 0, "Max Nesting": 0, "CC": 0, "WOC": 0, "Error": "No blocks found"}]
+
+    cc_values = [len(BRANCH.findall(block)) + 1 for _, block in blocks]
+    total_cc = sum(cc_values)
+    return [
+        {
+            "Package": package_name,
+            "Class": script_name,
+            "Method": name,
+            "LOC": block.count("\n") + 1,
+            "Max Nesting": _max_depth(block),
+            "CC": cc,
+            "WOC": cc / total_cc if total_cc else 0,
+        }
+        for (name, block), cc in zip(blocks, cc_values)
+    ]
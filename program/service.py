@@ -0,0 +1,291 @@
+"""
+Service HTTP/JSON lokal di atas inti analisis, dengan pool worker yang tetap hangat.
+
+Menjalankan:
+    python -m program.service --port 8765 --workers 4 [--rules rules.json]
+
+Endpoint:
+    POST /analyze/archive?name=proyek.zip   body = bytes arsip (ZIP/RAR/7z/tar)
+    POST /analyze/files                     body = {"files": {"path/A.kt": "isi", ...}}
+    GET  /metrics                           latensi per endpoint (p50/p95/p99)
+    GET  /health
+"""
+import argparse
+import json
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib import error, parse, request
+
+import numpy as np
+
+from program import controller
+from program import rules
+
+# Batas ukuran body permintaan (byte)
+MAX_BODY = 256 * 1024 * 1024
+# Jumlah sampel latensi terakhir yang disimpan per endpoint
+LATENCY_WINDOW = 1024
+# Potongan kode kecil untuk memanaskan parser kopyt di setiap worker
+WARM_UP_SOURCE = "package warm\n\nclass Warm {\n    fun run(x: Int): Int {\n        if (x > 0) return x\n        return 0\n    }\n}\n"
+
+
+def warm_worker(extra_rules=None):
+    """Initializer worker: impor dan jalankan parser sekali agar permintaan pertama tidak membayar biayanya."""
+    rules.activate(extra_rules)
+    controller.analyze_member(("Warm.kt", WARM_UP_SOURCE.encode("utf-8")))
+
+
+def _ping():
+    return os.getpid()
+
+
+class LatencyStats:
+    """Pencatat latensi per endpoint (jendela geser) dan penghitung penolakan."""
+
+    def __init__(self, window=LATENCY_WINDOW):
+        self._lock = threading.Lock()
+        self._window = window
+        self._samples = {}  # endpoint -> deque latensi (ms)
+        self._counts = {}  # endpoint -> (jumlah, error)
+        self.rejected = 0
+
+    def record(self, endpoint, latency_ms, failed=False):
+        with self._lock:
+            self._samples.setdefault(endpoint, deque(maxlen=self._window)).append(latency_ms)
+            count, errors = self._counts.get(endpoint, (0, 0))
+            self._counts[endpoint] = (count + 1, errors + int(failed))
+
+    def reject(self):
+        with self._lock:
+            self.rejected += 1
+
+    def summary(self):
+        with self._lock:
+            samples = {endpoint: list(values) for endpoint, values in self._samples.items()}
+            counts = dict(self._counts)
+            rejected = self.rejected
+
+        endpoints = {}
+        for endpoint, values in samples.items():
+            p50, p95, p99 = np.percentile(values, [50, 95, 99])
+            endpoints[endpoint] = {
+                "count": counts[endpoint][0],
+                "errors": counts[endpoint][1],
+                "p50_ms": round(float(p50), 3),
+                "p95_ms": round(float(p95), 3),
+                "p99_ms": round(float(p99), 3),
+                "max_ms": round(float(max(values)), 3),
+            }
+        return {"endpoints": endpoints, "rejected": rejected}
+
+
+def frame_to_records(df):
+    """DataFrame hasil analisis menjadi list dict yang aman untuk JSON (NaN -> null)."""
+    return df.astype(object).where(df.notna(), None).to_dict(orient="records")
+
+
+class AnalysisServer(ThreadingHTTPServer):
+    """
+    Server HTTP berthread dengan pool proses analisis yang dibuat sekali.
+
+    Kapasitas = permintaan analisis yang boleh berjalan/antre bersamaan;
+    permintaan berikutnya langsung ditolak 503 + Retry-After (backpressure),
+    bukan ditumpuk tanpa batas. Jika sebuah worker mati (OOM, segfault),
+    pool yang rusak diganti dengan pool baru yang hangat.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, address, workers=None, queue_size=None, extra_rules=None):
+        super().__init__(address, AnalysisHandler)
+        self.workers = workers or os.cpu_count() or 1
+        self.capacity = queue_size or self.workers * 2
+        self.slots = threading.BoundedSemaphore(self.capacity)
+        self.stats = LatencyStats()
+        self.in_flight = 0
+        self._in_flight_lock = threading.Lock()
+        self.extra_rules = extra_rules
+        self.pool_restarts = 0
+        self._pool_lock = threading.Lock()
+        self.pool = self._start_pool()
+
+    def _start_pool(self):
+        pool = ProcessPoolExecutor(
+            max_workers=self.workers, initializer=warm_worker, initargs=(self.extra_rules,)
+        )
+        # Menyalakan semua worker sekarang, bukan saat permintaan pertama datang
+        for future in [pool.submit(_ping) for _ in range(self.workers)]:
+            future.result()
+        return pool
+
+    def restart_pool(self, broken):
+        """
+        Mengganti `broken` dengan pool baru. Permintaan lain yang melihat pool
+        rusak yang sama memakai pengganti yang sudah dibuat, bukan membuat lagi.
+        """
+        with self._pool_lock:
+            if self.pool is broken:
+                broken.shutdown(wait=False, cancel_futures=True)
+                self.pool = self._start_pool()
+                self.pool_restarts += 1
+            return self.pool
+
+    def acquire(self):
+        if not self.slots.acquire(blocking=False):
+            self.stats.reject()
+            return False
+        with self._in_flight_lock:
+            self.in_flight += 1
+        return True
+
+    def release(self):
+        with self._in_flight_lock:
+            self.in_flight -= 1
+        self.slots.release()
+
+    def server_close(self):
+        super().server_close()
+        self.pool.shutdown(cancel_futures=True)
+
+
+class AnalysisHandler(BaseHTTPRequestHandler):
+    server_version = "KotlinMetrics/1.0"
+
+    def log_message(self, format, *args):
+        pass  # Latensi sudah dicatat di /metrics; log per permintaan tidak perlu
+
+    def _send_json(self, status, payload, headers=None):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _read_body(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        if length > MAX_BODY:
+            raise ValueError(f"Request body larger than {MAX_BODY} bytes")
+        return self.rfile.read(length)
+
+    def _analyze(self, url, body, pool):
+        if url.path == "/analyze/archive":
+            name = parse.parse_qs(url.query).get("name", ["upload.zip"])[0]
+            return controller.parse_archive(body, name, workers=self.server.workers, executor=pool)
+        files = json.loads(body or b"{}").get("files", {})
+        members = [(name, source.encode("utf-8")) for name, source in files.items()]
+        return controller.analyze_members(
+            members, workers=self.server.workers, executor=pool
+        ).drop(columns="Member Index", errors="ignore")
+
+    def do_GET(self):
+        path = parse.urlsplit(self.path).path
+        if path == "/health":
+            self._send_json(200, {"status": "ok", "workers": self.server.workers})
+        elif path == "/metrics":
+            self._send_json(200, {
+                **self.server.stats.summary(),
+                "in_flight": self.server.in_flight,
+                "capacity": self.server.capacity,
+                "workers": self.server.workers,
+                "pool_restarts": self.server.pool_restarts,
+            })
+        else:
+            self._send_json(404, {"error": f"Unknown endpoint {path}"})
+
+    def do_POST(self):
+        url = parse.urlsplit(self.path)
+        if url.path not in ("/analyze/archive", "/analyze/files"):
+            self._send_json(404, {"error": f"Unknown endpoint {url.path}"})
+            return
+        if not self.server.acquire():
+            self._send_json(503, {"error": "Analysis queue is full"}, {"Retry-After": "1"})
+            return
+
+        started = time.perf_counter()
+        status = 200
+        pool = self.server.pool
+        try:
+            try:
+                body = self._read_body()
+                try:
+                    df = self._analyze(url, body, pool)
+                except BrokenProcessPool:
+                    # Worker mati (mungkin karena permintaan lain): coba sekali lagi di pool baru
+                    pool = self.server.restart_pool(pool)
+                    df = self._analyze(url, body, pool)
+                payload = {"rows": frame_to_records(df)}
+            except BrokenProcessPool as e:
+                self.server.restart_pool(pool)
+                status, payload = 500, {"error": f"Analysis worker died: {e}"}
+            except (ValueError, AttributeError) as e:
+                # Body bukan JSON/arsip yang valid
+                status, payload = 400, {"error": str(e)}
+            except Exception as e:
+                status, payload = 500, {"error": str(e)}
+
+            latency_ms = (time.perf_counter() - started) * 1000
+            self.server.stats.record(url.path, latency_ms, failed=status != 200)
+            payload["latency_ms"] = round(latency_ms, 3)
+            self._send_json(status, payload, {"X-Latency-Ms": f"{latency_ms:.3f}"})
+        finally:
+            self.server.release()
+
+
+def serve(host="127.0.0.1", port=8765, workers=None, queue_size=None, extra_rules=None):
+    """Membuat server (port 0 = port bebas); panggil serve_forever() untuk menjalankannya."""
+    return AnalysisServer((host, port), workers, queue_size, extra_rules)
+
+
+def call(base_url, path, data=None, params=None, timeout=300):
+    """
+    Klien lokal sederhana (stdlib saja): dict dikirim sebagai JSON, bytes apa
+    adanya. Mengembalikan (status HTTP, JSON respons).
+    """
+    url = base_url.rstrip("/") + path
+    if params:
+        url += "?" + parse.urlencode(params)
+    headers = {}
+    if isinstance(data, dict):
+        data = json.dumps(data).encode("utf-8")
+        headers["Content-Type"] = "application/json"
+    req = request.Request(url, data=data, headers=headers, method="POST" if data is not None else "GET")
+    try:
+        with request.urlopen(req, timeout=timeout) as response:
+            return response.status, json.loads(response.read())
+    except error.HTTPError as e:
+        return e.code, json.loads(e.read() or b"{}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m program.service", description="Local metrics analysis service.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--workers", type=int, help="worker processes kept warm (default: CPU count)")
+    parser.add_argument("--queue", type=int, help="concurrent analysis requests accepted (default: 2 x workers)")
+    parser.add_argument("--rules", help="JSON file with additional metric rules (see program.rules)")
+    args = parser.parse_args(argv)
+
+    try:
+        extra_rules = rules.load_rules(args.rules) if args.rules else None
+    except (OSError, ValueError) as e:
+        parser.error(str(e))
+    server = serve(args.host, args.port, args.workers, args.queue, extra_rules)
+    print(f"Serving on http://{server.server_address[0]}:{server.server_address[1]} with {server.workers} workers")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
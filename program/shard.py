@@ -0,0 +1,296 @@
+"""
+Analisis terbagi (shard) untuk repositori yang terlalu besar bagi satu mesin.
+
+Setiap node menganalisis bagiannya sendiri dan menulis file parsial
+(manifest JSON ditambah baris metrik dalam Parquet di sebelahnya):
+    python -m program.shard run --shard 0 --shards 4 --output part-0.json repo/
+Lalu semua parsial digabung menjadi laporan akhir:
+    python -m program.shard merge --output report/ part-*.json
+
+Laporan gabungan identik byte per byte berapa pun jumlah shard-nya.
+"""
+import argparse
+import hashlib
+import json
+import numbers
+import os
+
+import pandas as pd
+
+try:
+    # Baris metrik parsial disimpan sebagai Parquet
+    import pyarrow.parquet as pq
+except ImportError:  # dependensi opsional
+    pq = None
+
+from program import aggregate
+from program import archive
+from program import controller
+from program import dependencies
+from program import ignore
+from program import languages
+from program import patterns
+from program import rules
+from program import scan
+
+# Naikkan jika isi file parsial berubah; merge menolak parsial versi lain
+PARTIAL_FORMAT = 3
+
+
+def shard_of(path, shards):
+    """
+    Nomor shard untuk path relatif (pemisah `/`). Memakai blake2b, bukan
+    hash() Python, agar pembagian sama di setiap mesin dan proses.
+    """
+    digest = hashlib.blake2b(path.encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "big") % shards
+
+
+def shard_files(directory, shard, shards, excludes=None):
+    """Path relatif file sumber milik satu shard, terurut."""
+    extensions = languages.source_extensions(controller.PLUGINS)
+    files = []
+    for root, name in ignore.walk(directory, extensions, excludes):
+        path = os.path.relpath(os.path.join(root, name), directory).replace(os.sep, "/")
+        if shard_of(path, shards) == shard:
+            files.append(path)
+    return sorted(files)
+
+
+def run_shard(directory, shard, shards, workers=None, excludes=None):
+    """
+    Menganalisis satu shard: baris metrik per metode (plugin bahasa, sama
+    dengan analisis arsip) ditambah kolom Path, serta indeks dependensi per
+    file Kotlin untuk metrik kopling yang dihitung ulang saat merge.
+    """
+    if not 0 <= shard < shards:
+        raise ValueError(f"shard must be in [0, {shards})")
+
+    paths = shard_files(directory, shard, shards, excludes)
+    members = []
+    dependency_index = []
+    for path in paths:
+        data = scan.read_bytes(os.path.join(directory, path))
+        members.append((path, data))
+        if path.lower().endswith(archive.KOTLIN_EXTENSIONS):
+            content = scan.decode_source(data)
+            package_match = patterns.PACKAGE.search(content)
+            package = package_match.group(1) if package_match else "default"
+            dependency_index.append((path, dependencies.index_file(content, package)))
+
+    rows = controller.analyze_members(members, workers=workers)
+    if not rows.empty:
+        rows.insert(0, "Path", [paths[index] for index in rows["Member Index"]])
+        rows = normalize_rows(rows.drop(columns="Member Index"))
+    return {
+        "format": PARTIAL_FORMAT,
+        "shard": shard,
+        "shards": shards,
+        "files": paths,
+        "rows": rows,
+        "dependencies": dependency_index,
+    }
+
+
+def _is_number(value):
+    return isinstance(value, numbers.Number) and not isinstance(value, bool)
+
+
+def normalize_rows(rows):
+    """
+    Dtype baku untuk baris metrik, agar hasil tidak bergantung pada cara
+    baris dibagi ke shard atau ke jalur berurutan/paralel. Kolom teks yang
+    berisi angka (mis. penanda "Error" di kolom metrik) menjadi kolom angka
+    dengan null untuk teksnya; kolom teks lain memakai None untuk nilai
+    kosong. Kolom angka dibiarkan: int + NaN sudah dipromosikan ke float
+    dengan cara yang sama saat parsial digabung.
+    """
+    columns = {}
+    for name in rows.columns:
+        values = rows[name]
+        if pd.api.types.is_numeric_dtype(values) or pd.api.types.is_bool_dtype(values):
+            columns[name] = values
+            continue
+        is_number = values.map(_is_number).astype(bool)
+        if is_number.any():
+            columns[name] = pd.to_numeric(values.where(is_number).astype(object), errors="coerce")
+        else:
+            columns[name] = values.astype(object).where(values.notna(), None)
+    return pd.DataFrame(columns, index=rows.index)
+
+
+def _rows_path(output):
+    return os.path.splitext(output)[0] + ".parquet"
+
+
+def write_partial(partial, output):
+    """
+    Menyimpan parsial: baris metrik sebagai Parquet dan sisanya sebagai
+    manifest JSON di `output`. Set referensi tipe ditulis sebagai list urut
+    agar manifest deterministik.
+    """
+    if pq is None:
+        raise ValueError("Writing partial results needs pyarrow (Parquet)")
+    rows_path = _rows_path(output)
+    partial["rows"].to_parquet(rows_path, index=False)
+    manifest = {
+        "format": partial["format"],
+        "shard": partial["shard"],
+        "shards": partial["shards"],
+        "files": partial["files"],
+        "rows": os.path.basename(rows_path),
+        "row_count": len(partial["rows"]),
+        "dependencies": [
+            [path, {**record, "references": {
+                class_name: sorted(references) for class_name, references in record["references"].items()
+            }}]
+            for path, record in partial["dependencies"]
+        ],
+    }
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=1, sort_keys=True)
+
+
+def read_partial(path):
+    """Membaca satu parsial (manifest JSON dan Parquet yang dirujuknya)."""
+    if pq is None:
+        raise ValueError("Reading partial results needs pyarrow (Parquet)")
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+    except (OSError, json.JSONDecodeError) as e:
+        raise ValueError(f"{path}: not a partial manifest ({e})")
+    if not isinstance(manifest, dict) or manifest.get("format") != PARTIAL_FORMAT:
+        found = manifest.get("format") if isinstance(manifest, dict) else None
+        raise ValueError(f"{path}: unsupported partial format {found}")
+
+    rows_path = os.path.join(os.path.dirname(path), manifest["rows"])
+    try:
+        rows = pd.read_parquet(rows_path)
+    except OSError as e:
+        raise ValueError(f"{path}: cannot read rows ({e})")
+    if len(rows) != manifest["row_count"]:
+        raise ValueError(f"{path}: expected {manifest['row_count']} rows, found {len(rows)}")
+    manifest["rows"] = rows
+    manifest["dependencies"] = [
+        (record_path, {**record, "references": {
+            class_name: set(references) for class_name, references in record["references"].items()
+        }})
+        for record_path, record in manifest["dependencies"]
+    ]
+    return manifest
+
+
+def load_partials(paths):
+    """Membaca dan memvalidasi parsial: format sama, N sama, setiap shard tepat sekali."""
+    partials = [read_partial(path) for path in paths]
+    if not partials:
+        raise ValueError("No partial results given")
+
+    shards = {partial["shards"] for partial in partials}
+    if len(shards) != 1:
+        raise ValueError(f"Partials were produced with different shard counts: {sorted(shards)}")
+    shards = shards.pop()
+    ids = sorted(partial["shard"] for partial in partials)
+    if ids != list(range(shards)):
+        missing = sorted(set(range(shards)) - set(ids))
+        duplicates = sorted({shard for shard in ids if ids.count(shard) > 1})
+        raise ValueError(f"Incomplete shard set: missing {missing}, duplicated {duplicates}")
+    return partials
+
+
+def merge_partials(partials):
+    """
+    Menggabungkan parsial menjadi laporan akhir. Urutan baris ditentukan
+    oleh path (bukan urutan parsial), lalu agregat lintas file dihitung
+    ulang: WOC per kelas, rollup proyek/paket/kelas, dan kopling.
+    """
+    frames = [partial["rows"] for partial in partials if not partial["rows"].empty]
+    rows = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+    if not rows.empty:
+        rows = normalize_rows(rows)
+        # Sort stabil: urutan baris di dalam satu file tetap
+        rows = rows.sort_values("Path", kind="stable", ignore_index=True)
+        rows["WOC"] = aggregate.normalize_woc(rows)
+
+    records = sorted(
+        (item for partial in partials for item in partial["dependencies"]), key=lambda item: item[0]
+    )
+    coupling = dependencies.analyze_dependencies([record for _, record in records])
+
+    report = {
+        "methods": rows,
+        "files": sum(len(partial["files"]) for partial in partials),
+        "class_cycles": coupling["class_cycles"],
+        "package_cycles": coupling["package_cycles"],
+    }
+    if rows.empty:
+        report.update(project={}, packages=coupling["packages"], classes=coupling["classes"])
+        return report
+
+    rollups = aggregate.aggregate_metrics(rows)
+    class_coupling = coupling["classes"].drop_duplicates(subset=aggregate.CLASS_KEYS)
+    report["project"] = rollups["project"]
+    report["classes"] = rollups["classes"].merge(class_coupling, on=aggregate.CLASS_KEYS, how="left")
+    report["packages"] = rollups["packages"].merge(coupling["packages"], on="Package", how="left")
+    return report
+
+
+def write_report(report, output_dir):
+    """Menulis laporan gabungan sebagai CSV per tabel dan ringkasan JSON."""
+    os.makedirs(output_dir, exist_ok=True)
+    for name in ("methods", "classes", "packages"):
+        report[name].to_csv(os.path.join(output_dir, f"{name}.csv"), index=False)
+    summary = {
+        "files": report["files"],
+        "project": report["project"],
+        "class_cycles": report["class_cycles"],
+        "package_cycles": report["package_cycles"],
+    }
+    with open(os.path.join(output_dir, "project.json"), "w", encoding="utf-8") as f:
+        json.dump(summary, f, indent=2, default=str)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m program.shard", description="Sharded analysis and merge.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run = commands.add_parser("run", help="analyze one shard and write a partial result")
+    run.add_argument("directory")
+    run.add_argument("--shard", type=int, required=True)
+    run.add_argument("--shards", type=int, required=True)
+    run.add_argument("--output", required=True)
+    run.add_argument("--workers", type=int)
+    run.add_argument("--exclude", action="append", help=".gitignore-style pattern to skip (repeatable)")
+    run.add_argument("--rules", help="JSON file with additional metric rules (see program.rules)")
+
+    merge = commands.add_parser("merge", help="merge partial results into the final report")
+    merge.add_argument("partials", nargs="+")
+    merge.add_argument("--output", required=True, help="report directory")
+
+    args = parser.parse_args(argv)
+    if args.command == "run":
+        excludes = list(ignore.DEFAULT_EXCLUDES) + args.exclude if args.exclude else None
+        if args.rules:
+            try:
+                rules.activate(rules.load_rules(args.rules))
+            except (OSError, ValueError) as e:
+                parser.error(str(e))
+        partial = run_shard(args.directory, args.shard, args.shards, args.workers, excludes)
+        try:
+            write_partial(partial, args.output)
+        except ValueError as e:
+            parser.error(str(e))
+        print(f"shard {args.shard}/{args.shards}: {len(partial['files'])} files, {len(partial['rows'])} rows")
+    else:
+        try:
+            partials = load_partials(args.partials)
+        except ValueError as e:
+            parser.error(str(e))
+        report = merge_partials(partials)
+        write_report(report, args.output)
+        print(f"merged {len(args.partials)} partials: {report['files']} files, {len(report['methods'])} rows")
+
+
+if __name__ == "__main__":
+    main()
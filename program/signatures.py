@@ -0,0 +1,51 @@
+from kopyt import node
+
+# Pembungkus tipe yang dibuka untuk menemukan tipe fungsi: `((Int) -> Unit)?`
+TYPE_WRAPPERS = (node.Type, node.NullableType, node.ParenthesizedType)
+# Ambang smell "too many parameters" (Long Parameter List)
+TOO_MANY_PARAMETERS = 5
+SIGNATURE_COLUMNS = (
+    "Parameters",
+    "Default Parameters",
+    "Lambda Parameters",
+    "Receiver",
+    "Suspend",
+    "Inline",
+)
+
+
+def is_function_type(type_node):
+    """True jika tipe parameter adalah tipe fungsi (lambda), termasuk yang nullable."""
+    while isinstance(type_node, TYPE_WRAPPERS):
+        type_node = type_node.subtype
+    return isinstance(type_node, node.FunctionType)
+
+
+def function_signature(function_declaration):
+    """Indeks signature sebuah FunctionDeclaration dari AST yang sudah di-parse."""
+    parameters = function_declaration.parameters or []
+    modifiers = function_declaration.modifiers or []
+    receiver = function_declaration.receiver
+    return {
+        "Parameters": len(parameters),
+        "Default Parameters": sum(1 for parameter in parameters if parameter.default is not None),
+        "Lambda Parameters": sum(
+            1 for parameter in parameters if is_function_type(parameter.parameter.type)
+        ),
+        "Receiver": str(receiver) if receiver is not None else None,
+        "Suspend": int("suspend" in modifiers),
+        "Inline": int("inline" in modifiers),
+    }
+
+
+def too_many_parameters(df, threshold=TOO_MANY_PARAMETERS):
+    """Baris metode dengan parameter lebih dari `threshold` (filter tervektorisasi)."""
+    if "Parameters" not in df.columns:
+        return df.iloc[0:0]
+    columns = [
+        column
+        for column in ("Language", "Package", "Class", "Method") + SIGNATURE_COLUMNS
+        if column in df.columns
+    ]
+    flagged = df[df["Parameters"] > threshold]
+    return flagged[columns].sort_values("Parameters", ascending=False)
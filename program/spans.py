@@ -0,0 +1,75 @@
+import re
+
+LINE_BREAK = re.compile(r"\r\n?|\n")
+# Token yang relevan untuk mencocokkan kurung kurawal: string, komentar, dan { }
+BRACE_TOKEN = re.compile(
+    r'"""[\s\S]*?"""|"(?:\\.|[^"\\\n])*"|\'(?:\\.|[^\'\\\n])*\''
+    r"|//[^\n]*|/\*[\s\S]*?\*/|[{}]"
+)
+# Komentar pada baris sendiri di akhir irisan (milik deklarasi berikutnya)
+TRAILING_COMMENTS = re.compile(r"(?:\n[ \t]*(?://[^\n]*|/\*[\s\S]*?\*/)[ \t]*)+\Z")
+
+
+def line_starts(code):
+    """Offset awal setiap baris (baris 1 di indeks 0), dihitung sekali per file."""
+    return [0] + [match.end() for match in LINE_BREAK.finditer(code)]
+
+
+def offset_of(starts, position):
+    """Mengubah Position kopyt (baris/kolom mulai dari 1) menjadi offset karakter."""
+    return starts[position.line - 1] + position.column - 1
+
+
+def block_end(code, start):
+    """Offset setelah `}` penutup untuk blok yang dimulai dengan `{` di `start`."""
+    depth = 0
+    for match in BRACE_TOKEN.finditer(code, start):
+        token = match.group()
+        if token == "{":
+            depth += 1
+        elif token == "}":
+            depth -= 1
+            if depth == 0:
+                return match.end()
+    return len(code)
+
+
+def member_sources(code, class_body, members):
+    """
+    Mengiris teks asli badan setiap anggota kelas, satu irisan per anggota.
+
+    Badan blok dipotong pada `}` penutupnya; badan ekspresi (`= ...`)
+    berakhir tepat sebelum deklarasi anggota berikutnya atau penutup kelas.
+    Mengembalikan list (teks atau None) sejajar dengan `members`.
+    """
+    starts = line_starts(code)
+    class_end = block_end(code, offset_of(starts, class_body.position)) - 1
+    return _body_sources(code, starts, members, class_end)
+
+
+def declaration_sources(code, declarations):
+    """
+    Seperti member_sources, untuk deklarasi tingkat atas file: badan ekspresi
+    deklarasi terakhir berakhir di akhir file.
+    """
+    return _body_sources(code, line_starts(code), declarations, len(code))
+
+
+def _body_sources(code, starts, members, end_of_scope):
+    member_starts = [offset_of(starts, member.position) for member in members]
+
+    sources = []
+    for index, member in enumerate(members):
+        body = getattr(member, "body", None)
+        if body is None:
+            sources.append(None)
+            continue
+        start = offset_of(starts, body.position)
+        if code.startswith("{", start):
+            end = block_end(code, start)
+        else:
+            end = member_starts[index + 1] if index + 1 < len(members) else end_of_scope
+            sources.append(TRAILING_COMMENTS.sub("", code[start:end].rstrip()))
+            continue
+        sources.append(code[start:end])
+    return sources
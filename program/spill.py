@@ -0,0 +1,275 @@
+import os
+import pickle
+import shutil
+import sys
+import tempfile
+import weakref
+
+import pandas as pd
+
+try:
+    # Potongan hasil jalur paralel berupa tabel Arrow (lihat transport)
+    import pyarrow as pa
+except ImportError:  # dependensi opsional
+    pa = None
+
+# Anggaran memori bawaan (byte) untuk baris/indeks yang dikumpulkan sebelum ditumpahkan ke disk
+MEMORY_BUDGET = 256 * 1024 * 1024
+# Ukuran item diukur penuh untuk SIZE_SAMPLE_MIN item pertama, lalu setiap
+# SIZE_SAMPLE_EVERY item; item lain memakai rata-rata sampel
+SIZE_SAMPLE_MIN = 32
+SIZE_SAMPLE_EVERY = 32
+# Bagian anggaran SpillGroup yang boleh dipakai memori di luar list (cache)
+RESERVE_SHARE = 0.5
+
+
+def estimate_size(value, depth=0):
+    """
+    Perkiraan kasar ukuran objek Python (byte), termasuk isi dict/list/set
+    sampai tiga tingkat. Cukup untuk menentukan kapan harus menumpahkan data.
+    """
+    size = sys.getsizeof(value)
+    if depth >= 3:
+        return size
+    if isinstance(value, dict):
+        return size + sum(estimate_size(item, depth + 1) for item in value.values())
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return size + sum(estimate_size(item, depth + 1) for item in value)
+    return size
+
+
+def _spill_directory(owner, directory):
+    """Direktori sementara yang dihapus saat `owner` dibuang, juga jika close() tidak dipanggil."""
+    path = tempfile.mkdtemp(prefix="spill-", dir=directory)
+    return path, weakref.finalize(owner, shutil.rmtree, path, True)
+
+
+class SpillGroup:
+    """
+    Anggaran memori bersama untuk beberapa SpillList (mis. daftar kelas,
+    fungsi, dan properti per paket). Saat perkiraan ukuran semua item di
+    memori melewati anggaran, isi setiap list ditulis ke satu run bersama;
+    tiap list mencatat offset bagiannya, jadi membaca satu list hanya
+    membaca bagian miliknya.
+
+    Ukuran item diperkirakan dari sampel (lihat SIZE_SAMPLE_EVERY) agar
+    append tetap murah untuk item besar seperti baris dict. Memori lain yang
+    hidup bersama list (mis. cache dedup) dibebankan lewat reserve(), jadi
+    jumlah keduanya dibatasi satu anggaran yang sama.
+    """
+
+    def __init__(self, budget=None, directory=None):
+        self.budget = MEMORY_BUDGET if budget is None else budget
+        self._directory = directory
+        self._lists = []
+        self._size = 0
+        self._reserved = 0
+        self._seen = 0
+        self._sampled = 0
+        self._sampled_size = 0
+        self._run_count = 0
+        self._spill_dir = None
+
+    def new_list(self):
+        return SpillList(group=self)
+
+    def _estimate(self, item):
+        self._seen += 1
+        if self._sampled < SIZE_SAMPLE_MIN or self._seen % SIZE_SAMPLE_EVERY == 0:
+            self._sampled += 1
+            self._sampled_size += estimate_size(item)
+        return self._sampled_size / self._sampled
+
+    def _added(self, item):
+        self._size += self._estimate(item)
+        if self._size + self._reserved > self.budget:
+            self.spill()
+
+    def reserve(self, size):
+        """
+        Membebankan `size` byte memori di luar list ke anggaran. Ditolak
+        (False) jika total cadangan melewati RESERVE_SHARE dari anggaran;
+        sisanya tetap untuk list, yang ditumpahkan lebih awal bila perlu.
+        """
+        if self._reserved + size > self.budget * RESERVE_SHARE:
+            return False
+        self._reserved += size
+        if self._size + self._reserved > self.budget:
+            self.spill()
+        return True
+
+    def spill(self):
+        """Menulis isi memori semua list anggota ke satu run di disk."""
+        if self._spill_dir is None:
+            self._spill_dir, self._finalizer = _spill_directory(self, self._directory)
+        path = os.path.join(self._spill_dir, f"run-{self._run_count:06d}.pickle")
+        self._run_count += 1
+        with open(path, "wb") as f:
+            for items in self._lists:
+                if items._items:
+                    items._runs.append((path, f.tell()))
+                    pickle.dump(items._items, f, protocol=pickle.HIGHEST_PROTOCOL)
+                    items._items = []
+        self._size = 0
+
+    def close(self):
+        if self._spill_dir is not None:
+            self._finalizer()
+            self._spill_dir = None
+        for items in self._lists:
+            items._runs = []
+            items._items = []
+        self._size = 0
+        self._reserved = 0
+
+
+class SpillList:
+    """
+    List append-only dengan anggaran memori. Saat perkiraan ukuran item di
+    memori melewati anggaran, item ditulis sebagai satu run (pickle) ke
+    direktori sementara dan memori dikosongkan. Iterasi membaca run secara
+    berurutan lalu sisa di memori, sehingga urutan append tetap terjaga.
+
+    Tanpa `group`, list memiliki SpillGroup sendiri dengan anggaran `budget`.
+    """
+
+    def __init__(self, budget=None, directory=None, group=None):
+        self._owns_group = group is None
+        self._group = SpillGroup(budget, directory) if group is None else group
+        self._group._lists.append(self)
+        self.budget = self._group.budget
+        self._items = []
+        self._length = 0
+        self._runs = []
+
+    def append(self, item):
+        self._items.append(item)
+        self._length += 1
+        self._group._added(item)
+
+    def extend(self, items):
+        for item in items:
+            self.append(item)
+
+    def runs(self):
+        """Menghasilkan item per run (list), dari disk lalu sisa di memori."""
+        for path, offset in self._runs:
+            with open(path, "rb") as f:
+                f.seek(offset)
+                yield pickle.load(f)
+        if self._items:
+            yield self._items
+
+    def __iter__(self):
+        for run in self.runs():
+            yield from run
+
+    def __len__(self):
+        return self._length
+
+    @property
+    def spilled(self):
+        """Jumlah run yang sudah ditulis ke disk."""
+        return len(self._runs)
+
+    def to_frame(self, columns=None):
+        """
+        DataFrame dari semua baris dict. Setiap run diubah menjadi DataFrame
+        sendiri sebelum digabung, jadi dict yang hidup bersamaan hanya satu run.
+        """
+        frames = [pd.DataFrame(run, columns=columns) for run in self.runs()]
+        if not frames:
+            return pd.DataFrame(columns=columns)
+        if len(frames) == 1:
+            return frames[0]
+        # Run dengan kolom yang seluruhnya kosong menjadi object; infer_objects
+        # mengembalikan dtype yang sama dengan DataFrame dari semua baris sekaligus
+        return pd.concat(frames, ignore_index=True).infer_objects()
+
+    def close(self):
+        if self._owns_group:
+            self._group.close()
+        self._runs = []
+        self._items = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def part_size(part):
+    """Ukuran di memori satu potongan (tabel Arrow atau DataFrame), dalam byte."""
+    if pa is not None and isinstance(part, pa.Table):
+        return part.nbytes
+    return int(part.memory_usage(index=False).sum())
+
+
+class SpillParts:
+    """
+    Potongan hasil bernomor (tabel Arrow atau DataFrame) yang datang tidak
+    berurutan, mis. dari worker paralel, dengan anggaran memori. Melewati
+    anggaran, potongan di memori ditulis ke disk: tabel sebagai file Arrow
+    IPC yang dibaca kembali lewat memory map (tanpa salinan), DataFrame
+    sebagai pickle. parts() menghasilkan semuanya urut nomor.
+    """
+
+    def __init__(self, budget=None, directory=None):
+        self.budget = MEMORY_BUDGET if budget is None else budget
+        self._directory = directory
+        self._parts = {}
+        self._paths = {}
+        self._size = 0
+        self._spill_dir = None
+
+    def put(self, index, part):
+        self._parts[index] = part
+        self._size += part_size(part)
+        if self._size > self.budget:
+            self._spill()
+
+    def _spill(self):
+        if self._spill_dir is None:
+            self._spill_dir, self._finalizer = _spill_directory(self, self._directory)
+        for index, part in self._parts.items():
+            if pa is not None and isinstance(part, pa.Table):
+                path = os.path.join(self._spill_dir, f"part-{index:06d}.arrow")
+                with pa.OSFile(path, "wb") as sink, pa.ipc.new_file(sink, part.schema) as writer:
+                    writer.write_table(part)
+            else:
+                path = os.path.join(self._spill_dir, f"part-{index:06d}.pickle")
+                part.to_pickle(path)
+            self._paths[index] = path
+        self._parts = {}
+        self._size = 0
+
+    def parts(self):
+        for index in sorted(self._parts.keys() | self._paths.keys()):
+            if index in self._parts:
+                yield self._parts[index]
+            elif self._paths[index].endswith(".arrow"):
+                yield pa.ipc.open_file(pa.memory_map(self._paths[index])).read_all()
+            else:
+                yield pd.read_pickle(self._paths[index])
+
+    def __len__(self):
+        return len(self._parts) + len(self._paths)
+
+    @property
+    def spilled(self):
+        """Jumlah potongan yang sudah ditulis ke disk."""
+        return len(self._paths)
+
+    def close(self):
+        if self._spill_dir is not None:
+            self._finalizer()
+            self._spill_dir = None
+        self._parts = {}
+        self._paths = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
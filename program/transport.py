@@ -0,0 +1,137 @@
+import ctypes
+from multiprocessing import resource_tracker, shared_memory
+
+import pandas as pd
+
+try:
+    # Arrow IPC: hasil worker dikirim sebagai batch kolumnar, bukan list dict
+    import pyarrow as pa
+except ImportError:  # dependensi opsional
+    pa = None
+
+
+def _column(values):
+    """
+    Array Arrow untuk satu kolom. Kolom campuran angka/teks disimpan sebagai
+    angka dan teksnya menjadi null. Baris gagal sendiri sudah memakai None
+    untuk metrik angka, sama seperti DataFrame jalur berurutan.
+    """
+    try:
+        return pa.array(values)
+    except (pa.ArrowInvalid, pa.ArrowTypeError):
+        numeric = pd.to_numeric(pd.Series(values, dtype=object), errors="coerce")
+        if numeric.notna().any():
+            return pa.array(numeric)
+        return pa.array([None if value is None else str(value) for value in values])
+
+
+def rows_to_table(rows):
+    """Mengubah baris dict (kolom bisa berbeda antar baris) menjadi tabel Arrow."""
+    columns = list(dict.fromkeys(key for row in rows for key in row))
+    return pa.table({name: _column([row.get(name) for row in rows]) for name in columns})
+
+
+def _write_stream(table, buf):
+    """Menulis tabel sebagai stream IPC ke buffer tujuan (ukuran sudah pas)."""
+    sink = pa.FixedSizeBufferWriter(pa.py_buffer(buf))
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    sink.close()
+
+
+def _segment_buffer(segment, size):
+    """
+    Buffer Arrow yang menunjuk langsung ke memori segmen, tanpa salinan.
+    Buffer memegang referensi ke segmen (base), jadi pemetaannya tetap hidup
+    selama tabel atau DataFrame hasil konversi masih memakai buffer itu.
+    Alamatnya diambil lewat ctypes, bukan pa.py_buffer(segment.buf), agar
+    memoryview segmen tidak terkunci ekspor saat segmen ditutup nanti.
+    """
+    address = ctypes.addressof(ctypes.c_char.from_buffer(segment.buf))
+    return pa.foreign_buffer(address, size, base=segment)
+
+
+def _read_segment(name, size):
+    """
+    Membaca stream IPC dari shared memory tanpa menyalin isinya. Nama segmen
+    langsung di-unlink: pemetaan yang sudah dibuka tetap berlaku, dan segmen
+    tidak tertinggal di /dev/shm walaupun konversi berikutnya gagal.
+    """
+    segment = shared_memory.SharedMemory(name=name)
+    segment.unlink()
+    return pa.ipc.open_stream(_segment_buffer(segment, size)).read_all()
+
+
+def release(handle):
+    """Melepas segmen milik handle yang tidak akan dibaca (mis. karena potongan lain gagal)."""
+    if handle is None or handle[0] != "shm":
+        return
+    try:
+        segment = shared_memory.SharedMemory(name=handle[1])
+    except FileNotFoundError:
+        return
+    segment.close()
+    segment.unlink()
+
+
+def release_future(future):
+    """Callback Future: melepas segmen hasil potongan yang tidak lagi ditunggu."""
+    if not future.cancelled() and future.exception() is None:
+        release(future.result())
+
+
+def publish(rows):
+    """
+    Dipanggil di worker: menulis baris sebagai stream Arrow IPC langsung ke
+    shared memory dan mengembalikan handle kecil (nama, ukuran) untuk parent.
+    Tanpa pyarrow, baris dikembalikan apa adanya (di-pickle).
+    """
+    if pa is None or not rows:
+        return ("rows", rows)
+
+    table = rows_to_table(rows)
+    sizer = pa.MockOutputStream()
+    with pa.ipc.new_stream(sizer, table.schema) as writer:
+        writer.write_table(table)
+    size = sizer.size()
+
+    segment = shared_memory.SharedMemory(create=True, size=size)
+    # Kepemilikan segmen pindah ke parent (yang melakukan unlink); tanpa ini
+    # resource tracker worker menghapusnya saat worker berhenti
+    resource_tracker.unregister(segment._name, "shared_memory")
+    try:
+        _write_stream(table, segment.buf)
+    finally:
+        segment.close()
+    return ("shm", segment.name, size)
+
+
+def receive(handle):
+    """
+    Dipanggil di parent saat satu potongan selesai: tabel Arrow dari segmen
+    shared memory (segmen langsung dilepas), atau DataFrame untuk baris
+    yang dikirim tanpa pyarrow.
+    """
+    if handle[0] == "shm":
+        return _read_segment(handle[1], handle[2])
+    return pd.DataFrame(handle[1])
+
+
+def combine(parts):
+    """
+    Menggabungkan hasil receive() (urut potongan) menjadi satu DataFrame.
+    Tabel Arrow digabung dan dikonversi sekali.
+    """
+    tables = []
+    frames = []
+    for part in parts:
+        if pa is not None and isinstance(part, pa.Table):
+            tables.append(part)
+        elif not part.empty:
+            frames.append(part)
+    if tables:
+        # split_blocks: kolom tanpa null dapat tetap menunjuk ke buffer Arrow
+        table = pa.concat_tables(tables, promote_options="permissive")
+        del tables
+        frames.insert(0, table.to_pandas(split_blocks=True, self_destruct=True))
+    return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
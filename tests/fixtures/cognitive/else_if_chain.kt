@@ -0,0 +1,13 @@
+// cognitive: 4
+// max nesting: 1
+fun grade(score: Int): String {
+    if (score > 90) {                       // +1
+        return "A"
+    } else if (score > 80) {                // +1
+        return "B"
+    } else if (score > 70) {                // +1
+        return "C"
+    } else {                                // +1
+        return "F"
+    }
+}
@@ -0,0 +1,10 @@
+// cognitive: 1
+// max nesting: 1
+fun getWords(number: Int): String {
+    return when (number) {                  // +1
+        1 -> "one"
+        2 -> "a couple"
+        3 -> "a few"
+        else -> "lots"
+    }
+}
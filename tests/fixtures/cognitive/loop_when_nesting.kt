@@ -0,0 +1,18 @@
+// cognitive: 8
+// max nesting: 3
+fun describe(values: List<Int>): Int {
+    var count = 0
+    for (value in values) {                 // +1
+        when {                              // +2 (nesting = 1)
+            value < 0 -> count--
+            value > 100 -> {
+                while (count > 0) {         // +3 (nesting = 2)
+                    count--
+                }
+            }
+            else -> count++
+        }
+        if (count > 10) break               // +2 (nesting = 1)
+    }
+    return count
+}
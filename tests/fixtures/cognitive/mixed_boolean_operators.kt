@@ -0,0 +1,8 @@
+// cognitive: 4
+// max nesting: 1
+fun check(a: Boolean, b: Boolean, c: Boolean, d: Boolean, e: Boolean, f: Boolean): Boolean {
+    if (a && b && c || d || e && f) {       // +1 if, +1 &&, +1 ||, +1 &&
+        return true
+    }
+    return false
+}
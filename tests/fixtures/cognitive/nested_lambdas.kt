@@ -0,0 +1,11 @@
+// cognitive: 3
+// max nesting: 1
+fun printPositive(rows: List<List<Int>>) {
+    rows.forEach { row ->                   // nesting + 1
+        row.forEach { value ->              // nesting + 1
+            if (value > 0) {                // +3 (nesting = 2)
+                println(value)
+            }
+        }
+    }
+}
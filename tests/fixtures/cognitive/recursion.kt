@@ -0,0 +1,8 @@
+// cognitive: 2
+// max nesting: 1
+fun factorial(n: Int): Int {
+    if (n <= 1) {                           // +1
+        return 1
+    }
+    return n * factorial(n - 1)             // +1
+}
@@ -0,0 +1,14 @@
+// cognitive: 7
+// max nesting: 3
+fun sumOfPrimes(max: Int): Int {
+    var total = 0
+    outer@ for (i in 1..max) {             // +1
+        for (j in 2 until i) {              // +2 (nesting = 1)
+            if (i % j == 0) {               // +3 (nesting = 2)
+                continue@outer              // +1
+            }
+        }
+        total += i
+    }
+    return total
+}
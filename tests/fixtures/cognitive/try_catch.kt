@@ -0,0 +1,19 @@
+// cognitive: 5
+// max nesting: 2
+fun load(path: String): String? {
+    try {
+        if (path.isEmpty()) {               // +1 (try does not nest)
+            return null
+        }
+        return readText(path)
+    } catch (e: IOException) {              // +1
+        if (path.endsWith(".tmp")) {        // +2 (nesting = 1)
+            return ""
+        }
+        return null
+    } catch (e: SecurityException) {        // +1
+        return null
+    } finally {
+        println("done")
+    }
+}
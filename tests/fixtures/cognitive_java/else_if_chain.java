@@ -0,0 +1,15 @@
+// cognitive: 4
+// max nesting: 1
+class Grades {
+    String grade(int score) {
+        if (score > 90) {                       // +1
+            return "A";
+        } else if (score > 80) {                // +1
+            return "B";
+        } else if (score > 70) {                // +1
+            return "C";
+        } else {                                // +1
+            return "F";
+        }
+    }
+}
@@ -0,0 +1,12 @@
+// cognitive: 1
+// max nesting: 1
+class Words {
+    String getWords(int number) {
+        switch (number) {                       // +1
+            case 1: return "one";
+            case 2: return "a couple";
+            case 3: return "a few";
+            default: return "lots";
+        }
+    }
+}
@@ -0,0 +1,21 @@
+// cognitive: 8
+// max nesting: 3
+class Describe {
+    int describe(java.util.List<Integer> values) {
+        int count = 0;
+        for (int i = 0; i < values.size(); i++) {   // +1
+            int value = values.get(i);
+            switch (Integer.signum(value)) {        // +2 (nesting = 1)
+                case -1 -> count--;
+                case 1 -> {
+                    while (count > 0) {             // +3 (nesting = 2)
+                        count--;
+                    }
+                }
+                default -> count++;
+            }
+            if (count > 10) break;                  // +2 (nesting = 1)
+        }
+        return count;
+    }
+}
@@ -0,0 +1,10 @@
+// cognitive: 4
+// max nesting: 1
+class Check {
+    boolean check(boolean a, boolean b, boolean c, boolean d, boolean e, boolean f) {
+        if (a && b && c || d || e && f) {       // +1 if, +1 &&, +1 ||, +1 &&
+            return true;
+        }
+        return false;
+    }
+}
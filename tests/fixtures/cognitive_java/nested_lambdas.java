@@ -0,0 +1,13 @@
+// cognitive: 3
+// max nesting: 1
+class Printer {
+    void printPositive(java.util.List<java.util.List<Integer>> rows) {
+        rows.forEach(row -> {                   // nesting + 1
+            row.forEach(value -> {              // nesting + 1
+                if (value > 0) {                // +3 (nesting = 2)
+                    System.out.println(value);
+                }
+            });
+        });
+    }
+}
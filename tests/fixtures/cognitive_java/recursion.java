@@ -0,0 +1,10 @@
+// cognitive: 2
+// max nesting: 1
+class Factorial {
+    int factorial(int n) {
+        if (n <= 1) {                           // +1
+            return 1;
+        }
+        return n * factorial(n - 1);            // +1
+    }
+}
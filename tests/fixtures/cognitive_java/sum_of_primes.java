@@ -0,0 +1,17 @@
+// cognitive: 7
+// max nesting: 3
+class Primes {
+    int sumOfPrimes(int max) {
+        int total = 0;
+        outer:
+        for (int i = 1; i <= max; i++) {        // +1
+            for (int j = 2; j < i; j++) {       // +2 (nesting = 1)
+                if (i % j == 0) {               // +3 (nesting = 2)
+                    continue outer;             // +1
+                }
+            }
+            total += i;
+        }
+        return total;
+    }
+}
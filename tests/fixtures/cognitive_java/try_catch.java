@@ -0,0 +1,21 @@
+// cognitive: 5
+// max nesting: 2
+class Loader {
+    String load(String path) {
+        try {
+            if (path.isEmpty()) {               // +1 (try does not nest)
+                return null;
+            }
+            return readText(path);
+        } catch (java.io.IOException e) {       // +1
+            if (path.endsWith(".tmp")) {        // +2 (nesting = 1)
+                return "";
+            }
+            return null;
+        } catch (SecurityException e) {         // +1
+            return null;
+        } finally {
+            System.out.println("done");
+        }
+    }
+}
@@ -0,0 +1,44 @@
+package com.example.shop;
+
+import java.util.ArrayList;
+import java.util.List;
+
+@SuppressWarnings("unchecked")
+public class Inventory {
+    @SuppressWarnings("rawtypes") private List items;
+    @Deprecated @javax.annotation.Nonnull(when = {"ALWAYS"}) protected String label;
+    private static final int[] SIZES = {1, 2};
+    private int counter;
+
+    static {
+        init();
+    }
+
+    {
+        counter = 0;
+    }
+
+    private static void init() {
+    }
+
+    public static Inventory createEmpty() {
+        return new Inventory();
+    }
+
+    int total(List<Integer> values) {
+        int sum = 0, seen = 0;
+        for (Integer value : values) {
+            if (value > 0 && sum < 100) {
+                sum += value;
+                seen++;
+            }
+        }
+        try {
+            List<String> names = new ArrayList<>();
+            names.add(label);
+        } catch (RuntimeException e) {
+            return -1;
+        }
+        return sum > seen ? sum : seen;
+    }
+}
@@ -0,0 +1,63 @@
+import pandas as pd
+import pytest
+
+from program import aggregate
+
+ROWS = pd.DataFrame([
+    {"Package": "shop", "Class": "Cart", "Method": "add", "CC": 1, "LOC": 10, "Error": None},
+    {"Package": "shop", "Class": "Cart", "Method": "total", "CC": 3, "LOC": 30, "Error": None},
+    # CC bukan angka dihitung 0, LOC kosong dihitung 0
+    {"Package": "shop", "Class": "Order", "Method": "place", "CC": "n/a", "LOC": None, "Error": None},
+    {"Package": "billing", "Class": "Invoice", "Method": "pay", "CC": 10, "LOC": 0, "Error": None},
+    # Baris placeholder dan error bukan metode
+    {"Package": "billing", "Class": "Invoice", "Method": "None", "CC": 0, "LOC": 0, "Error": "No functions found"},
+    {"Package": "Error", "Class": "Error", "Method": "Error", "CC": 0, "LOC": None, "Error": "boom"},
+])
+
+
+def test_project_rollup():
+    project = aggregate.aggregate_metrics(ROWS)["project"]
+
+    assert project == pytest.approx({
+        "methods": 4,
+        "cc_total": 14,
+        "cc_mean": 3.5,
+        "cc_p90": 7.9,  # Interpolasi linear di antara 3 dan 10
+        "cc_max": 10,
+        "loc_total": 40,
+        "cc_per_1000_loc": 350,
+    })
+
+
+def test_package_and_class_rollups():
+    result = aggregate.aggregate_metrics(ROWS)
+    packages = result["packages"].set_index("Package")
+    classes = result["classes"].set_index(["Package", "Class"])
+
+    assert packages.loc["shop"].to_dict() == pytest.approx({
+        "Methods": 3, "CC Total": 4, "CC Mean": 4 / 3, "CC P90": 2.6, "CC Max": 3,
+        "LOC Total": 40, "CC per 1000 LOC": 100,
+    })
+    # Tanpa LOC, kepadatan 0 bukan tak hingga
+    assert packages.loc["billing", "CC per 1000 LOC"] == 0
+    assert list(classes.index) == [("shop", "Cart"), ("shop", "Order"), ("billing", "Invoice")]
+    assert classes.loc[("shop", "Cart"), "CC P90"] == pytest.approx(2.8)
+    assert classes["Methods"].tolist() == [2, 1, 1]
+
+
+def test_woc_is_normalized_per_class():
+    assert aggregate.normalize_woc(ROWS).tolist() == pytest.approx([0.25, 0.75, 0, 1, 0, 0])
+
+
+def test_no_methods_and_no_loc_column():
+    errors_only = ROWS.iloc[[5]].drop(columns="LOC")
+
+    result = aggregate.aggregate_metrics(errors_only, loc_column=None)
+
+    assert result["project"] == {"methods": 0, "cc_total": 0, "cc_mean": 0, "cc_p90": 0, "cc_max": 0}
+    assert result["packages"].empty and result["classes"].empty
+
+
+def test_per_1000():
+    assert aggregate.per_1000(5, 2500) == 2
+    assert aggregate.per_1000(5, 0) == 0
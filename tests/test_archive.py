@@ -0,0 +1,52 @@
+import io
+import os
+
+import pytest
+
+from conftest import FIXTURES
+from program import archive
+from program import controller
+from program import ignore
+
+ARCHIVES = os.path.join(FIXTURES, "archives")
+
+
+def archive_names():
+    names = ["shop.zip", "shop.tar.gz"]
+    if archive.libarchive is not None:
+        names.append("shop.7z")
+    return names
+
+
+def upload(name, kind):
+    with open(os.path.join(ARCHIVES, name), "rb") as f:
+        data = f.read()
+    # Streamlit memberi memoryview dari getbuffer(); keduanya harus terbaca tanpa disalin
+    return data if kind == "bytes" else io.BytesIO(data).getbuffer()
+
+
+@pytest.mark.parametrize("kind", ["bytes", "buffer"])
+@pytest.mark.parametrize("name", archive_names())
+def test_members_are_read_from_the_buffer(name, kind):
+    members = dict(archive.iter_source_members(upload(name, kind), name))
+    assert sorted(members) == [
+        "shop/build/tmp/Stub.kt",
+        "shop/src/main/kotlin/shop/Cart.kt",
+        "shop/src/main/kotlin/shop/Ignored.kt",
+    ]
+    assert members["shop/build/tmp/Stub.kt"] == b"class Stub\n"
+
+
+@pytest.mark.parametrize("name", archive_names())
+def test_ignore_rules_apply_to_every_format(name):
+    rules = ignore.IgnoreRules()
+    members = archive.iter_source_members(upload(name, "buffer"), name, rules=rules)
+    assert [member for member, _ in ignore.filter_members(list(members), rules)] == [
+        "shop/src/main/kotlin/shop/Cart.kt"
+    ]
+
+
+@pytest.mark.parametrize("name", archive_names())
+def test_parse_archive(name):
+    df = controller.parse_archive(upload(name, "buffer"), name, workers=1)
+    assert df[["Class", "Method", "CC"]].values.tolist() == [["Cart", "total", 2]]
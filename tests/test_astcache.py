@@ -0,0 +1,48 @@
+import os
+
+import pytest
+
+from program import astcache
+from program import scan
+
+CODE = "class Cart {\n    fun total(items: Int): Int = items\n}\n"
+
+
+@pytest.fixture
+def digest():
+    return scan.content_digest(CODE.encode("utf-8"))
+
+
+def test_round_trip_uses_private_directories(tmp_path, digest):
+    cache_dir = str(tmp_path / "cache")
+    tree = astcache.Parser(CODE).parse()
+    astcache.store(digest, tree, cache_dir)
+
+    assert str(astcache.load(digest, cache_dir)) == str(tree)
+    entry = astcache._entry_path(cache_dir, digest)
+    assert os.stat(os.path.dirname(entry)).st_mode & 0o777 == 0o700
+
+
+@pytest.mark.skipif(not hasattr(os, "getuid"), reason="permission bits are POSIX only")
+def test_entries_writable_by_others_are_not_unpickled(tmp_path, digest):
+    cache_dir = str(tmp_path / "cache")
+    astcache.store(digest, astcache.Parser(CODE).parse(), cache_dir)
+    entry = astcache._entry_path(cache_dir, digest)
+    os.chmod(entry, 0o666)
+
+    assert astcache.load(digest, cache_dir) is None
+
+
+def test_evict_removes_least_recently_used_entries(tmp_path):
+    cache_dir = str(tmp_path / "cache")
+    digests = [scan.content_digest(f"class C{number}".encode()) for number in range(10)]
+    for number, digest in enumerate(digests):
+        astcache.store(digest, list(range(1000)), cache_dir)
+        os.utime(astcache._entry_path(cache_dir, digest), (number, number))
+    size = os.path.getsize(astcache._entry_path(cache_dir, digests[0]))
+
+    removed = astcache.evict(cache_dir, max_bytes=size * 5)
+
+    assert removed == 6
+    remaining = [os.path.exists(astcache._entry_path(cache_dir, digest)) for digest in digests]
+    assert remaining == [False] * 6 + [True] * 4
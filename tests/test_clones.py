@@ -0,0 +1,66 @@
+import numpy as np
+
+from program import clones
+
+BASE = [f"    val v{index} = compute(items[{index}], {index}) + offset" for index in range(12)]
+GUARD = "    for (i in 0 until n) { total += i }"
+THROW = '    throw IllegalStateException("x")'
+
+# A dan B berbeda satu pernyataan; C menjauh dari A lewat ekor yang berulang
+A = "{\n" + "\n".join(BASE) + "\n}"
+B = "{\n" + "\n".join([GUARD] + BASE[1:]) + "\n}"
+C = "{\n" + "\n".join([GUARD] + BASE[1:9] + [THROW] * 3) + "\n}"
+
+
+def signature(body):
+    return clones.minhash_signature(clones.shingle_hashes(clones.normalize_tokens(body)))
+
+
+def similarity(first, second):
+    return float(np.mean(signature(first) == signature(second)))
+
+
+def shared_bands(first, second):
+    a, b = signature(first), signature(second)
+    rows = clones.ROWS
+    return [band for band in range(clones.BANDS) if (a[band * rows:(band + 1) * rows] == b[band * rows:(band + 1) * rows]).all()]
+
+
+def test_exact_twins_differ_only_in_names_and_comments():
+    renamed = A.replace("compute", "calculate").replace("items", "values").replace("offset", "shift")
+    commented = A.replace("{\n", "{\n    // salinan\n", 1)
+
+    assert clones.find_clone_groups([("a", A), ("renamed", renamed), ("commented", commented)], threshold=1.0) == [
+        ["a", "renamed", "commented"]
+    ]
+
+
+def test_near_miss_follows_the_jaccard_threshold():
+    score = similarity(A, B)
+    assert 0 < score < 1
+    assert shared_bands(A, B)
+
+    assert clones.find_clone_groups([("a", A), ("b", B)], threshold=score - 0.01) == [["a", "b"]]
+    assert clones.find_clone_groups([("a", A), ("b", B)], threshold=score + 0.01) == []
+
+
+def test_union_find_merges_pairs_found_in_different_bands():
+    threshold = 0.55
+    # Premis: A-B dan B-C bertemu di band berbeda, A-C tidak pernah
+    assert similarity(A, B) >= threshold and similarity(B, C) >= threshold
+    assert similarity(A, C) < threshold
+    assert set(shared_bands(A, B)).isdisjoint(shared_bands(B, C))
+
+    assert clones.find_clone_groups([("a", A), ("c", C)], threshold=threshold) == []
+    # B ditambahkan terakhir sehingga menyatukan dua kelompok yang sudah ada
+    index = clones.CloneIndex(threshold)
+    for key, body in (("a", A), ("c", C), ("b", B)):
+        index.add(key, body)
+    assert index.groups() == [["a", "c", "b"]]
+    assert index.duplicated == 3
+
+
+def test_short_bodies_are_ignored():
+    short = "{\n    return value\n}"
+
+    assert clones.find_clone_groups([("x", short), ("y", short)]) == []
@@ -0,0 +1,33 @@
+import glob
+import os
+import re
+
+import pytest
+from kopyt import Parser
+
+from conftest import FIXTURES
+from program import cognitive
+
+CORPUS = sorted(glob.glob(os.path.join(FIXTURES, "cognitive", "*.kt")))
+
+
+def expected(source, key):
+    return int(re.search(rf"^// {key}: (\d+)$", source, re.MULTILINE).group(1))
+
+
+@pytest.mark.parametrize("path", CORPUS, ids=[os.path.basename(path) for path in CORPUS])
+def test_golden_corpus(path):
+    with open(path, encoding="utf-8") as f:
+        source = f.read()
+    function = Parser(source).parse().declarations[0]
+
+    metrics = cognitive.function_complexity(function)
+
+    assert metrics["Cognitive Complexity"] == expected(source, "cognitive")
+    assert metrics["Max Nesting"] == expected(source, "max nesting")
+
+
+def test_corpus_is_present():
+    names = {os.path.basename(path) for path in CORPUS}
+    assert {"sum_of_primes.kt", "get_words.kt", "else_if_chain.kt", "mixed_boolean_operators.kt",
+            "nested_lambdas.kt", "try_catch.kt", "recursion.kt"} <= names
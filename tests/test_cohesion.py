@@ -0,0 +1,39 @@
+import pytest
+
+from program import astcache
+from program import cohesion
+
+
+def cohesion_of(source):
+    return cohesion.class_cohesion(astcache.parse(source).declarations[0])
+
+
+@pytest.mark.parametrize(
+    "source, expected",
+    [
+        # Dua pasang metode, masing-masing berbagi satu properti
+        (
+            "class Counter {\n    var n = 0\n    var m = 0\n    fun inc() { n++ }\n    fun get() = n\n"
+            "    fun reset() { m = 0 }\n    fun size() = m\n}\n",
+            {"LCOM4": 2, "TCC": 2 / 6},
+        ),
+        # Parameter `val` adalah properti, parameter biasa bukan; panggilan
+        # metode menggabungkan komponen LCOM4 tetapi tidak dihitung TCC
+        (
+            "class Shape(val x: Int, y: Int) {\n    val z = 0\n    fun a() = x\n    fun b() = x + z\n"
+            "    fun c() = z\n    fun d() = y\n    fun e() { a() }\n}\n",
+            {"LCOM4": 2, "TCC": 2 / 10},
+        ),
+        # Parameter yang menutupi properti bukan akses properti; `this.s` ya
+        (
+            "class Label {\n    val s = \"\"\n    fun f(s: String) = s\n    fun g() = this.s\n"
+            "    fun h(s: String) { this.s.length }\n}\n",
+            {"LCOM4": 2, "TCC": 1 / 3},
+        ),
+        ("class Single {\n    fun one() = 1\n}\n", {"LCOM4": 1, "TCC": 0}),
+        ("class Empty\n", {"LCOM4": 0, "TCC": 0}),
+    ],
+    ids=["counter", "constructor-properties", "shadowing", "single-method", "no-body"],
+)
+def test_lcom4_and_tcc(source, expected):
+    assert cohesion_of(source) == pytest.approx(expected)
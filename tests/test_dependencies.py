@@ -0,0 +1,53 @@
+from program import dependencies
+
+SHAPES = """package app
+
+// Square dan Circle disebut di komentar: bukan dependensi
+sealed class Shape
+class Circle : Shape() {
+    val label = "Square"
+}
+class Square(val side: Int) : Shape()
+"""
+
+
+def analyze(*files):
+    return dependencies.analyze_dependencies(
+        [dependencies.index_file(content, package) for package, content in files]
+    )
+
+
+def fan(result):
+    """(fan in, fan out) per kelas."""
+    classes = result["classes"].set_index("Class")
+    return {name: (row["Fan In"], row["Fan Out"]) for name, row in classes.iterrows()}
+
+
+def test_sealed_hierarchy_in_one_file_has_no_cycle():
+    result = analyze(("app", SHAPES))
+
+    assert result["class_cycles"] == []
+    assert fan(result) == {"Shape": (2, 0), "Circle": (0, 1), "Square": (0, 1)}
+
+
+def test_references_are_collected_per_class():
+    references = dependencies.class_references(SHAPES + "class Outer {\n    class Inner : Circle()\n}\nfun helper() = Square(1)\n")
+
+    assert references == {
+        "Shape": set(),
+        "Circle": {"Shape"},
+        "Square": {"Shape", "Int"},
+        "Outer": set(),
+        "Inner": {"Circle"},
+    }
+
+
+def test_cycle_across_files():
+    result = analyze(
+        ("app.orders", "package app.orders\n\nimport app.billing.Invoice\n\nclass Order(val invoice: Invoice)\n"),
+        ("app.billing", "package app.billing\n\nimport app.orders.Order\n\nclass Invoice {\n    fun order(): Order? = null\n}\n"),
+        ("app.billing", "package app.billing\n\nclass Receipt(val invoice: Invoice)\n"),
+    )
+
+    assert result["class_cycles"] == [["app.billing.Invoice", "app.orders.Order"]]
+    assert result["package_cycles"] == [["app.billing", "app.orders"]]
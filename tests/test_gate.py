@@ -0,0 +1,67 @@
+import json
+import os
+import subprocess
+import sys
+
+from conftest import FIXTURES
+from program import controller
+from program import gate
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_config_thresholds_extend_the_defaults(tmp_path):
+    config = tmp_path / "gate.json"
+    config.write_text(json.dumps({"thresholds": {"LOC": 50, "Max Nesting": None}}), encoding="utf-8")
+
+    thresholds = gate.load_config(str(config))["thresholds"]
+
+    assert thresholds == {"CC": gate.DEFAULT_THRESHOLDS["CC"], "LOC": 50}
+
+
+def test_java_violations_have_a_sarif_region():
+    path = os.path.join(FIXTURES, "java", "Inventory.java")
+    report = gate.run_gate([path], {"CC": 1}, fail_fast=False, workers=1)
+
+    lines = {v["method"]: v["line"] for v in report["violations"]}
+    assert lines["total"] == 28
+    results = gate.to_sarif(report)["runs"][0]["results"]
+    assert all(result["locations"][0]["physicalLocation"]["region"]["startLine"] for result in results)
+
+
+def test_gate_does_not_import_streamlit():
+    code = "import sys, program.gate; print('streamlit' in sys.modules)"
+    output = subprocess.run([sys.executable, "-c", code], cwd=ROOT, check=True, capture_output=True, text=True)
+    assert output.stdout.strip() == "False"
+
+
+def test_top_level_functions_are_checked():
+    directory = os.path.join(FIXTURES, "cognitive")
+    files = sorted(os.path.join(directory, name) for name in os.listdir(directory))
+    report = gate.run_gate(files, {"Cognitive Complexity": 4}, fail_fast=False, workers=1)
+
+    assert report["errors"] == []
+    assert {(v["class"], v["method"], v["value"]) for v in report["violations"]} == {
+        ("loop_when_nesting.kt", "describe", 8),
+        ("sum_of_primes.kt", "sumOfPrimes", 7),
+        ("try_catch.kt", "load", 5),
+    }
+    assert not report["passed"]
+
+
+def test_class_methods_match_the_full_report():
+    code = (
+        "package shop\n\n"
+        "class Cart {\n    fun total(items: List<Int>): Int {\n        var sum = 0\n"
+        "        for (item in items) { if (item > 0) sum += item }\n        return sum\n    }\n"
+        "    fun size() = 0\n}\n\nfun helper(x: Int) = x + 1\n"
+    )
+    metrics = ("Method", "LOC", "CC", "Max Nesting", "Cognitive Complexity", "NOLV")
+
+    rows = gate.kotlin_method_metrics("Cart.kt", code)
+
+    assert [(row["Class"], row["Method"]) for row in rows] == [("Cart.kt", "helper"), ("Cart", "total"), ("Cart", "size")]
+    assert rows[0]["LOC"] == 1
+    assert [{metric: row[metric] for metric in metrics} for row in rows[1:]] == [
+        {metric: row[metric] for metric in metrics} for row in controller.extracted_method("Cart.kt", code)
+    ]
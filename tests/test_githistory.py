@@ -0,0 +1,43 @@
+import shutil
+import subprocess
+
+import pytest
+
+from program import githistory
+
+pytestmark = pytest.mark.skipif(shutil.which("git") is None, reason="git is not installed")
+
+
+def git(repo, *args):
+    subprocess.run(
+        ["git", "-C", str(repo), "-c", "user.name=test", "-c", "user.email=test@example.com", *args],
+        check=True, capture_output=True,
+    )
+
+
+@pytest.fixture
+def repo(tmp_path):
+    git(tmp_path, "init", "-q")
+    source = tmp_path / "src" / "main" / "kotlin" / "Cart.kt"
+    source.parent.mkdir(parents=True)
+    for body in ("return 1", "if (items > 0) return items\n        return 0"):
+        source.write_text(f"class Cart {{\n    fun total(items: Int): Int {{\n        {body}\n    }}\n}}\n", encoding="utf-8")
+        git(tmp_path, "add", "-A")
+        git(tmp_path, "commit", "-q", "-m", "change")
+    return tmp_path
+
+
+def test_history_small_batches(repo, monkeypatch):
+    # Setiap blob menjadi batch sendiri
+    monkeypatch.setattr(githistory, "BLOB_BATCH_BYTES", 1)
+    result = githistory.analyze_history(str(repo), workers=1)
+
+    assert result["commits"] == 2
+    assert result["parsed_blobs"] == 2
+    assert result["snapshots"].groupby("Commit", sort=False)["CC"].sum().tolist() == [1, 2]
+
+
+@pytest.mark.parametrize("revision_range", ["--output=/tmp/x", "-n1", ""])
+def test_option_like_revision_ranges_are_rejected(repo, revision_range):
+    with pytest.raises(ValueError):
+        githistory.analyze_history(str(repo), revision_range)
@@ -0,0 +1,49 @@
+import pandas as pd
+import pytest
+
+from program import history
+
+
+@pytest.fixture
+def conn(tmp_path):
+    conn = history.connect(str(tmp_path / "history.db"))
+    yield conn
+    conn.close()
+
+
+def rows(cc):
+    return pd.DataFrame({"Package": ["app"], "Class": ["Cart"], "Method": ["total"], "CC": [cc], "Error": [None]})
+
+
+def test_snapshots_are_ordered_by_extraction_date(conn):
+    # Riwayat lama diimpor setelah snapshot baru: ID-nya lebih besar
+    history.ingest_dataframe(conn, rows(5), "shop", "2024-06-01")
+    history.ingest_dataframe(conn, rows(2), "shop", "2024-01-01")
+
+    trend = history.project_trend(conn, "shop", "CC")
+    assert trend["date"].tolist() == ["2024-01-01", "2024-06-01"]
+    assert history.metric_above(conn, "shop", "CC", 0)["value"].tolist() == [5.0]
+    assert history.method_trend(conn, "shop", "total", "CC", limit=1)["value"].tolist() == [5.0]
+
+
+def test_reingesting_the_same_snapshot_is_a_no_op(conn):
+    first = history.ingest_dataframe(conn, rows(5), "shop", "2024-06-01")
+    again = history.ingest_dataframe(conn, rows(5), "shop", "2024-06-01")
+    changed = history.ingest_dataframe(conn, rows(6), "shop", "2024-06-01")
+
+    assert again == first
+    assert changed != first
+    assert conn.execute("SELECT COUNT(*) FROM snapshots").fetchone()[0] == 2
+    assert conn.execute("SELECT COUNT(*) FROM method_metrics").fetchone()[0] == 2
+
+
+def test_ast_rows_keep_signature_metrics(conn):
+    ast_rows = pd.DataFrame({
+        "Language": ["Kotlin", "Kotlin"], "Package": ["app", "app"], "Class": ["Cart", "Cart"],
+        "Method": ["checkout", "total"], "CC": [3, 1], "Parameters": [7.0, 1.0],
+        "Receiver": [None, None], "Error": [None, None],
+    })
+    history.ingest_dataframe(conn, ast_rows, "shop", "2024-06-01")
+
+    assert "Parameters" in history.list_metrics(conn, "shop")
+    assert history.too_many_parameters(conn, "shop")["method"].tolist() == ["checkout"]
@@ -0,0 +1,31 @@
+import pytest
+
+from program import ignore
+
+
+@pytest.mark.parametrize(
+    "path, excluded",
+    [
+        ("shop/app/build/tmp/kotlin/Stub.kt", True),
+        ("shop/build/generated/source/BuildConfig.kt", True),
+        ("shop/app/generated/Schema.kt", True),
+        ("shop/.gradle/cache/Script.kt", True),
+        # Direktori paket bernama build/generated di dalam source set tetap dianalisis
+        ("shop/app/src/main/java/com/shop/build/Builder.kt", False),
+        ("shop/app/src/main/kotlin/com/shop/generated/Codes.kt", False),
+        ("shop/app/src/main/kotlin/com/shop/Cart.kt", False),
+    ],
+)
+def test_default_excludes(path, excluded):
+    assert ignore.IgnoreRules().excluded(path) is excluded
+
+
+def test_walk_keeps_build_packages(tmp_path):
+    package = tmp_path / "app" / "src" / "main" / "kotlin" / "com" / "shop" / "build"
+    package.mkdir(parents=True)
+    (package / "Builder.kt").write_text("class Builder\n", encoding="utf-8")
+    output = tmp_path / "app" / "build" / "tmp"
+    output.mkdir(parents=True)
+    (output / "Stub.kt").write_text("class Stub\n", encoding="utf-8")
+
+    assert [name for _, name in ignore.walk(str(tmp_path), (".kt",))] == ["Builder.kt"]
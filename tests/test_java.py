@@ -0,0 +1,79 @@
+import glob
+import os
+import re
+
+import pytest
+
+from conftest import FIXTURES
+from program import controller
+from program import java
+
+
+@pytest.fixture(scope="module")
+def source():
+    with open(os.path.join(FIXTURES, "java", "Inventory.java"), encoding="utf-8") as f:
+        return f.read()
+
+
+@pytest.fixture(scope="module")
+def inventory(source):
+    return java.parse(source)["classes"][0]
+
+
+def test_annotations_are_not_methods(inventory):
+    names = [method["name"] for method in inventory["methods"]]
+    assert "SuppressWarnings" not in names
+    assert "Nonnull" not in names
+
+
+def test_initializer_blocks_are_not_members(inventory):
+    assert [method["name"] for method in inventory["methods"]] == ["init", "createEmpty", "total"]
+
+
+def test_fields(inventory):
+    # `items` behind an annotation with arguments, `SIZES` with an array initializer,
+    # and `counter` once (the instance initializer does not declare it again)
+    assert [field["name"] for field in inventory["fields"]] == ["items", "label", "SIZES", "counter"]
+    assert inventory["fields"][0]["modifiers"] == {"private"}
+
+
+def test_local_variables(source):
+    rows = {row["Method"]: row for row in java.analyze_java("Inventory.java", source)}
+    # sum, seen, value, names, e
+    assert rows["total"]["NOLV"] == 5
+    assert rows["init"]["NOLV"] == 0
+
+
+def test_rows_share_the_kotlin_schema(source):
+    java_rows = java.analyze_java("Inventory.java", source)
+    kotlin_rows = controller.extracted_method(
+        "Inventory.kt", "package p\n\nclass Inventory {\n    fun create(): Int {\n        return 1\n    }\n}\n"
+    )
+    assert not any("Error" in row for row in java_rows + kotlin_rows)
+    assert set(java_rows[0]) == set(kotlin_rows[0])
+    by_method = {row["Method"]: row for row in java_rows}
+    assert by_method["createEmpty"]["number_standard_design_methods"] == 1
+
+
+def expected(source, key):
+    return int(re.search(rf"^// {key}: (\d+)$", source, re.MULTILINE).group(1))
+
+
+JAVA_CORPUS = sorted(glob.glob(os.path.join(FIXTURES, "cognitive_java", "*.java")))
+
+
+@pytest.mark.parametrize("path", JAVA_CORPUS, ids=[os.path.basename(path) for path in JAVA_CORPUS])
+def test_cognitive_matches_the_kotlin_golden_corpus(path):
+    with open(path, encoding="utf-8") as f:
+        source = f.read()
+    kotlin_path = os.path.join(FIXTURES, "cognitive", os.path.basename(path)[:-len(".java")] + ".kt")
+    with open(kotlin_path, encoding="utf-8") as f:
+        kotlin_source = f.read()
+
+    row = java.analyze_java(os.path.basename(path), source)[0]
+
+    for key in ("cognitive", "max nesting"):
+        # Kasus Java adalah cermin fixture Kotlin dengan nilai yang sama
+        assert expected(source, key) == expected(kotlin_source, key)
+    assert row["Cognitive Complexity"] == expected(source, "cognitive")
+    assert row["Max Nesting"] == expected(source, "max nesting")
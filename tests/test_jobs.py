@@ -0,0 +1,87 @@
+import threading
+import time
+
+import pytest
+
+from program import jobs
+
+
+def wait(queue, job_id, timeout=10):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        job = queue.status(job_id)
+        if job["status"] in jobs.FINISHED:
+            return job
+        time.sleep(0.01)
+    raise AssertionError(f"job {job_id} did not finish")
+
+
+def count_files(data, step, release=None, progress=None):
+    total = len(data)
+    for done in range(1, total + 1):
+        progress(done, total, partial={"seen": done})
+        if release is not None and done == step:
+            release.wait(10)
+    return total
+
+
+@pytest.fixture
+def queue():
+    queue = jobs.JobQueue(max_workers=1)
+    yield queue
+    queue._executor.shutdown(wait=True)
+
+
+def test_progress_reports_done_total_and_eta(queue):
+    release = threading.Event()
+    job_id = queue.submit(count_files, b"abcd", 2, release)
+    deadline = time.monotonic() + 10
+    while queue.status(job_id)["done"] < 2 and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+    running = queue.status(job_id)
+    assert running["status"] == jobs.RUNNING
+    assert (running["done"], running["total"]) == (2, 4)
+    assert running["partial"] == {"seen": 2}
+    assert running["eta"] is not None and running["eta"] >= 0
+
+    release.set()
+    job = wait(queue, job_id)
+    assert job["status"] == jobs.DONE
+    assert job["result"] == 4
+    # Input yang sama memakai hasil yang sudah ada
+    assert queue.submit(count_files, b"abcd", 2, release) == job_id
+
+
+def test_errors_are_propagated(queue):
+    def broken(data, progress=None):
+        raise ValueError("not a zip file")
+
+    failed_id = queue.submit(broken, b"x")
+    job = wait(queue, failed_id)
+
+    assert job["status"] == jobs.FAILED
+    assert job["error"] == "not a zip file"
+    # Pekerjaan yang gagal dikirim ulang, bukan dipakai ulang
+    assert queue.submit(broken, b"x") != failed_id
+
+
+def test_cancel_running_and_pending_jobs(queue):
+    release = threading.Event()
+    running_id = queue.submit(count_files, b"abcd", 1, release)
+    pending_id = queue.submit(count_files, b"efgh", 1)
+    deadline = time.monotonic() + 10
+    while queue.status(running_id)["status"] != jobs.RUNNING and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+    assert queue.cancel(pending_id)
+    assert queue.status(pending_id)["status"] == jobs.CANCELLED
+    assert queue.cancel(running_id)
+    release.set()
+
+    assert wait(queue, running_id)["status"] == jobs.CANCELLED
+    assert queue.status(running_id)["done"] == 1
+    assert queue.status(pending_id)["done"] == 0
+    assert not queue.cancel(running_id)
+    # Pekerjaan yang dibatalkan bisa dijalankan lagi
+    assert queue.submit(count_files, b"abcd", 1) != running_id
@@ -0,0 +1,53 @@
+import pytest
+
+from program import astcache
+from program import clones
+from program import cognitive
+from program import patterns
+
+# (isi fungsi, NOLV yang diharapkan); kedua engine harus sepakat
+CASES = {
+    "destrukturisasi": (
+        "val (a, b) = pair\n    val (_, c) = pair\n    for ((k, v) in map) println(k)",
+        5,
+    ),
+    "lambda": (
+        "xs.forEach { x -> println(x) }\n    map.forEach { (k, v) -> println(k) }\n    xs.map { it * 2 }\n"
+        "    val f = { a: Int, b: Int -> a + b }\n    xs.forEach { val y = it }",
+        7,
+    ),
+    "catch": (
+        "try { load() } catch (e: IOException) { log(e) } catch (other: Exception) {}\n    val z = 1",
+        3,
+    ),
+    # Properti object/kelas lokal adalah anggota; variabel di metodenya tetap lokal
+    "anggota-object": (
+        "val o = object : Runnable {\n        val inner = 1\n        override fun run() { val local = 2 }\n    }\n"
+        "    class Local { var field = 0 }",
+        2,
+    ),
+    "when": (
+        "when (val r = read()) {\n        is A -> { val a = r }\n        else -> {}\n    }",
+        2,
+    ),
+}
+
+
+def source(body):
+    return "fun f() {\n    " + body + "\n}\n"
+
+
+@pytest.mark.parametrize("name", CASES)
+def test_ast_engine(name):
+    body, expected = CASES[name]
+    function = astcache.parse(source(body)).declarations[0]
+
+    assert cognitive.function_complexity(function)["NOLV"] == expected
+
+
+@pytest.mark.parametrize("name", CASES)
+def test_regex_engine(name):
+    body, expected = CASES[name]
+    function_content = clones.extract_function_content(source(body), "f")
+
+    assert patterns.count_local_variables(function_content) == expected
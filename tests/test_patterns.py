@@ -0,0 +1,79 @@
+import re
+import time
+
+import pytest
+
+from program import archive
+from program import patterns
+
+SAMPLE_ARCHIVE = "AndroidBMSApp-main.rar"
+CONSTRUCTOR_HEADER = re.compile(patterns.CONSTRUCTOR_HEADER)
+
+# Masukan patologis: (nama, pembangkit teks berukuran n)
+ADVERSARIAL = [
+    ("val", lambda n: "val " * n),
+    ("val-tanpa-nama", lambda n: "val" * n),
+    ("kurung-terbuka", lambda n: "class A(" + "(" * n),
+    ("parameter", lambda n: "class A(" + ", ".join(f"p{index}: Int" for index in range(n))),
+    ("sudut-terbuka", lambda n: "class A<" + "<" * n),
+    ("modifier", lambda n: "class A " + "@Inject private " * n),
+    ("kata-panjang", lambda n: "class A " + "x" * n),
+    ("spasi-tanpa-kurung", lambda n: "class A" + " \t" * n + "\n" + "class B {}\n" * n),
+]
+
+
+def old_scan(content):
+    """Hasil pola per jenis deklarasi sebelum scan_declarations."""
+    package = re.search(r"package\s+([\w\.]+)", content)
+    class_names = re.findall(r"class\s+(\w+)", content)
+    constructors = {}
+    for name in class_names:
+        count = 0
+        for constructor in re.findall(rf"class\s+{name}\s*.*?\((.*?)\)", content, re.DOTALL):
+            if constructor and not re.match(r"\s*\)", constructor):
+                count += 1
+        if count:
+            constructors[name] = count
+    return {
+        "package": package.group(1) if package else None,
+        "classes": re.findall(r"class\s+\w+", content),
+        "class_names": class_names,
+        "functions": re.findall(r"fun\s+\w+", content),
+        "function_names": re.findall(r"fun\s+(\w+)\s*\(", content),
+        "properties": re.findall(r"val\s+\w+|var\s+\w+", content),
+        "constructors": constructors,
+    }
+
+
+def elapsed(function, text):
+    start = time.perf_counter()
+    function(text)
+    return time.perf_counter() - start
+
+
+@pytest.mark.parametrize("name, build", ADVERSARIAL, ids=[name for name, _ in ADVERSARIAL])
+def test_adversarial_input_scans_in_linear_time(name, build):
+    # Header dicoba tepat setelah setiap `class Nama`, seperti di DECLARATION
+    header = lambda text: [CONSTRUCTOR_HEADER.match(text, match.end()) for match in patterns.CLASS_NAME.finditer(text)]
+    for function in (patterns.scan_declarations, header):
+        small, large = elapsed(function, build(2_000)), elapsed(function, build(20_000))
+        # Masukan 10x lebih besar: linear berarti ~10x, kuadratik ~100x
+        assert large < 30 * small + 0.05
+        assert large < 2.0
+
+
+def test_constructor_header_stays_on_the_class_line():
+    content = "class A\n\nfun build(value: Int) = A()\nclass B<T : List<T>> @Inject private constructor(val t: T)\nclass C()\n"
+
+    assert patterns.scan_declarations(content)["constructors"] == {"B": 1}
+
+
+def test_matches_the_old_patterns_on_the_sample_archive():
+    if archive.libarchive is None:
+        pytest.skip("libarchive is not installed")
+    with open(SAMPLE_ARCHIVE, "rb") as f:
+        sources = [content.decode("utf-8") for _, content in archive.iter_source_members(f.read(), SAMPLE_ARCHIVE)]
+
+    assert sources
+    for source in sources:
+        assert patterns.scan_declarations(source) == old_scan(source)
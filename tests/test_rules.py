@@ -0,0 +1,117 @@
+import pytest
+from kopyt import Parser, node
+
+from program import archive
+from program import controller
+from program import rules
+
+SAMPLE_ARCHIVE = "AndroidBMSApp-main.rar"
+DESIGN_INDICATORS = (
+    "create", "make", "newInstance", "of", "from", "build", "builder", "construct", "assemble",
+    "getInstance", "instance", "clone", "copy", "parse", "load", "save",
+)
+SOURCE = """package shop
+
+class CartBuilder {
+    fun buildBuilder(): CartBuilder = this
+    private fun loadAndSave() {}
+    protected fun reload() {}
+    internal fun copyOf() {}
+    public fun total(): Int = 0
+    companion object {
+        fun create(): CartBuilder = CartBuilder()
+        private fun fromJson(json: String): CartBuilder = CartBuilder()
+    }
+}
+"""
+
+
+def old_counts(tree):
+    """Penghitung per fungsi sebelum program.rules (hanya anggota langsung kelas tingkat atas)."""
+    counts = dict.fromkeys(
+        ("number_public_visibility_methods", "number_private_visibility_methods",
+         "number_protected_visibility_methods", "number_package_visibility_methods",
+         "number_standard_design_methods"),
+        0,
+    )
+    for declaration in tree.declarations or ():
+        if not isinstance(declaration, node.ClassDeclaration) or declaration.body is None:
+            continue
+        for member in declaration.body.members:
+            if not isinstance(member, node.FunctionDeclaration):
+                continue
+            modifiers = {str(modifier) for modifier in member.modifiers or ()}
+            counts["number_public_visibility_methods"] += not modifiers & {"private", "protected", "internal"}
+            counts["number_private_visibility_methods"] += "private" in modifiers
+            counts["number_protected_visibility_methods"] += "protected" in modifiers
+            counts["number_package_visibility_methods"] += not modifiers & {"public", "private", "protected", "internal"}
+            counts["number_standard_design_methods"] += any(
+                indicator in member.name.lower() for indicator in DESIGN_INDICATORS
+            )
+    return counts
+
+
+def sample_sources():
+    if archive.libarchive is None:
+        pytest.skip("libarchive is not installed")
+    with open(SAMPLE_ARCHIVE, "rb") as f:
+        return [content.decode("utf-8") for _, content in archive.iter_source_members(f.read(), SAMPLE_ARCHIVE)]
+
+
+def test_default_rules_match_the_old_counters():
+    compiled = rules.compile_rules(rules.DEFAULT_RULES)
+    for source in [SOURCE] + sample_sources():
+        tree = Parser(source).parse()
+        assert rules.evaluate(tree, compiled)["file"] == {
+            name: count for name, count in old_counts(tree).items() if count
+        }
+
+
+def test_overlapping_terms_count_each_method_once():
+    compiled = rules.compile_rules([
+        {"name": "builders", "node": "function", "name_contains": ["build", "builder", "uild"]},
+        {"name": "loaders", "node": "function", "name_contains": ["load", "reload", "oad"]},
+        {"name": "savers", "node": "function", "name_contains": ["SAVE"]},
+    ])
+    counts = rules.evaluate(Parser(SOURCE).parse(), compiled)["file"]
+
+    # buildBuilder sekali; loadAndSave dan reload; loadAndSave (tanpa beda huruf besar/kecil)
+    assert counts == {"builders": 1, "loaders": 2, "savers": 1}
+
+
+def test_companion_scope():
+    compiled = rules.compile_rules([
+        {"name": "companion_factories", "node": "function", "scope": "companion"},
+        {"name": "private_anywhere", "node": "function", "modifiers_any": ["private"]},
+    ])
+    counts = rules.evaluate(Parser(SOURCE).parse(), compiled)["file"]
+
+    assert counts == {"companion_factories": 2, "private_anywhere": 2}
+
+
+def test_method_level_rule_is_a_flag_per_row():
+    rules.activate([{"name": "is_loader", "node": "function", "level": "method", "name_contains": ["load"]}])
+    try:
+        rows = controller.extracted_method("CartBuilder.kt", SOURCE)
+    finally:
+        rules.activate()
+
+    assert {row["Method"]: row["is_loader"] for row in rows} == {
+        "buildBuilder": 0, "loadAndSave": 1, "reload": 1, "copyOf": 0, "total": 0,
+    }
+
+
+@pytest.mark.parametrize(
+    "rule",
+    [
+        {"name": "CC", "node": "function"},
+        {"name": "Max Nesting", "node": "function"},
+        {"name": "Parameters", "node": "function"},
+        {"name": "factories", "node": "function", "name_contains": 5},
+        {"name": "factories", "node": "function", "name_contains": "create"},
+        {"name": "factories", "node": "function", "modifiers_none": {"private": True}},
+    ],
+)
+def test_invalid_rules_raise_value_error(rule):
+    with pytest.raises(ValueError):
+        rules.validate_rule(rule)
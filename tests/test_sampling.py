@@ -0,0 +1,60 @@
+import random
+
+from program import sampling
+
+
+def write_project(directory, seed=1):
+    """Tiga paket dengan ukuran file yang berbeda-beda."""
+    rng = random.Random(seed)
+    for package in range(3):
+        (directory / f"pkg{package}").mkdir()
+        for index in range(40):
+            lines = [
+                "    // catatan" if rng.random() < 0.2 else f"    val x{line} = if (ready) {line} else 0"
+                for line in range(rng.randint(5, 60 + package * 40))
+            ]
+            source = "\n".join([f"fun f{index}() {{"] + lines + ["}"]) + "\n"
+            (directory / f"pkg{package}" / f"F{index}.kt").write_text(source, encoding="utf-8")
+
+
+def exact_totals(directory):
+    totals = dict.fromkeys(sampling.METRICS, 0)
+    for path, _, _ in sampling.list_files(str(directory)):
+        metrics, _ = sampling.measure(path)
+        for column in totals:
+            totals[column] += metrics[column]
+    return totals
+
+
+def test_intervals_narrow_and_end_exact(tmp_path):
+    write_project(tmp_path)
+    truth = exact_totals(tmp_path)
+
+    reports = list(sampling.progressive_report(str(tmp_path), batch_size=20))
+
+    assert [report["files_sampled"] for report in reports] == [20, 40, 60, 80, 100, 120]
+    widths = [report["estimates"]["loc"][2] - report["estimates"]["loc"][1] for report in reports]
+    assert all(later < earlier for earlier, later in zip(widths, widths[1:]))
+    # Sampel dan isi proyek deterministik: setiap interval memuat nilai sebenarnya
+    for report in reports:
+        for column in ("loc", "sloc", "cloc", "mcc"):
+            _, low, high = report["estimates"][column]
+            assert low <= truth[column] <= high
+
+    final = reports[-1]
+    assert final["exact"] and not any(report["exact"] for report in reports[:-1])
+    # Code smells juga memuat fungsi duplikat di antara semua file
+    truth["code_smells"] += final["duplicated_methods"]
+    for column, total in truth.items():
+        assert final["estimates"][column] == (total, total, total)
+    assert final["estimates"]["comment_ratio"][0] == truth["cloc"] / truth["sloc"] * 100
+
+
+def test_empty_directory_yields_an_exact_zero_report(tmp_path):
+    (tmp_path / "build").mkdir()
+
+    reports = list(sampling.progressive_report(str(tmp_path)))
+
+    assert len(reports) == 1
+    assert reports[0]["exact"] and reports[0]["files_total"] == 0
+    assert set(reports[0]["estimates"].values()) == {(0.0, 0.0, 0.0)}
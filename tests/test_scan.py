@@ -0,0 +1,46 @@
+import pytest
+
+from program import scan
+
+KEYWORDS = ("if", "else", "for", "while", "do", "when", "switch", "case", "try", "catch")
+
+
+def old_counts(path):
+    """Loop readlines()/strip() sebelum scan_buffer (mode teks, newline universal)."""
+    with open(path, "r", encoding="utf-8") as f:
+        lines = f.readlines()
+    counts = {"loc": len(lines), "cloc": 0, "sloc": 0, "keyword_lines": 0, "long_lines": 0}
+    for line in lines:
+        stripped = line.strip()
+        if stripped.startswith("//"):
+            counts["cloc"] += 1
+        elif stripped != "":
+            counts["sloc"] += 1
+            counts["keyword_lines"] += any(keyword in stripped for keyword in KEYWORDS)
+        counts["long_lines"] += len(stripped) > 100
+    return counts
+
+
+SOURCES = {
+    "lf": b"package app\n\n// komentar\nfun main() {\n    if (x) return\n}\n",
+    "tanpa-newline-akhir": b"fun main() {\n    while (true) {}\n}",
+    "crlf": b"package app\r\n\r\n// komentar\r\nfun main() {\r\n    for (i in xs) {}\r\n}\r\n",
+    "cr-tunggal": b"package app\r\r// komentar\rfun main() {\r    try { f() } catch (e: E) {}\r}\r",
+    "cr-campuran": b"val a = 1\r\nval b = 2\rval c = 3\n\r// akhir",
+    "bom": "﻿package app\n﻿\n﻿// komentar\nfun f() = 1\n".encode(),
+    "nbsp": "fun f() {\n \n  \t\n // komentar\n　 \n  if (x) y()\n}\n".encode(),
+    "spasi-unicode": "\x1c\n \n   // if\n\x85\n".encode(),
+    "baris-panjang": ("    " + "x" * 100 + "\n" + " " * 3 + "y" * 101 + "\r\n" + "é" * 60 + "\n").encode(),
+    "kosong": b"",
+}
+
+
+@pytest.mark.parametrize("name", SOURCES)
+def test_byte_scan_matches_the_old_line_loop(tmp_path, name):
+    path = tmp_path / f"{name}.kt"
+    path.write_bytes(SOURCES[name])
+
+    counts = scan.scan_file(str(path))
+
+    assert {key: counts[key] for key in ("loc", "cloc", "sloc", "keyword_lines", "long_lines")} == old_counts(path)
+    assert counts["blank"] == counts["loc"] - counts["cloc"] - counts["sloc"]
@@ -0,0 +1,57 @@
+import os
+import signal
+import threading
+import time
+
+import pytest
+
+from program import controller
+from program import service
+
+FILES = {
+    f"src/Cart{number}.kt": (
+        f"package shop\n\nclass Cart{number} {{\n"
+        "    fun total(items: Int): Int {\n        if (items > 0) return items\n        return 0\n    }\n}\n"
+    )
+    for number in range(20)
+}
+
+
+@pytest.fixture
+def server():
+    server = service.serve(port=0, workers=2)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server, f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+def test_files_match_direct_analysis(server):
+    _, url = server
+    status, payload = service.call(url, "/analyze/files", {"files": FILES})
+
+    members = [(name, source.encode("utf-8")) for name, source in FILES.items()]
+    expected = controller.analyze_members(members, workers=1).drop(columns="Member Index")
+    assert status == 200
+    assert payload["rows"] == service.frame_to_records(expected)
+
+    status, metrics = service.call(url, "/metrics")
+    assert status == 200
+    assert metrics["endpoints"]["/analyze/files"]["count"] == 1
+
+
+def test_pool_is_recreated_after_a_worker_dies(server):
+    server, url = server
+    broken = server.pool
+    os.kill(next(iter(broken._processes)), signal.SIGKILL)
+    deadline = time.monotonic() + 30
+    while not broken._broken and time.monotonic() < deadline:
+        time.sleep(0.05)
+
+    status, payload = service.call(url, "/analyze/files", {"files": FILES})
+
+    assert status == 200
+    assert len(payload["rows"]) == len(FILES)
+    assert server.pool is not broken
+    assert service.call(url, "/metrics")[1]["pool_restarts"] == 1
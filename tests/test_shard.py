@@ -0,0 +1,58 @@
+import os
+import shutil
+import subprocess
+import sys
+
+import pytest
+
+from conftest import FIXTURES
+
+pytest.importorskip("pyarrow")
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+REPORT_FILES = ("methods.csv", "classes.csv", "packages.csv", "project.json")
+
+
+@pytest.fixture(scope="module")
+def repo(tmp_path_factory):
+    directory = tmp_path_factory.mktemp("repo")
+    for language in ("cognitive", "java"):
+        target = directory / "src" / language
+        shutil.copytree(os.path.join(FIXTURES, language), target)
+    # Baris error dan file tanpa kelas ikut diuji
+    (directory / "src" / "Broken.kt").write_text("package broken\nclass { fun ((( \n", encoding="utf-8")
+    (directory / "src" / "Empty.kt").write_text("package empty\n", encoding="utf-8")
+    return directory
+
+
+def run_sharded(repo, output, shards):
+    """Menjalankan setiap shard sebagai proses sendiri (paralel), lalu merge."""
+    output.mkdir()
+    manifests = [str(output / f"part-{shard}.json") for shard in range(shards)]
+    processes = [
+        subprocess.Popen(
+            [sys.executable, "-m", "program.shard", "run", "--shard", str(shard), "--shards", str(shards),
+             "--workers", "1", "--output", manifest, str(repo)],
+            cwd=ROOT, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE,
+        )
+        for shard, manifest in enumerate(manifests)
+    ]
+    for process in processes:
+        _, stderr = process.communicate(timeout=300)
+        assert process.returncode == 0, stderr.decode()
+    subprocess.run(
+        [sys.executable, "-m", "program.shard", "merge", "--output", str(output / "report"), *manifests],
+        cwd=ROOT, check=True, stdout=subprocess.DEVNULL, timeout=300,
+    )
+    return output / "report"
+
+
+def test_merge_is_identical_for_any_shard_count(repo, tmp_path):
+    single = run_sharded(repo, tmp_path / "one", 1)
+    sharded = run_sharded(repo, tmp_path / "eight", 8)
+    for name in REPORT_FILES:
+        assert (single / name).read_bytes() == (sharded / name).read_bytes(), name
+
+    methods = (single / "methods.csv").read_text(encoding="utf-8")
+    assert "Error" in methods
+    assert "Broken.kt" in methods
@@ -0,0 +1,60 @@
+from program import astcache
+from program import controller
+from program import spans
+
+SOURCE = '''package shop
+
+class Sample {
+    fun single() = if (ready) 1 else 2
+    fun strings(): String {
+        val open = "{ if ( } }"
+        val raw = """
+            } while {
+        """
+        // } for
+        return open + '}'
+    }
+    /* { */
+    fun block(x: Int): Int {
+        if (x > 0) { return 1 }
+        return 0
+    }
+    fun last() =
+        when (x) {
+            1 -> "}"
+            else -> "{"
+        }
+    // komentar milik penutup kelas
+}
+'''
+
+
+def test_member_sources_ignore_braces_in_strings_and_comments():
+    class_declaration = astcache.parse(SOURCE).declarations[0]
+    members = class_declaration.body.members
+
+    sources = spans.member_sources(SOURCE, class_declaration.body, members)
+
+    assert sources[0] == "if (ready) 1 else 2"
+    assert sources[1].startswith("{\n        val open") and sources[1].endswith("return open + '}'\n    }")
+    assert sources[2] == "{\n        if (x > 0) { return 1 }\n        return 0\n    }"
+    # Badan ekspresi terakhir berhenti sebelum komentar dan penutup kelas
+    assert sources[3] == 'when (x) {\n            1 -> "}"\n            else -> "{"\n        }'
+
+
+def test_loc_and_cc_come_from_the_member_span():
+    rows = controller.extracted_method("Sample.kt", SOURCE)
+
+    assert [(row["Method"], row["LOC"], row["CC"]) for row in rows] == [
+        ("single", 1, 2),
+        ("strings", 8, 1),
+        ("block", 4, 2),
+        ("last", 4, 2),
+    ]
+
+
+def test_top_level_expression_body_ends_at_the_end_of_file():
+    code = "fun first() = 1\n\nfun second(x: Int) =\n    x + 1\n"
+    declarations = astcache.parse(code).declarations
+
+    assert spans.declaration_sources(code, declarations) == ["1", "x + 1"]
@@ -0,0 +1,61 @@
+import pandas as pd
+import pytest
+
+from program import spill
+
+
+def test_spill_list_keeps_append_order(tmp_path):
+    with spill.SpillList(budget=500, directory=tmp_path) as items:
+        items.extend({"Row": index, "Name": f"name-{index}"} for index in range(200))
+        assert items.spilled > 0
+        assert [item["Row"] for item in items] == list(range(200))
+        assert items.to_frame()["Row"].tolist() == list(range(200))
+
+
+def test_spill_group_shares_one_budget(tmp_path):
+    group = spill.SpillGroup(budget=2000, directory=tmp_path)
+    classes = group.new_list()
+    functions = group.new_list()
+    for index in range(100):
+        classes.append(f"Class{index}")
+        functions.append(f"function{index}")
+    assert classes.spilled > 0 and functions.spilled > 0
+    # Satu run bersama per tumpahan, bukan satu file per list
+    assert len(list(tmp_path.glob("*/run-*"))) == classes.spilled
+    assert list(classes) == [f"Class{index}" for index in range(100)]
+    assert list(functions) == [f"function{index}" for index in range(100)]
+    group.close()
+    assert not list(tmp_path.iterdir())
+
+
+def test_spill_parts_come_back_in_index_order(tmp_path):
+    pa = pytest.importorskip("pyarrow")
+    with spill.SpillParts(budget=50, directory=tmp_path) as parts:
+        for index in (2, 0, 3, 1):
+            parts.put(index, pa.table({"Row": list(range(index * 10, index * 10 + 10))}))
+        parts.put(4, pd.DataFrame({"Row": list(range(40, 50))}))
+        assert parts.spilled == 5
+        rows = []
+        for part in parts.parts():
+            rows.extend(part["Row"].to_pylist() if isinstance(part, pa.Table) else part["Row"].tolist())
+        assert rows == list(range(50))
+
+
+def test_reserved_memory_shares_the_group_budget(tmp_path):
+    group = spill.SpillGroup(budget=2000, directory=tmp_path)
+    names = group.new_list()
+
+    assert group.reserve(900)
+    assert not group.reserve(200)  # Melewati RESERVE_SHARE dari anggaran
+    spilled_at = None
+    for index in range(100):
+        names.append(f"name-{index}")
+        if names.spilled and spilled_at is None:
+            spilled_at = index
+    # Dengan 900 byte tercadang, list menumpahkan lebih awal
+    unreserved = spill.SpillList(budget=2000, directory=tmp_path)
+    unreserved.extend(f"name-{index}" for index in range(spilled_at + 1))
+    assert unreserved.spilled == 0
+    assert list(names) == [f"name-{index}" for index in range(100)]
+    unreserved.close()
+    group.close()
@@ -0,0 +1,71 @@
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import pandas as pd
+import pytest
+
+from program import transport
+
+ROWS = [
+    {"Member Index": 0, "Class": "Cart", "CC": 3, "TCC": 0.5},
+    {"Member Index": 1, "Class": "Order", "CC": None, "Error": "Class has no body"},
+    # Kolom campuran angka/teks: teks menjadi null
+    {"Member Index": 2, "Class": "Error", "CC": "n/a"},
+]
+
+
+def segment_exists(name):
+    try:
+        segment = shared_memory.SharedMemory(name=name)
+    except FileNotFoundError:
+        return False
+    segment.close()
+    return True
+
+
+def test_round_trip_through_shared_memory():
+    pytest.importorskip("pyarrow")
+    handle = transport.publish(ROWS)
+    assert handle[0] == "shm" and segment_exists(handle[1])
+
+    frame = transport.combine([transport.receive(handle)])
+
+    # Segmen dilepas begitu dibaca; DataFrame tetap valid sesudahnya
+    assert not segment_exists(handle[1])
+    assert frame["Member Index"].tolist() == [0, 1, 2]
+    assert frame["Class"].tolist() == ["Cart", "Order", "Error"]
+    assert frame["CC"].tolist()[0] == 3 and frame["CC"].isna().tolist() == [False, True, True]
+    assert frame["Error"].tolist()[1] == "Class has no body"
+
+
+def test_segment_outlives_the_worker_until_received():
+    pytest.importorskip("pyarrow")
+    with ProcessPoolExecutor(max_workers=1) as executor:
+        handle = executor.submit(transport.publish, ROWS).result()
+    assert segment_exists(handle[1])
+
+    table = transport.receive(handle)
+
+    assert table.num_rows == len(ROWS)
+    assert not segment_exists(handle[1])
+
+
+def test_release_unlinks_unread_segments():
+    pytest.importorskip("pyarrow")
+    handle = transport.publish(ROWS)
+
+    transport.release(handle)
+    transport.release(handle)  # Segmen yang sudah dilepas diabaikan
+    transport.release(("rows", ROWS))
+
+    assert not segment_exists(handle[1])
+
+
+def test_rows_are_pickled_without_pyarrow(monkeypatch):
+    monkeypatch.setattr(transport, "pa", None)
+
+    handle = transport.publish(ROWS)
+
+    assert handle == ("rows", ROWS)
+    frame = transport.combine([transport.receive(handle), pd.DataFrame()])
+    assert frame["Class"].tolist() == ["Cart", "Order", "Error"]